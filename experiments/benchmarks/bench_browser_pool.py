@@ -0,0 +1,66 @@
+"""
+Browser start-up latency per run.
+
+Starts and closes a ``LocalPlaywrightBrowser`` once per simulated run and
+measures the time until the run has a page it can navigate, which is what
+``WebSurfer.lazy_init`` waits for before the first step. Compares launching a
+browser per run with leasing a context from the process-wide browser pool.
+
+Requires a Playwright Chromium install (``playwright install chromium``).
+
+Usage:
+    python experiments/benchmarks/bench_browser_pool.py --runs 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from magentic_ui.tools.playwright.browser import (
+    LocalPlaywrightBrowser,
+    get_browser_pool,
+)
+
+
+async def _first_page_latency(use_pool: bool) -> float:
+    start = time.perf_counter()
+    browser = LocalPlaywrightBrowser(headless=True, use_pool=use_pool)
+    await browser.__aenter__()
+    context = browser.browser_context
+    page = context.pages[0] if context.pages else await context.new_page()
+    await page.goto("about:blank")
+    elapsed = time.perf_counter() - start
+    await browser.__aexit__(None, None, None)
+    return elapsed
+
+
+async def main(runs: int) -> None:
+    for use_pool in (False, True):
+        latencies: List[float] = []
+        for _ in range(runs):
+            latencies.append(await _first_page_latency(use_pool))
+            # Leave the pool time to prepare its next warm context, as the
+            # gap between two runs would
+            await asyncio.sleep(0.2)
+        name = "pooled" if use_pool else "launch per run"
+        print(
+            f"{name:>14}: first run {latencies[0] * 1000:.0f} ms, "
+            f"median {statistics.median(latencies) * 1000:.0f} ms over {runs} runs"
+        )
+
+    pool = get_browser_pool()
+    metrics = pool.metrics()
+    print(
+        f"pool: {metrics.hits} hits, {metrics.misses} misses, "
+        f"{metrics.launches} browser launches"
+    )
+    await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10, help="Simulated runs")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
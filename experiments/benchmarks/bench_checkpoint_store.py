@@ -0,0 +1,134 @@
+"""
+Checkpoint cost over a long synthetic run.
+
+Replays a run that checkpoints after every message and compares writing the
+full compressed state to `Run.state` (the previous behaviour) with the
+incremental `CheckpointStore`. Reports total time, time spent in the last
+100 checkpoints (where full rewrites are most expensive) and bytes written.
+
+Usage:
+    python experiments/benchmarks/bench_checkpoint_store.py --messages 500
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from magentic_ui.backend.database import CheckpointStore, DatabaseManager
+from magentic_ui.backend.datamodel import CheckpointBlob, Run, Session
+from magentic_ui.backend.utils.utils import compress_state
+
+
+def _state(history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "type": "TeamState",
+        "version": "1.0.0",
+        "agent_states": {
+            "orchestrator": {
+                "message_history": history,
+                "plan": {"task": "benchmark", "steps": [{"title": "step"}] * 5},
+                "n_rounds": len(history),
+            },
+            "web_surfer": {
+                "type": "ChatAgentContainerState",
+                "agent_state": {"chat_history": history[::3]},
+                "message_buffer": [],
+            },
+            "coder_agent": {
+                "type": "ChatAgentContainerState",
+                "agent_state": {"chat_history": history[1::3]},
+                "message_buffer": [],
+            },
+        },
+    }
+
+
+_WORDS = [f"w{n}" for n in range(5000)]
+
+
+def _message(i: int) -> Dict[str, Any]:
+    rng = random.Random(i)
+    message: Dict[str, Any] = {
+        "type": "TextMessage",
+        "source": ["user", "orchestrator", "web_surfer", "coder_agent"][i % 4],
+        "content": " ".join(rng.choices(_WORDS, k=200)),
+    }
+    if i % 10 == 0:
+        # Roughly what a downscaled screenshot adds to a multimodal message
+        message["type"] = "MultiModalMessage"
+        message["image"] = base64.b64encode(rng.randbytes(30_000)).decode("ascii")
+    return message
+
+
+async def _new_run(db: DatabaseManager) -> Run:
+    session = (await db.upsert(Session(user_id="bench"), return_json=False)).data
+    return (
+        await db.upsert(
+            Run(session_id=session.id, user_id="bench", task=None), return_json=False
+        )
+    ).data
+
+
+async def _replay(db: DatabaseManager, num_messages: int, incremental: bool) -> None:
+    run = await _new_run(db)
+    store = CheckpointStore(db)
+    history: List[Dict[str, Any]] = []
+    durations: List[float] = []
+    state_bytes = 0
+
+    for i in range(num_messages):
+        history.append(_message(i))
+        # The group chat hands the manager a JSON string on every checkpoint
+        payload = json.dumps(_state(history))
+
+        start = time.perf_counter()
+        state_dict = json.loads(payload)
+        if incremental:
+            run.state = await store.save(run.id, state_dict)
+        else:
+            run.state = compress_state(state_dict)
+        await db.upsert(run)
+        durations.append(time.perf_counter() - start)
+        state_bytes += len(run.state)
+
+    blob_bytes = 0
+    if incremental:
+        await store.close(run.id)
+        blobs = await db.get(CheckpointBlob, filters={"run_id": run.id})
+        blob_bytes = sum(len(blob.data) for blob in blobs.data)
+        loaded = await CheckpointStore(db).load(run.id, run.state)
+        assert loaded == _state(history), "reconstructed state does not match"
+
+    name = "incremental" if incremental else "full"
+    print(
+        f"{name:>11}: {num_messages} checkpoints in {sum(durations):.2f}s, "
+        f"last 100 took {sum(durations[-100:]) * 1000:.0f} ms, "
+        f"Run.state writes {state_bytes / 1e6:.1f} MB, "
+        f"segments stored {blob_bytes / 1e6:.2f} MB"
+    )
+
+
+async def main(num_messages: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(
+            engine_uri=f"sqlite:///{Path(tmp) / 'bench.db'}", base_dir=Path(tmp)
+        )
+        db.initialize_database()
+        await _replay(db, num_messages, incremental=False)
+        await _replay(db, num_messages, incremental=True)
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--messages", type=int, default=500, help="Messages (and checkpoints) per run"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.messages))
@@ -0,0 +1,85 @@
+"""
+Coder code block execution, one block at a time vs. independent blocks in parallel.
+
+Executes a response's worth of code blocks through a local code executor:
+several blocks marked "# independent" that each wait on I/O (simulated
+with a sleep, like a download) and write their own file, followed
+by an analysis block that reads all of those files. The "serial" mode is
+the Coder's default; the "parallel" mode is ``max_parallel_code_blocks``,
+which runs the independent blocks concurrently and the analysis block once
+they finished. The Docker executor adds a container exec per block to both.
+
+Usage:
+    python experiments/benchmarks/bench_coder_parallel_blocks.py --blocks 4 --seconds 1
+"""
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from autogen_core import CancellationToken
+from autogen_core.code_executor import CodeBlock
+from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
+
+from magentic_ui.agents._coder import _code_block_dependencies, _execute_code_blocks
+
+
+def response_blocks(blocks: int, seconds: float):
+    code_blocks = [
+        CodeBlock(
+            language="python",
+            code=f"# independent\nimport time\ntime.sleep({seconds})\n"
+            f"open('part{n}.txt', 'w').write('{n}')\n",
+        )
+        for n in range(blocks)
+    ]
+    reads = ", ".join(f"'part{n}.txt'" for n in range(blocks))
+    code_blocks.append(
+        CodeBlock(
+            language="python",
+            code=f"print(sum(int(open(name).read()) for name in [{reads}]))\n",
+        )
+    )
+    return code_blocks
+
+
+async def main(blocks: int, seconds: float, parallel: int) -> None:
+    code_blocks = response_blocks(blocks, seconds)
+    print(f"dependencies: {_code_block_dependencies(code_blocks)}")
+    for name, max_parallel in [("serial", 1), ("parallel", parallel)]:
+        work_dir = Path(tempfile.mkdtemp())
+        executor = LocalCommandLineCodeExecutor(work_dir=work_dir)
+        await executor.start()
+        try:
+            start = time.perf_counter()
+            outputs = [
+                result
+                async for result in _execute_code_blocks(
+                    executor, code_blocks, CancellationToken(), max_parallel
+                )
+            ]
+            elapsed = time.perf_counter() - start
+        finally:
+            await executor.stop()
+            shutil.rmtree(work_dir, ignore_errors=True)
+        assert outputs[-1][0].strip() == str(sum(range(blocks)))
+        per_block = ", ".join(f"{took:.2f}" for _, _, took in outputs)
+        print(f"{name:>8}: {elapsed * 1000:7.1f} ms (blocks: {per_block} s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--blocks", type=int, default=4, help="Independent blocks per response"
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=1.0, help="I/O wait of each block"
+    )
+    parser.add_argument(
+        "--parallel", type=int, default=4, help="max_parallel_code_blocks"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.blocks, args.seconds, args.parallel))
@@ -0,0 +1,130 @@
+"""
+Concurrent-run throughput of DatabaseManager.
+
+Simulates several runs streaming messages at the same time and compares the
+old pattern (a synchronous ``Session`` opened on the event loop for every
+write) with the awaitable ``DatabaseManager`` CRUD API. Besides throughput it
+reports the worst event-loop stall observed by a heartbeat task, which is what
+other runs' WebSocket streams experience while a write is in flight.
+
+Usage:
+    python experiments/benchmarks/bench_db_manager.py --runs 8 --messages 200
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlmodel import Session as SyncSession
+
+from magentic_ui.backend.database import DatabaseManager
+from magentic_ui.backend.datamodel import Message, Run, RunStatus, Session
+
+
+async def _heartbeat(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Return the largest delay between scheduled and actual wake-ups."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+def _message(session_id: int, run_id: int, i: int) -> Message:
+    return Message(
+        created_at=datetime.now(),
+        session_id=session_id,
+        run_id=run_id,
+        user_id="bench",
+        config={"source": "agent", "content": f"message {i}" * 20},
+    )
+
+
+async def _blocking_writer(
+    db: DatabaseManager, session_id: int, run_id: int, n: int
+) -> None:
+    for i in range(n):
+        # Baseline: what the manager did before it became awaitable.
+        with SyncSession(db.engine) as session:
+            model = _message(session_id, run_id, i)
+            session.add(model)
+            session.commit()
+            session.refresh(model)
+        await asyncio.sleep(0)
+
+
+async def _async_writer(
+    db: DatabaseManager, session_id: int, run_id: int, n: int
+) -> None:
+    for i in range(n):
+        await db.upsert(_message(session_id, run_id, i))
+
+
+async def _run_mode(
+    db: DatabaseManager, mode: str, runs: List[Run], n: int
+) -> Dict[str, Any]:
+    writer = _blocking_writer if mode == "blocking" else _async_writer
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(stop))
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(writer(db, run.session_id or 0, run.id or 0, n) for run in runs)
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    worst_stall = await heartbeat
+    total = n * len(runs)
+    return {
+        "mode": mode,
+        "messages": total,
+        "seconds": elapsed,
+        "msgs_per_sec": total / elapsed,
+        "worst_loop_stall_ms": worst_stall * 1000,
+    }
+
+
+async def main(num_runs: int, num_messages: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(
+            engine_uri=f"sqlite:///{Path(tmp) / 'bench.db'}", base_dir=Path(tmp)
+        )
+        db.initialize_database()
+        session = (await db.upsert(Session(user_id="bench"), return_json=False)).data
+        runs = [
+            (
+                await db.upsert(
+                    Run(
+                        session_id=session.id,
+                        user_id="bench",
+                        status=RunStatus.ACTIVE,
+                        task=None,
+                    ),
+                    return_json=False,
+                )
+            ).data
+            for _ in range(num_runs)
+        ]
+
+        for mode in ("blocking", "async"):
+            result = await _run_mode(db, mode, runs, num_messages)
+            print(
+                f"{result['mode']:>9}: {result['messages']} messages in "
+                f"{result['seconds']:.2f}s ({result['msgs_per_sec']:.0f} msg/s), "
+                f"worst event-loop stall {result['worst_loop_stall_ms']:.1f} ms"
+            )
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=8, help="Concurrent runs")
+    parser.add_argument(
+        "--messages", type=int, default=200, help="Messages written per run"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.messages))
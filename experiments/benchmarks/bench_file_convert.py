@@ -0,0 +1,97 @@
+"""
+FileSurfer document conversion, converting on every open vs. the conversion cache.
+
+Writes a text-heavy PDF and opens it with the file helper's ``open_path``,
+as the helper process does. The "convert" mode is what every open cost
+before: a full MarkItDown conversion. With the cache, the first open of a
+large PDF returns a preview of its first pages while the rest is converted
+in the background ("first viewport"), the next open waits for that
+conversion ("full document"), and every later open of the same content
+reads the cached Markdown ("cached reopen"). With the local executor that
+includes later runs; a Docker executor's cache lasts as long as its container.
+
+Usage:
+    python experiments/benchmarks/bench_file_convert.py --pages 100
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from markitdown import MarkItDown
+
+from magentic_ui.agents.file_surfer import _file_helper
+
+LINES_PER_PAGE = 40
+
+
+def write_pdf(path: Path, pages: int) -> None:
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids ["
+        + " ".join(f"{4 + 2 * i} 0 R" for i in range(pages))
+        + f"] /Count {pages} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page in range(pages):
+        lines = " ".join(
+            f"(Page {page} line {line}: the quick brown fox jumps over the lazy dog.) '"
+            for line in range(LINES_PER_PAGE)
+        )
+        stream = f"BT /F1 10 Tf 14 TL 50 760 Td {lines} ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * page} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    body = "%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n"
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+    body += f"startxref\n{xref}\n%%EOF\n"
+    path.write_bytes(body.encode("latin-1"))
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(pages: int) -> None:
+    root = Path(tempfile.mkdtemp())
+    document = root / "report.pdf"
+    write_pdf(document, pages)
+    _file_helper.CACHE_DIR = str(root / "cache")
+    _file_helper._serving = True  # As in the helper process
+    _file_helper.LAZY_CONVERSION_BYTES = 0
+    try:
+        converter = MarkItDown()
+        _, convert = timed(converter.convert_local, str(document))
+        preview, first = timed(_file_helper.open_path, str(document))
+        full, complete = timed(_file_helper.open_path, str(document))
+        _, cached = timed(_file_helper.open_path, str(document))
+        assert preview.get("partial") and "partial" not in full
+
+        size = document.stat().st_size / 1e6
+        print(f"{pages} pages, {size:.1f} MB")
+        print(f"         convert: {convert:8.1f} ms per open")
+        print(f"  first viewport: {first:8.1f} ms")
+        print(f"   full document: {complete:8.1f} ms later")
+        print(f"   cached reopen: {cached:8.1f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=100, help="Pages in the PDF")
+    args = parser.parse_args()
+    main(args.pages)
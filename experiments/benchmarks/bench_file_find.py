@@ -0,0 +1,91 @@
+"""
+FileSurfer find_files latency, a full directory walk vs. the file index.
+
+Builds a tree of files and runs fuzzy file name queries. The "walk" mode is
+the previous ``find_files``: an ``os.walk`` of the whole work directory and a
+``SequenceMatcher`` ratio for every file on every query. The "index" mode is
+``FileIndex.find`` as kept by the FileSurfer's helper process between
+queries: it only re-reads directories whose mtime changed and scores the
+names sharing the most trigrams with the query.
+
+Usage:
+    python experiments/benchmarks/bench_file_find.py --files 50000 --queries 20
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from magentic_ui.agents.file_surfer._file_helper import FileIndex
+
+WORDS = ["report", "notes", "data", "summary", "draft", "final", "budget", "plan"]
+EXTENSIONS = [".md", ".txt", ".pdf", ".csv", ".docx"]
+
+
+def walk_find(query: str) -> dict:
+    matches = []
+    perfect_match = None
+    query = query.lower()
+    for root, dirs, files in os.walk("."):
+        dirs[:] = [d for d in dirs if d not in ("node_modules", ".git", "__pycache__")]
+        for name in files:
+            path = os.path.join(root, name)[2:]
+            if name.lower() == query:
+                perfect_match = path
+                matches.append((path, 1.0))
+                continue
+            score = SequenceMatcher(None, query, name.lower()).ratio()
+            if score > 0.2:
+                matches.append((path, score))
+    matches.sort(key=lambda m: m[1], reverse=True)
+    return {"matches": matches[:20], "perfect_match": perfect_match}
+
+
+def main(files: int, queries: int) -> None:
+    rng = random.Random(0)
+    root = Path(tempfile.mkdtemp())
+    names = []
+    for i in range(files):
+        directory = root / f"project{i % 50}" / f"part{i % 7}"
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{i}{rng.choice(EXTENSIONS)}"
+        (directory / name).touch()
+        names.append(name)
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        sample = [rng.choice(names) for _ in range(queries)]
+        start = time.perf_counter()
+        for query in sample:
+            walk_find(query)
+        walk = (time.perf_counter() - start) / queries
+
+        index = FileIndex(".")
+        start = time.perf_counter()
+        index.refresh()
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        for query in sample:
+            index.find(query)
+        indexed = (time.perf_counter() - start) / queries
+
+        print(f" walk: {walk * 1000:8.1f} ms per query")
+        print(
+            f"index: {indexed * 1000:8.1f} ms per query, {build * 1000:.1f} ms to build"
+        )
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=50000, help="Files in the tree")
+    parser.add_argument("--queries", type=int, default=20, help="Queries to run")
+    args = parser.parse_args()
+    main(args.files, args.queries)
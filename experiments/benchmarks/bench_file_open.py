@@ -0,0 +1,87 @@
+"""
+FileSurfer file open latency, three code executions vs. one served by a helper.
+
+Opens the same set of files through a local code executor. The "three
+executions" mode is the previous ``_open_path``: one code block to check the
+path exists, one to check whether it is a directory and one that imports
+MarkItDown and converts the file, each in a fresh interpreter. The "helper"
+mode is ``CodeExecutorMarkdownFileBrowser.open_path``, a single code block
+answered by the persistent helper process that keeps MarkItDown loaded.
+
+The Docker executor adds a container round-trip per code execution on top
+of these numbers.
+
+Usage:
+    python experiments/benchmarks/bench_file_open.py --files 10
+"""
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from autogen_core import CancellationToken
+from autogen_core.code_executor import CodeBlock
+from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
+
+from magentic_ui.agents.file_surfer._code_markdown_file_browser import (
+    CodeExecutorMarkdownFileBrowser,
+)
+
+LEGACY_BLOCKS = [
+    "import os\nprint({path!r} == '.' or os.path.exists({path!r}))",
+    "import os\nprint({path!r} == '.' or os.path.isdir({path!r}))",
+    "from markitdown import MarkItDown\n"
+    "result = MarkItDown().convert_local({path!r})\n"
+    "print('TITLE:' + (result.title or ''))\n"
+    "print('CONTENT:' + result.text_content)",
+]
+
+
+async def legacy_open(executor: LocalCommandLineCodeExecutor, path: str) -> None:
+    for block in LEGACY_BLOCKS:
+        await executor.execute_code_blocks(
+            [CodeBlock(code=block.format(path=path), language="python")],
+            cancellation_token=CancellationToken(),
+        )
+
+
+async def main(files: int) -> None:
+    work_dir = Path(tempfile.mkdtemp())
+    paths = []
+    for i in range(files):
+        path = work_dir / f"doc{i}.html"
+        path.write_text(f"<h1>Document {i}</h1>" + "<p>Some text.</p>" * 500)
+        paths.append(path.name)
+    executor = LocalCommandLineCodeExecutor(work_dir=work_dir)
+    await executor.start()
+    browser = CodeExecutorMarkdownFileBrowser(executor)
+    try:
+        start = time.perf_counter()
+        for path in paths:
+            await legacy_open(executor, path)
+        legacy = (time.perf_counter() - start) / files
+
+        # Starts the helper process, as the FileSurfer does on first use
+        await browser.lazy_init()
+        await asyncio.sleep(1)
+        start = time.perf_counter()
+        for path in paths:
+            await browser.open_path(path)
+        helper = (time.perf_counter() - start) / files
+
+        print(f"three executions: {legacy * 1000:7.1f} ms per open")
+        print(f"          helper: {helper * 1000:7.1f} ms per open")
+    finally:
+        await browser.close()
+        await executor.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=10, help="Files to open")
+    args = parser.parse_args()
+    asyncio.run(main(args.files))
@@ -0,0 +1,131 @@
+"""
+FileSurfer paging and search over a large converted document, per-page scans vs. the search index.
+
+Loads a multi-megabyte Markdown document into ``CodeExecutorMarkdownFileBrowser``
+and times splitting it into viewport pages, then a ``find_on_page`` followed by
+``find_next`` calls. The "scan" mode is the previous implementation: pages are
+split by stepping one character at a time to the next whitespace, and every
+search call normalizes and regex-matches the pages one by one. The "index"
+mode splits with a regex and normalizes the document once, so that each query
+takes one regex pass and ``find_next`` is a lookup.
+
+Usage:
+    python experiments/benchmarks/bench_file_paging.py --megabytes 5 --finds 20
+"""
+
+import argparse
+import random
+import re
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
+
+from magentic_ui.agents.file_surfer._code_markdown_file_browser import (
+    CodeExecutorMarkdownFileBrowser,
+)
+
+
+class ScanningBrowser(CodeExecutorMarkdownFileBrowser):
+    """The browser with its previous paging and search."""
+
+    def _split_pages(self) -> None:
+        if len(self._page_content) == 0:
+            self.viewport_pages = [(0, 0)]
+            return
+        self.viewport_pages = []
+        start_idx = 0
+        while start_idx < len(self._page_content):
+            end_idx = min(start_idx + self.viewport_size, len(self._page_content))
+            while end_idx < len(self._page_content) and self._page_content[
+                end_idx - 1
+            ] not in [" ", "\t", "\r", "\n"]:
+                end_idx += 1
+            self.viewport_pages.append((start_idx, end_idx))
+            start_idx = end_idx
+
+    def _find_next_viewport(
+        self, query: Optional[str], starting_viewport: int
+    ) -> Optional[int]:
+        if query is None:
+            return None
+        nquery = re.sub(r"\*", "__STAR__", query)
+        nquery = " " + (" ".join(re.split(r"\W+", nquery))).strip() + " "
+        nquery = nquery.replace(" __STAR__ ", "__STAR__ ")
+        nquery = nquery.replace("__STAR__", ".*").lower()
+        if nquery.strip() == "":
+            return None
+        idxs: List[int] = list(range(starting_viewport, len(self.viewport_pages)))
+        idxs.extend(range(0, starting_viewport))
+        for i in idxs:
+            bounds = self.viewport_pages[i]
+            content = self.page_content[bounds[0] : bounds[1]]
+            ncontent = " " + (" ".join(re.split(r"\W+", content))).strip().lower() + " "
+            if re.search(nquery, ncontent):
+                return i
+        return None
+
+
+def document(megabytes: float) -> str:
+    rng = random.Random(0)
+    words = ["report", "table", "value", "figure", "section", "total", "| --- |"]
+    parts: List[str] = []
+    size = 0
+    while size < megabytes * 1e6:
+        line = " ".join(rng.choice(words) for _ in range(12))
+        if rng.random() < 0.0002:
+            line += " quarterly revenue"
+        if rng.random() < 0.01:
+            line += " " + "A" * rng.randint(100, 2000)  # Inline base64 image data
+        parts.append(line)
+        size += len(line) + 1
+    return "\n".join(parts)
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(browser: CodeExecutorMarkdownFileBrowser, content: str, finds: int) -> Tuple:
+    split = timed(browser._set_page_content, content)
+    first = timed(browser.find_on_page, "quarterly revenue")
+    pages = [browser.viewport_current_page]
+    following = 0.0
+    for _ in range(finds):
+        following += timed(browser.find_next)
+        pages.append(browser.viewport_current_page)
+    missing = timed(browser.find_on_page, "annual forecast")
+    return split, first, following / finds, missing, pages
+
+
+def main(megabytes: float, finds: int) -> None:
+    content = document(megabytes)
+    with tempfile.TemporaryDirectory() as work_dir:
+        executor = LocalCommandLineCodeExecutor(work_dir=work_dir)
+        results = {}
+        for name, cls in [
+            ("scan", ScanningBrowser),
+            ("index", CodeExecutorMarkdownFileBrowser),
+        ]:
+            results[name] = run(cls(executor), content, finds)
+        assert results["scan"][-1] == results["index"][-1]
+        for name, (split, first, following, missing, _) in results.items():
+            print(
+                f"{name:>5}: split {split:7.1f} ms, find_on_page {first:7.1f} ms, "
+                f"find_next {following:7.2f} ms, no match {missing:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--megabytes", type=float, default=5, help="Size of the document"
+    )
+    parser.add_argument(
+        "--finds", type=int, default=20, help="find_next calls after find_on_page"
+    )
+    args = parser.parse_args()
+    main(args.megabytes, args.finds)
@@ -0,0 +1,108 @@
+"""
+Progress-ledger latency with streamed, incrementally parsed responses.
+
+Simulates a model streaming a progress ledger at a fixed token rate and
+measures when the Orchestrator can act on it. Waiting for the whole
+completion is the previous behaviour. With the incremental parser the next
+speaker can be requested once the instruction has streamed in (the
+``early_dispatch`` option), before the progress summary that ends the ledger.
+A second case streams a ledger with an invalid value near the start and
+compares when the retry can begin.
+
+Usage:
+    python experiments/benchmarks/bench_ledger_streaming.py --tokens-per-second 60
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import AsyncGenerator, Dict, List
+
+from magentic_ui.teams.orchestrator._prompts import validate_ledger_field
+from magentic_ui.teams.orchestrator._utils import IncrementalJsonParser, JsonStreamError
+
+AGENTS = ["web_surfer", "coder_agent", "user_proxy"]
+CHARS_PER_TOKEN = 4
+
+
+def _ledger(summary_sentences: int) -> str:
+    summary = " ".join(
+        f"Fact {i}: the fare on the {i}th result is {100 + i} dollars."
+        for i in range(summary_sentences)
+    )
+    return json.dumps(
+        {
+            "is_current_step_complete": {
+                "reason": "The search results have not been compared yet.",
+                "answer": False,
+            },
+            "need_to_replan": {
+                "reason": "The current plan is still working.",
+                "answer": False,
+            },
+            "instruction_or_question": {
+                "answer": "Open the first three results and note their prices.",
+                "agent_name": "web_surfer",
+            },
+            "progress_summary": summary,
+        },
+        indent=4,
+    )
+
+
+async def _stream(text: str, tokens_per_second: float) -> AsyncGenerator[str, None]:
+    for start in range(0, len(text), CHARS_PER_TOKEN):
+        await asyncio.sleep(1 / tokens_per_second)
+        yield text[start : start + CHARS_PER_TOKEN]
+
+
+async def _measure(text: str, tokens_per_second: float) -> Dict[str, float]:
+    parser = IncrementalJsonParser()
+    start = time.perf_counter()
+    times: Dict[str, float] = {}
+    async for chunk in _stream(text, tokens_per_second):
+        try:
+            for key, value in parser.feed(chunk):
+                if not validate_ledger_field(key, value, AGENTS):
+                    raise JsonStreamError(key)
+                if key == "instruction_or_question":
+                    times["dispatch"] = time.perf_counter() - start
+        except JsonStreamError:
+            times["abort"] = time.perf_counter() - start
+            break
+    times["complete"] = time.perf_counter() - start
+    return times
+
+
+async def main(tokens_per_second: float, summary_sentences: List[int]) -> None:
+    for sentences in summary_sentences:
+        text = _ledger(sentences)
+        times = await _measure(text, tokens_per_second)
+        print(
+            f"summary of {sentences:>2} sentences: full response after "
+            f"{times['complete']:.2f}s, next speaker can be requested after "
+            f"{times['dispatch']:.2f}s"
+        )
+
+    malformed = _ledger(summary_sentences[-1]).replace("false", "no", 1)
+    # Reading the whole response is what the previous code did before json.loads
+    full = len(malformed) / CHARS_PER_TOKEN / tokens_per_second
+    times = await _measure(malformed, tokens_per_second)
+    print(f"malformed ledger: retry after {times['abort']:.2f}s instead of {full:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=60, help="Simulated model speed"
+    )
+    parser.add_argument(
+        "--summary-sentences",
+        type=int,
+        nargs="+",
+        default=[5, 20],
+        help="Length of the progress summary that ends the ledger",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.tokens_per_second, args.summary_sentences))
@@ -0,0 +1,62 @@
+"""
+Resident memory controllers and their memory over many users.
+
+Requests the memory controller of many distinct users, as plan retrieval and
+plan saving do, and reports how many controllers stay resident, the Python
+memory they hold and the load latency. The "unbounded" mode is the previous
+behaviour, which never dropped a controller; the "capped" mode keeps at most
+``--max-resident`` controllers and reloads others from disk.
+
+Usage:
+    python experiments/benchmarks/bench_memory_provider.py --users 50 --max-resident 8
+"""
+
+import argparse
+import gc
+import shutil
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from magentic_ui.learning.memory_provider import MemoryControllerProvider
+
+
+def main(users: int, max_resident: int) -> None:
+    client = ReplayChatCompletionClient(["ok"])
+    for mode, cap in (("unbounded", users + 1), ("capped", max_resident)):
+        MemoryControllerProvider._instance = None
+        root = Path(tempfile.mkdtemp())
+        provider = MemoryControllerProvider(
+            internal_workspace_root=root,
+            external_workspace_root=root,
+            max_resident=cap,
+        )
+        gc.collect()
+        tracemalloc.start()
+        for i in range(users):
+            provider.get_memory_controller(f"user-{i}", client)
+        gc.collect()
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        metrics = provider.metrics()
+        print(
+            f"{mode:>9}: {metrics.resident} resident controllers holding "
+            f"{held / 1e6:.1f} MB, mean load "
+            f"{metrics.total_load_seconds * 1000 / metrics.loads:.0f} ms"
+        )
+        # Dropped controllers write their page logs when collected
+        provider.close_all_memory_controllers()
+        gc.collect()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=50, help="Distinct users")
+    parser.add_argument(
+        "--max-resident", type=int, default=8, help="Cap on resident controllers"
+    )
+    args = parser.parse_args()
+    main(args.users, args.max_resident)
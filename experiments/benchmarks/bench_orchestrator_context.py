@@ -0,0 +1,117 @@
+"""
+Orchestrator context building cost over long runs.
+
+Replays a synthetic run in which every round adds an instruction and an agent
+response to the thread, then builds the progress-ledger context and fits it
+to the token limit, once more for a JSON retry every few rounds. The "full
+rebuild" mode is the previous code path: ``thread_to_context`` over the whole
+thread and a ``TokenLimitedChatCompletionContext`` refilled on every request.
+The "incremental" mode is the Orchestrator's ``IncrementalContext``.
+
+Tokens are counted by ``ReplayChatCompletionClient`` (whitespace split), which
+is cheaper than a real tokenizer, so the gap understates a real client's.
+
+Usage:
+    python experiments/benchmarks/bench_orchestrator_context.py --rounds 200
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List, Sequence
+
+from autogen_agentchat.messages import BaseChatMessage, TextMessage
+from autogen_core.model_context import TokenLimitedChatCompletionContext
+from autogen_core.models import LLMMessage, SystemMessage, UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from magentic_ui.teams.orchestrator._context import IncrementalContext
+from magentic_ui.utils import thread_to_context
+
+AGENT = "Orchestrator"
+TOKEN_LIMIT = 100_000
+
+
+class CountingClient(ReplayChatCompletionClient):
+    def __init__(self) -> None:
+        super().__init__(["ok"])
+        self.counted_messages = 0
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools=[]) -> int:  # type: ignore
+        self.counted_messages += len(messages)
+        return super().count_tokens(messages, tools=tools)
+
+
+def _round_messages(i: int) -> List[BaseChatMessage]:
+    return [
+        TextMessage(content=f"Step {i}: open the next result. " * 10, source=AGENT),
+        TextMessage(
+            content=f"Visited page {i}. " + "Lorem ipsum dolor sit amet. " * 60,
+            source="web_surfer",
+        ),
+    ]
+
+
+async def _full_rebuild(
+    client: CountingClient, thread: List[BaseChatMessage], retry: bool
+) -> None:
+    model_context = TokenLimitedChatCompletionContext(client, token_limit=TOKEN_LIMIT)
+    context: List[LLMMessage] = [SystemMessage(content="system")]
+    context += thread_to_context(thread, AGENT)
+    context.append(UserMessage(content="progress ledger prompt", source=AGENT))
+    for attempt in range(2 if retry else 1):
+        await model_context.clear()
+        for message in context:
+            await model_context.add_message(message)
+        if attempt:
+            await model_context.add_message(
+                UserMessage(content="invalid JSON, retry", source=AGENT)
+            )
+        await model_context.get_messages()
+
+
+async def _incremental(
+    builder: IncrementalContext, thread: List[BaseChatMessage], retry: bool
+) -> None:
+    context: List[LLMMessage] = [SystemMessage(content="system")]
+    context += builder.thread_to_context(thread)
+    context.append(UserMessage(content="progress ledger prompt", source=AGENT))
+    builder.fit(context)
+    if retry:
+        builder.fit(
+            context + [UserMessage(content="invalid JSON, retry", source=AGENT)]
+        )
+
+
+async def main(rounds: int, retry_every: int) -> None:
+    for mode in ("full rebuild", "incremental"):
+        client = CountingClient()
+        builder = IncrementalContext(
+            client, AGENT, is_multimodal=False, token_limit=TOKEN_LIMIT
+        )
+        thread: List[BaseChatMessage] = [
+            TextMessage(content="Find the cheapest flight", source="user")
+        ]
+        start = time.perf_counter()
+        for i in range(rounds):
+            thread += _round_messages(i)
+            retry = retry_every > 0 and i % retry_every == 0
+            if mode == "full rebuild":
+                await _full_rebuild(client, thread, retry)
+            else:
+                await _incremental(builder, thread, retry)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{mode:>12}: {elapsed * 1000:.0f} ms for {rounds} rounds, "
+            f"{client.counted_messages} messages token-counted"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=200, help="Orchestrator rounds")
+    parser.add_argument(
+        "--retry-every", type=int, default=5, help="Add a JSON retry every N rounds"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.retry_every))
@@ -0,0 +1,73 @@
+"""
+Page markdown extraction cost for repeated reads of an unchanged page.
+
+Loads a large synthetic article into a headless page and reads its markdown
+several times, as ``_summarize_page``, ``answer_question`` and the
+Orchestrator's page info do within one step, then changes the page and reads
+it again. Compares converting the whole ``outerHTML`` with MarkItDown on
+every read (a cache that retains nothing) with the page markdown cache keyed
+by URL and DOM fingerprint.
+
+Requires a Playwright Chromium install (``playwright install chromium``).
+
+Usage:
+    python experiments/benchmarks/bench_page_markdown_cache.py --reads 5
+"""
+
+import argparse
+import asyncio
+import time
+
+from playwright.async_api import async_playwright
+
+from magentic_ui.tools.playwright.utils.page_markdown_cache import PageMarkdownCache
+from magentic_ui.tools.playwright.utils.webpage_text_utils import (
+    WebpageTextUtilsPlaywright,
+)
+
+
+def _article(paragraphs: int) -> str:
+    body = "".join(
+        f"<h2>Section {i}</h2><p>Paragraph {i}: "
+        + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
+        + f"<a href='/page/{i}'>link {i}</a></p>"
+        for i in range(paragraphs)
+    )
+    return f"<html><head><title>Article</title></head><body>{body}</body></html>"
+
+
+async def main(reads: int, paragraphs: int) -> None:
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        page = await browser.new_page()
+        for mode, cache in (
+            ("convert every read", PageMarkdownCache(max_entries=0)),
+            ("markdown cache", PageMarkdownCache()),
+        ):
+            await page.set_content(_article(paragraphs))
+            text_utils = WebpageTextUtilsPlaywright(markdown_cache=cache)
+            start = time.perf_counter()
+            for _ in range(reads):
+                await text_utils.get_page_markdown(page)
+            await page.evaluate("document.querySelector('h2').textContent = 'New'")
+            markdown = await text_utils.get_page_markdown(page)
+            elapsed = time.perf_counter() - start
+            assert markdown.startswith("## New")
+            metrics = cache.metrics()
+            print(
+                f"{mode:>18}: {elapsed * 1000:.0f} ms for {reads + 1} reads, "
+                f"{metrics.hits} hits, {metrics.misses} misses"
+            )
+        await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--reads", type=int, default=5, help="Reads of the unchanged page"
+    )
+    parser.add_argument(
+        "--paragraphs", type=int, default=500, help="Paragraphs in the article"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.reads, args.paragraphs))
@@ -0,0 +1,136 @@
+"""
+Browser protocol calls per WebSurfer step.
+
+Replays the reads a WebSurfer step makes through ``PlaywrightController``
+(screenshot, interactive regions, viewport, focus, metadata) followed by a
+scroll, on a static page and across navigations. Every message the Playwright
+client sends to the browser is counted. The "setup every action" mode restores
+the previous behaviour, where each action re-ran ``on_new_page``; "cached"
+uses the per-navigation readiness tracking, and "snapshot" reads the page
+with a single ``PlaywrightController.snapshot`` call instead of the getters.
+
+Requires a Playwright Chromium install (``playwright install chromium``).
+
+Usage:
+    python experiments/benchmarks/bench_playwright_step.py --steps 20
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from playwright._impl._connection import Connection
+from playwright.async_api import Page, async_playwright
+
+from magentic_ui.tools.playwright import PlaywrightController
+
+_HTML = (
+    "<html><head><title>Bench</title></head><body>"
+    + "".join(
+        f"<p><a href='#a{i}'>link {i}</a> <button>b{i}</button></p>" for i in range(200)
+    )
+    + "</body></html>"
+)
+
+_calls = 0
+_send = Connection._send_message_to_server
+
+
+def _counting_send(self: Connection, *args: Any, **kwargs: Any) -> Any:
+    global _calls
+    _calls += 1
+    return _send(self, *args, **kwargs)
+
+
+Connection._send_message_to_server = _counting_send  # type: ignore[method-assign]
+
+
+class _SetupEveryAction(PlaywrightController):
+    """Forget all readiness so every action runs the full on_new_page."""
+
+    async def _ensure_page_ready(self, page: Page) -> None:
+        self._navigation_ids.pop(page, None)
+        self._ready_navigation_ids.pop(page, None)
+        await self.on_new_page(page)
+
+
+async def _step(controller: PlaywrightController, page: Page) -> None:
+    await controller.get_screenshot(page)
+    await controller.get_interactive_rects(page)
+    await controller.get_visual_viewport(page)
+    await controller.get_focused_rect_id(page)
+    await controller.get_page_metadata(page)
+    await controller.get_current_url_title(page)
+    await controller.page_down(page)
+
+
+async def _snapshot_step(controller: PlaywrightController, page: Page) -> None:
+    await controller.snapshot(page)
+    await controller.page_down(page)
+
+
+async def _run_mode(
+    browser: Any,
+    controller_cls: type,
+    step: Callable[[PlaywrightController, Page], Awaitable[None]],
+    steps: int,
+    navigate_every: int,
+    tmp: str,
+) -> Dict[str, float]:
+    global _calls
+    context = await browser.new_context()
+    page = await context.new_page()
+    await page.set_content(_HTML)
+    controller = controller_cls(
+        downloads_folder=tmp,
+        animate_actions=False,
+        sleep_after_action=0,
+        timeout_load=1,
+        single_tab_mode=True,
+    )
+
+    _calls = 0
+    start = time.perf_counter()
+    for i in range(steps):
+        if navigate_every and i and i % navigate_every == 0:
+            await page.goto("about:blank")
+            await page.set_content(_HTML)
+        await step(controller, page)
+    elapsed = time.perf_counter() - start
+    calls = _calls
+    await context.close()
+    return {"calls_per_step": calls / steps, "ms_per_step": elapsed / steps * 1000}
+
+
+async def main(steps: int, navigate_every: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        async with async_playwright() as pw:
+            browser = await pw.chromium.launch(headless=True)
+            for name, controller_cls, step in (
+                ("setup every action", _SetupEveryAction, _step),
+                ("cached", PlaywrightController, _step),
+                ("snapshot", PlaywrightController, _snapshot_step),
+            ):
+                result = await _run_mode(
+                    browser, controller_cls, step, steps, navigate_every, tmp
+                )
+                print(
+                    f"{name:>18}: {result['calls_per_step']:.1f} protocol calls "
+                    f"and {result['ms_per_step']:.0f} ms per step"
+                )
+            await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--steps", type=int, default=20, help="WebSurfer steps")
+    parser.add_argument(
+        "--navigate-every",
+        type=int,
+        default=5,
+        help="Navigate to a new document every N steps (0 to never navigate)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.steps, args.navigate_every))
@@ -0,0 +1,114 @@
+"""
+Loading a long run's message history, all at once vs. page by page.
+
+Fills a SQLite database with one run of many messages carrying base64
+screenshot-sized payloads, as the WebSurfer's messages do, then measures
+what ``GET /runs/{run_id}/messages`` costs the server. The "all" mode is the
+unpaginated query that loads every message; the "first page" mode is
+``DatabaseManager.get_page`` with the ``(run_id, created_at)`` index, which is
+what the frontend needs to render the start of the history; "stream" is the
+time to the first line of the NDJSON variant and its total time.
+
+Usage:
+    python experiments/benchmarks/bench_run_messages.py --messages 2000 --page-size 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from magentic_ui.backend.database import DatabaseManager
+from magentic_ui.backend.datamodel import Message, Run, RunStatus, Session
+
+
+async def main(messages: int, page_size: int, payload_kb: int) -> None:
+    root = Path(tempfile.mkdtemp())
+    db = DatabaseManager(engine_uri=f"sqlite:///{root / 'bench.db'}", base_dir=root)
+    try:
+        assert db.initialize_database().status
+        session = (await db.upsert(Session(user_id="u"), return_json=False)).data
+        # The measured run shares the table with other runs, as on a busy server
+        runs = [
+            (
+                await db.upsert(
+                    Run(
+                        session_id=session.id,
+                        user_id="u",
+                        status=RunStatus.COMPLETE,
+                        task=None,
+                    ),
+                    return_json=False,
+                )
+            ).data
+            for _ in range(3)
+        ]
+        run = runs[0]
+        screenshot = os.urandom(payload_kb * 512).hex()
+        for start in range(0, messages, 500):
+            await db.insert_many(
+                [
+                    Message(
+                        session_id=session.id,
+                        run_id=other.id,
+                        user_id="u",
+                        config={"source": "web_surfer", "content": screenshot},
+                    )
+                    for _ in range(start, min(start + 500, messages))
+                    for other in runs
+                ]
+            )
+
+        filters = {"run_id": run.id}
+        start = time.perf_counter()
+        everything = await db.get(Message, filters=filters, order="asc")
+        body = json.dumps([m.model_dump(mode="json") for m in everything.data])
+        full = time.perf_counter() - start
+        print(
+            f"       all: {full * 1000:8.1f} ms, {len(everything.data)} messages, "
+            f"{len(body) / 1e6:.1f} MB"
+        )
+
+        start = time.perf_counter()
+        page = await db.get_page(Message, filters=filters, limit=page_size)
+        body = json.dumps([m.model_dump(mode="json") for m in page.data["items"]])
+        first = time.perf_counter() - start
+        print(
+            f"first page: {first * 1000:8.1f} ms, {len(page.data['items'])} messages, "
+            f"{len(body) / 1e6:.1f} MB"
+        )
+
+        start = time.perf_counter()
+        first_line = None
+        count = 0
+        async for message in db.stream(Message, filters=filters, return_json=True):
+            json.dumps(message)
+            count += 1
+            if first_line is None:
+                first_line = time.perf_counter() - start
+        total = time.perf_counter() - start
+        assert first_line is not None
+        print(
+            f"    stream: {first_line * 1000:8.1f} ms to the first line, "
+            f"{total * 1000:.1f} ms for {count} messages"
+        )
+    finally:
+        await db.close()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--messages", type=int, default=2000, help="Messages in the run"
+    )
+    parser.add_argument("--page-size", type=int, default=50, help="Messages per page")
+    parser.add_argument(
+        "--payload-kb", type=int, default=40, help="Payload size per message"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.page_size, args.payload_kb))
@@ -0,0 +1,95 @@
+"""
+Result page extraction cost for Bing searches.
+
+Serves synthetic result pages, each with images and a web font, from a local
+HTTP server and extracts the markdown of several of them per simulated
+search. The "browser per URL" mode is the previous ``extract_page_markdown``:
+a new Chromium and context for every URL. The "shared fetcher" mode is
+``SearchResultFetcher``, which reuses one pooled browser, fetches on a
+bounded set of pages and skips images, fonts and media.
+
+Requires a Playwright Chromium install (``playwright install chromium``).
+
+Usage:
+    python experiments/benchmarks/bench_search_fetcher.py --searches 3 --pages 5
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from playwright.async_api import async_playwright
+
+from magentic_ui.tools import PlaywrightController
+from magentic_ui.tools.bing_search import SearchResultFetcher
+from magentic_ui.tools.playwright.browser import get_browser_pool
+
+PAGE = (
+    "<html><head><style>@font-face {font-family: f; src: url(/font.woff2)}"
+    "body {font-family: f}</style></head><body>"
+    + "".join(f"<p>Paragraph {i}</p><img src='/image{i}.png'>" for i in range(20))
+    + "</body></html>"
+).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.startswith("/page"):
+            body, content_type = PAGE, "text/html"
+        else:
+            # Slow static assets, as on real result pages
+            time.sleep(0.05)
+            body, content_type = b"\0" * 20000, "application/octet-stream"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+async def _browser_per_url(url: str) -> str:
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context()
+        page = await context.new_page()
+        await page.goto(url)
+        markdown = await PlaywrightController().get_page_markdown(page)
+        await browser.close()
+        return markdown
+
+
+async def main(searches: int, pages: int) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    fetcher = SearchResultFetcher(settle_delay=0)
+
+    for mode in ("browser per URL", "shared fetcher"):
+        start = time.perf_counter()
+        for search in range(searches):
+            urls = [f"{base}/page/{search}/{i}" for i in range(pages)]
+            if mode == "browser per URL":
+                await asyncio.gather(*(_browser_per_url(url) for url in urls))
+            else:
+                await fetcher.fetch_pages(urls)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{mode:>15}: {elapsed * 1000 / searches:.0f} ms per search "
+            f"of {pages} pages"
+        )
+
+    await get_browser_pool().close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--searches", type=int, default=3, help="Simulated searches")
+    parser.add_argument("--pages", type=int, default=5, help="Result pages per search")
+    args = parser.parse_args()
+    asyncio.run(main(args.searches, args.pages))
@@ -0,0 +1,135 @@
+"""
+Set-of-mark rendering cost for pages with many interactive regions.
+
+Renders the annotated screenshot and the two model-sized images a WebSurfer
+step sends, on a synthetic screenshot with hundreds of regions. The
+"per-region PIL" mode reproduces the previous pipeline: decode to RGBA, draw
+every region and label on an overlay with ``ImageDraw``, alpha-composite,
+then decode the PNG a second time to scale the plain screenshot. The
+"fast path" mode is ``render_set_of_mark`` with ``scaled_size``.
+
+Usage:
+    python experiments/benchmarks/bench_set_of_mark.py --regions 100 300 600
+"""
+
+import argparse
+import io
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from magentic_ui.agents.web_surfer._set_of_mark import render_set_of_mark
+from magentic_ui.agents.web_surfer._web_surfer import WebSurfer
+
+SIZE = (1440, 1440)
+SCALED = (WebSurfer.MLM_WIDTH, WebSurfer.MLM_HEIGHT)
+
+
+def _screenshot() -> bytes:
+    # Flat blocks of colour with some noise compress and decode like a web page
+    rng = np.random.default_rng(0)
+    blocks = rng.integers(200, 255, size=(36, 36, 3), dtype=np.uint8)
+    pixels = np.kron(blocks, np.ones((40, 40, 1), dtype=np.uint8))
+    pixels[rng.random(pixels.shape[:2]) < 0.05] = 0
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _regions(n: int) -> Dict[str, Any]:
+    rng = random.Random(n)
+    regions: Dict[str, Any] = {}
+    for i in range(n):
+        left = rng.uniform(0, SIZE[0] - 50)
+        top = rng.uniform(-400, SIZE[1] + 400)
+        width, height = rng.uniform(20, 300), rng.uniform(12, 60)
+        regions[str(i)] = {
+            "tag_name": "a",
+            "role": "link",
+            "aria_name": f"link {i}",
+            "v_scrollable": False,
+            "rects": [
+                {
+                    "x": left,
+                    "y": top,
+                    "width": width,
+                    "height": height,
+                    "left": left,
+                    "top": top,
+                    "right": left + width,
+                    "bottom": top + height,
+                }
+            ],
+        }
+    return regions
+
+
+def _per_region_pil(png: bytes, regions: Dict[str, Any]) -> None:
+    base = Image.open(io.BytesIO(png)).convert("RGBA")
+    overlay = Image.new("RGBA", base.size)
+    draw = ImageDraw.Draw(overlay)
+    font = ImageFont.load_default(14)
+    for label, region in enumerate(regions.values(), start=1):
+        rect = region["rects"][0]
+        mid_y = (rect["top"] + rect["bottom"]) / 2
+        if not 0 <= mid_y < base.size[1]:
+            continue
+        draw.rectangle(
+            ((rect["left"], rect["top"]), (rect["right"], rect["bottom"])),
+            outline=(255, 0, 0, 255),
+            width=2,
+        )
+        anchor = "rb" if rect["top"] > 20 else "rt"
+        location = (rect["right"], rect["top"] if anchor == "rb" else rect["bottom"])
+        box = draw.textbbox(location, str(label), font=font, anchor=anchor)
+        draw.rectangle(
+            (box[0] - 3, box[1] - 3, box[2] + 3, box[3] + 3), fill=(255, 0, 0, 255)
+        )
+        draw.text(
+            location, str(label), fill=(255, 255, 255, 255), font=font, anchor=anchor
+        )
+    marked = Image.alpha_composite(base, overlay)
+    marked.resize(SCALED)
+    Image.open(io.BytesIO(png)).resize(SCALED)
+
+
+def _fast_path(png: bytes, regions: Dict[str, Any]) -> None:
+    render_set_of_mark(png, regions, use_sequential_ids=True, scaled_size=SCALED)
+
+
+def _time(
+    fn: Callable[[bytes, Dict[str, Any]], None],
+    png: bytes,
+    regions: Dict[str, Any],
+    repeat: int,
+) -> float:
+    fn(png, regions)  # warm up font and label caches
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(png, regions)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(region_counts: List[int], repeat: int) -> None:
+    png = _screenshot()
+    for n in region_counts:
+        regions = _regions(n)
+        slow = _time(_per_region_pil, png, regions, repeat)
+        fast = _time(_fast_path, png, regions, repeat)
+        print(
+            f"{n:>4} regions: per-region PIL {slow * 1000:.1f} ms, "
+            f"fast path {fast * 1000:.1f} ms ({slow / fast:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--regions", type=int, nargs="+", default=[100, 300, 600], help="Region counts"
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="Renders per mode")
+    args = parser.parse_args()
+    main(args.regions, args.repeat)
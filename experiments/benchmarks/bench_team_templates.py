@@ -0,0 +1,99 @@
+"""
+Per-run cost of preparing a team's configuration and model clients.
+
+Repeats what ``TeamManager._create_team`` does for every new run before any
+agent is created: parse the model configurations from the settings, validate
+the ``MagenticUIConfig`` and construct the five model clients of a team
+(orchestrator, web surfer, coder, file surfer and action guard). The "cold"
+mode is the previous code path; the "template" mode goes through
+``TeamTemplateCache``, which validates once and hands out handles on shared
+clients. Agents and browsers are not created, they are per run in both modes.
+
+No request is sent; the OpenAI clients are built with a placeholder key.
+
+Usage:
+    python experiments/benchmarks/bench_team_templates.py --runs 20
+"""
+
+import argparse
+import time
+from typing import Any, Dict
+
+import yaml
+from autogen_core.models import ChatCompletionClient
+
+from magentic_ui.magentic_ui_config import MagenticUIConfig, ModelClientConfigs
+from magentic_ui.team_template_cache import TeamTemplateCache
+
+ROLES = ["orchestrator", "web_surfer", "coder", "file_surfer", "action_guard"]
+
+CLIENT = {
+    "provider": "OpenAIChatCompletionClient",
+    "config": {"model": "gpt-4o-2024-08-06", "api_key": "placeholder"},
+    "max_retries": 10,
+}
+MODEL_CONFIGS = yaml.safe_dump({f"{role}_client": CLIENT for role in ROLES})
+SETTINGS: Dict[str, Any] = {
+    "model_configs": MODEL_CONFIGS,
+    "cooperative_planning": True,
+    "autonomous_execution": False,
+    "allowed_websites": [f"site{i}.com" for i in range(50)],
+}
+
+
+def _config(model_configs: Dict[str, Any]) -> Dict[str, Any]:
+    clients = ModelClientConfigs(
+        **{role: model_configs.get(f"{role}_client") for role in ROLES}
+    )
+    return {**SETTINGS, "model_client_configs": clients, "inside_docker": False}
+
+
+def cold_run(port: int) -> None:
+    config = MagenticUIConfig(
+        **_config(yaml.safe_load(SETTINGS["model_configs"])),
+        playwright_port=port,
+        novnc_port=port + 1,
+    )
+    for role in ROLES:
+        ChatCompletionClient.load_component(getattr(config.model_client_configs, role))
+
+
+def template_run(cache: TeamTemplateCache, port: int) -> None:
+    config = cache.magentic_ui_config(
+        _config(cache.parse_model_configs(SETTINGS["model_configs"])),
+        playwright_port=port,
+        novnc_port=port + 1,
+    )
+    for role in ROLES:
+        cache.model_client(getattr(config.model_client_configs, role))
+
+
+def main(runs: int) -> None:
+    # Import the client modules before timing either mode
+    ChatCompletionClient.load_component(CLIENT)
+
+    start = time.perf_counter()
+    for run in range(runs):
+        cold_run(4000 + 2 * run)
+    cold = (time.perf_counter() - start) / runs
+
+    cache = TeamTemplateCache()
+    start = time.perf_counter()
+    for run in range(runs):
+        template_run(cache, 4000 + 2 * run)
+    template = (time.perf_counter() - start) / runs
+
+    metrics = cache.metrics()
+    print(f"    cold: {cold * 1000:7.2f} ms per run")
+    print(
+        f"template: {template * 1000:7.2f} ms per run "
+        f"({metrics.hits} hits, {metrics.misses} misses, "
+        f"{metrics.model_clients} shared clients)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=20, help="Runs to prepare")
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,108 @@
+"""
+Time until the first plan step runs, waiting for agent startup vs. warming up.
+
+Simulates a team whose agents start heavy resources (a browser, a Docker code
+executor, the file surfer's executor and file browser) and an orchestrator
+that spends a while planning before the first agent is addressed. The
+"blocking" mode is the previous code path: team creation awaited every
+agent's ``lazy_init`` before the orchestrator could plan. The "warm-up" mode
+uses ``GroupChat.start_warm_up``, so planning overlaps with startup and the
+first step only waits for the addressed agent.
+
+Startup and planning times are simulated with sleeps; pass measured values
+with the options below.
+
+Usage:
+    python experiments/benchmarks/bench_team_warm_up.py --planning 4 --browser 3 --executor 5
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseChatMessage, TextMessage
+from autogen_core import CancellationToken
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from magentic_ui.teams import GroupChat
+from magentic_ui.teams.orchestrator.orchestrator_config import OrchestratorConfig
+
+
+class SimulatedAgent(BaseChatAgent):
+    def __init__(self, name: str, startup: float) -> None:
+        super().__init__(name, "Simulated agent")
+        self.startup = startup
+        self._started: asyncio.Task[None] | None = None
+
+    async def lazy_init(self) -> None:
+        # Concurrent callers share one start, like the real agents' lock
+        if self._started is None:
+            self._started = asyncio.create_task(asyncio.sleep(self.startup))
+        await self._started
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        await self.lazy_init()
+        return Response(chat_message=TextMessage(content="ok", source=self.name))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        pass
+
+
+async def first_step(args: argparse.Namespace, warm_up: bool) -> float:
+    agents = [
+        SimulatedAgent("web_surfer", args.browser),
+        SimulatedAgent("coder_agent", args.executor),
+        SimulatedAgent("file_surfer", args.file_browser),
+    ]
+    team = GroupChat(
+        participants=list(agents),
+        model_client=ReplayChatCompletionClient(["ok"]),
+        orchestrator_config=OrchestratorConfig(),
+    )
+    start = time.perf_counter()
+    if warm_up:
+        team.start_warm_up()
+    else:
+        await team.lazy_init()
+    await asyncio.sleep(args.planning)
+    # The first plan step addresses the web surfer
+    await agents[0].on_messages([], CancellationToken())
+    elapsed = time.perf_counter() - start
+    await team.wait_until_ready()
+    return elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    blocking = await first_step(args, warm_up=False)
+    warm_up = await first_step(args, warm_up=True)
+    print(f"blocking: first step after {blocking:.2f}s")
+    print(f" warm-up: first step after {warm_up:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--planning", type=float, default=4.0, help="Seconds spent planning"
+    )
+    parser.add_argument(
+        "--browser", type=float, default=3.0, help="Seconds to start the browser"
+    )
+    parser.add_argument(
+        "--executor", type=float, default=5.0, help="Seconds to start Docker"
+    )
+    parser.add_argument(
+        "--file-browser",
+        type=float,
+        default=5.5,
+        help="Seconds to start the file surfer",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,76 @@
+"""
+Event-loop stalls while converting large pages to markdown.
+
+Several simulated runs convert a multi-megabyte HTML page to markdown at the
+same time while a ticker coroutine, standing in for every other run served by
+the backend, measures how late the event loop wakes it up. Compares calling
+MarkItDown on the event loop, which is what ``get_page_markdown`` used to do,
+with the bounded ``TextWorkerPool``.
+
+Usage:
+    python experiments/benchmarks/bench_text_workers.py --runs 4
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from magentic_ui.tools.playwright.utils.text_workers import (
+    TextWorkerPool,
+    html_to_markdown,
+)
+
+
+def _page(paragraphs: int) -> str:
+    body = "".join(
+        f"<h2>Section {i}</h2><p>"
+        + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
+        + f"<a href='/page/{i}'>link {i}</a></p>"
+        for i in range(paragraphs)
+    )
+    return f"<html><body>{body}</body></html>"
+
+
+async def _ticker(done: asyncio.Event, lags: List[float]) -> None:
+    interval = 0.01
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def main(runs: int, paragraphs: int) -> None:
+    html = _page(paragraphs)
+    pool = TextWorkerPool()
+    for mode in ("on the event loop", "worker pool"):
+
+        async def convert() -> str:
+            if mode == "worker pool":
+                return await pool.run(html_to_markdown, html)
+            return html_to_markdown(html)
+
+        done = asyncio.Event()
+        lags: List[float] = []
+        ticker = asyncio.create_task(_ticker(done, lags))
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        await asyncio.gather(*(convert() for _ in range(runs)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await ticker
+        print(
+            f"{mode:>17}: {runs} pages of {len(html) / 1e6:.1f} MB in "
+            f"{elapsed * 1000:.0f} ms, worst loop stall {max(lags) * 1000:.0f} ms"
+        )
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=4, help="Concurrent conversions")
+    parser.add_argument(
+        "--paragraphs", type=int, default=2000, help="Paragraphs per page"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.paragraphs))
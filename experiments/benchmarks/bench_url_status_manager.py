@@ -0,0 +1,89 @@
+"""
+URL policy check cost with large allow-lists.
+
+Registers thousands of allowed domains plus a block list, then checks a
+stream of navigation URLs the way the WebSurfer does on every new page,
+download and navigation. The "linear scan" mode is the previous code path:
+every registered site is compared with ``urlparse`` and ``tldextract`` run on
+both URLs. The "index" mode is ``UrlStatusManager`` with its domain index and
+memoized parses.
+
+Usage:
+    python experiments/benchmarks/bench_url_status_manager.py --sites 5000
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+import tldextract
+from urllib.parse import urlparse
+
+from magentic_ui.tools.url_status_manager import URL_ALLOWED, UrlStatusManager
+
+
+def _linear_match(registered_url: str, proposed_url: str) -> bool:
+    if not urlparse(registered_url).scheme:
+        registered_url = "http://" + registered_url
+    if not urlparse(proposed_url).scheme:
+        proposed_url = "http://" + proposed_url
+    registered, proposed = urlparse(registered_url), urlparse(proposed_url)
+    ext_registered = tldextract.extract(registered_url)
+    ext_proposed = tldextract.extract(proposed_url)
+    http = ["http", "https"]
+    if not (registered.scheme in http and proposed.scheme in http):
+        if registered.scheme != proposed.scheme:
+            return False
+    if ext_registered.subdomain and ext_registered.subdomain != ext_proposed.subdomain:
+        return False
+    if ext_registered.domain != ext_proposed.domain:
+        return False
+    if ext_registered.suffix and ext_proposed.suffix != ext_registered.suffix:
+        return False
+    return not registered.path or proposed.path.startswith(registered.path)
+
+
+def _linear_is_allowed(sites: List[str], block_list: List[str], url: str) -> bool:
+    if any(_linear_match(site, url) for site in block_list):
+        return False
+    return any(_linear_match(site, url) for site in sites)
+
+
+def main(sites: int, checks: int) -> None:
+    rng = random.Random(0)
+    allowed = [f"site{i}.com" for i in range(sites)]
+    block_list = ["localhost:8081", "127.0.0.1:8081", "site1.com/admin"]
+    urls = [
+        f"https://www.site{rng.randrange(sites * 2)}.com/page/{rng.randrange(20)}"
+        for _ in range(checks)
+    ]
+
+    start = time.perf_counter()
+    linear = [_linear_is_allowed(allowed, block_list, url) for url in urls]
+    linear_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    manager = UrlStatusManager(
+        url_statuses={site: URL_ALLOWED for site in allowed},
+        url_block_list=block_list,
+    )
+    build_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = [manager.is_url_allowed(url) for url in urls]
+    indexed_elapsed = time.perf_counter() - start
+    assert indexed == linear
+
+    print(f"linear scan: {linear_elapsed * 1000 / checks:.2f} ms per check")
+    print(
+        f"      index: {indexed_elapsed * 1000 / checks:.4f} ms per check, "
+        f"built in {build_elapsed * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sites", type=int, default=5000, help="Allowed domains")
+    parser.add_argument("--checks", type=int, default=200, help="URLs checked")
+    args = parser.parse_args()
+    main(args.sites, args.checks)
@@ -144,6 +144,8 @@ def run_system_evaluation(
             system_constructor=system_constructor,
             subsample=args.subsample if args.subsample < 1 else None,
             redo_eval=args.redo_eval,
+            task_timeout=args.task_timeout,
+            max_retries=args.max_retries,
         )
 
 
@@ -202,6 +204,18 @@ def main() -> None:
     parser.add_argument(
         "--parallel", type=int, default=1, help="Number of parallel processes to use"
     )
+    parser.add_argument(
+        "--task-timeout",
+        type=float,
+        default=None,
+        help="Seconds a task may run before it is abandoned (only used in run mode)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=0,
+        help="Extra attempts for a task that failed or timed out (only used in run mode)",
+    )
     parser.add_argument(
         "--subsample",
         type=float,
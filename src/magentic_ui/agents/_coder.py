@@ -2,7 +2,8 @@ import asyncio
 from pathlib import Path
 import shutil
 import tempfile
-from typing import AsyncGenerator, List, Sequence, Optional
+import time
+from typing import AsyncGenerator, List, Sequence, Optional, Tuple
 import re
 from typing import Any, Mapping
 import uuid
@@ -56,6 +57,162 @@ def _extract_markdown_code_blocks(markdown_text: str) -> List[CodeBlock]:
     return code_blocks
 
 
+SHELL_LANGUAGES = {"sh", "bash", "shell"}
+# A first line marking a block as independent of the blocks before it
+_INDEPENDENT_MARKER_RE = re.compile(
+    r"\A\s*#\s*independent\s*$", re.IGNORECASE | re.MULTILINE
+)
+_INSTALL_RE = re.compile(
+    r"^(?:sudo\s+)?(?:pip3?|python3?\s+-m\s+pip|uv\s+pip|conda|apt(?:-get)?)\s+install\b"
+)
+_DOWNLOAD_RE = re.compile(r"^(?:wget|curl|echo)\b")
+_FILE_NAME_RE = re.compile(r"[\w./~-]*\w\.[A-Za-z]\w{0,4}\b")
+_OUTPUT_OPTIONS = {"-o", "-O", "--output", "--output-document", ">", ">>"}
+
+
+def _code_block_kind(code_block: CodeBlock) -> str:
+    """Classify a code block as "install", "download" or "other".
+
+    Only shell blocks made of package installs and downloads are classified
+    as "install" or "download", the side effects of any other block cannot be
+    told from its code.
+    """
+    if code_block.language.lower() in SHELL_LANGUAGES:
+        lines = [
+            line.strip()
+            for line in code_block.code.splitlines()
+            if line.strip() and not line.strip().startswith("#")
+        ]
+        if lines and all(
+            _INSTALL_RE.match(line) or _DOWNLOAD_RE.match(line) for line in lines
+        ):
+            if any(_INSTALL_RE.match(line) for line in lines):
+                return "install"
+            return "download"
+    return "other"
+
+
+def _code_block_files(code_block: CodeBlock) -> set[str]:
+    """Names of the files an install or download block may write."""
+    names: set[str] = set()
+    for line in code_block.code.splitlines():
+        words = line.split()
+        for previous, word in zip([""] + words, words):
+            if previous in _OUTPUT_OPTIONS:
+                names.add(word)
+            elif word.startswith(">") and word.strip(">"):
+                names.add(word.strip(">"))
+            elif word.startswith(("--output=", "--output-document=")):
+                names.add(word.split("=", 1)[1])
+            elif "://" in word:
+                # wget saves under the last part of the URL
+                names.add(word.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1])
+            else:
+                names.update(_FILE_NAME_RE.findall(word))
+    return {Path(name.strip("'\"")).name for name in names}
+
+
+def _code_block_dependencies(code_blocks: Sequence[CodeBlock]) -> List[List[int]]:
+    """For each code block, the earlier blocks that must finish before it runs.
+
+    A block depends on every earlier block, with two exceptions. A block
+    starting with the comment "# independent" depends on no earlier block.
+    A shell block that only installs packages or downloads files does not
+    depend on earlier blocks of that kind, unless both install packages or
+    both mention the same file name.
+    """
+    kinds = [_code_block_kind(cb) for cb in code_blocks]
+    files = [_code_block_files(cb) for cb in code_blocks]
+    dependencies: List[List[int]] = []
+    for i, cb in enumerate(code_blocks):
+        if _INDEPENDENT_MARKER_RE.match(cb.code):
+            dependencies.append([])
+            continue
+        dependencies.append(
+            [
+                j
+                for j in range(i)
+                if "other" in (kinds[i], kinds[j])
+                or kinds[i] == kinds[j] == "install"
+                or files[i] & files[j]
+            ]
+        )
+    return dependencies
+
+
+async def _execute_code_block(
+    code_executor: CodeExecutor,
+    cb: CodeBlock,
+    cancellation_token: CancellationToken,
+) -> Tuple[str, int, float]:
+    """Execute one code block and describe its result for the model.
+
+    Returns:
+        Tuple[str, int, float]: The output, the exit code and the execution time in seconds.
+    """
+    start = time.perf_counter()
+    exit_code: int = 1
+    encountered_exception: bool = False
+    code_output: str = ""
+    result: CodeResult | None = None
+    try:
+        result = await code_executor.execute_code_blocks([cb], cancellation_token)
+        exit_code = result.exit_code or 0
+        code_output = result.output
+    except Exception as e:
+        code_output = str(e)
+        encountered_exception = True
+    if encountered_exception or result is None:
+        code_output = (
+            f"An exception occurred while executing the code block: {code_output}"
+        )
+    elif code_output.strip() == "":
+        # No output
+        code_output = f"The script ran but produced no output to console. The POSIX exit code was: {result.exit_code}. If you were expecting output, consider revising the script to ensure content is printed to stdout."
+    elif exit_code != 0:
+        # Error
+        code_output = f"The script ran, then exited with an error (POSIX exit code: {result.exit_code})\nIts output was:\n{result.output}"
+    return code_output, exit_code, time.perf_counter() - start
+
+
+async def _execute_code_blocks(
+    code_executor: CodeExecutor,
+    code_blocks: Sequence[CodeBlock],
+    cancellation_token: CancellationToken,
+    max_parallel_code_blocks: int = 1,
+) -> AsyncGenerator[Tuple[str, int, float], None]:
+    """Execute code blocks and yield their results in the original order.
+
+    With `max_parallel_code_blocks` above 1, each block starts as soon as the
+    blocks it depends on (see `_code_block_dependencies`) finished, with at
+    most that many blocks executing at the same time.
+    """
+    if max_parallel_code_blocks <= 1:
+        for cb in code_blocks:
+            yield await _execute_code_block(code_executor, cb, cancellation_token)
+        return
+
+    dependencies = _code_block_dependencies(code_blocks)
+    semaphore = asyncio.Semaphore(max_parallel_code_blocks)
+    tasks: List[asyncio.Task[Tuple[str, int, float]]] = []
+
+    async def run(i: int) -> Tuple[str, int, float]:
+        await asyncio.gather(*(tasks[j] for j in dependencies[i]))
+        async with semaphore:
+            return await _execute_code_block(
+                code_executor, code_blocks[i], cancellation_token
+            )
+
+    tasks.extend(asyncio.create_task(run(i)) for i in range(len(code_blocks)))
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 async def _invoke_action_guard(
     thread: Sequence[BaseChatMessage | BaseAgentEvent],
     delta: Sequence[BaseChatMessage | BaseAgentEvent],
@@ -99,6 +256,7 @@ async def _coding_and_debug(
     cancellation_token: CancellationToken,
     model_context: ChatCompletionContext,
     approval_guard: BaseApprovalGuard | None,
+    max_parallel_code_blocks: int = 1,
 ) -> AsyncGenerator[TextMessage | bool, None]:
     """Write and debug code using the model and executor.
 
@@ -118,6 +276,7 @@ async def _coding_and_debug(
         cancellation_token (CancellationToken): The cancellation token to stop execution.
         model_context (ChatCompletionContext): The context for the model.
         approval_guard (ApprovalGuard | None): The approval guard to use for code execution.
+        max_parallel_code_blocks (int, optional): How many independent code blocks of a response may execute at the same time. Default: 1.
 
     Yields:
         TextMessage: The intermediate messages generated by the model and executor.
@@ -189,33 +348,20 @@ async def _coding_and_debug(
         exit_code_list: List[int] = []
         executed_code = True
         try:
-            for cb in code_block_list:
-                # execute the code block
-                exit_code: int = 1
-                encountered_exception: bool = False
-                code_output: str = ""
-                result: CodeResult | None = None
-                try:
-                    result = await code_executor.execute_code_blocks(
-                        [cb], cancellation_token
-                    )
-                    exit_code = result.exit_code or 0
-                    code_output = result.output
-                except Exception as e:
-                    code_output = str(e)
-                    encountered_exception = True
-                if encountered_exception or result is None:
-                    code_output = f"An exception occurred while executing the code block: {code_output}"
-                elif code_output.strip() == "":
-                    # No output
-                    code_output = f"The script ran but produced no output to console. The POSIX exit code was: {result.exit_code}. If you were expecting output, consider revising the script to ensure content is printed to stdout."
-                elif exit_code != 0:
-                    # Error
-                    code_output = f"The script ran, then exited with an error (POSIX exit code: {result.exit_code})\nIts output was:\n{result.output}"
+            async for code_output, exit_code, seconds in _execute_code_blocks(
+                code_executor,
+                code_block_list,
+                cancellation_token,
+                max_parallel_code_blocks,
+            ):
                 code_output_list.append(code_output)
                 code_output_msg = TextMessage(
                     source=agent_name + "-executor",
-                    metadata={"internal": "no", "type": "code_execution"},
+                    metadata={
+                        "internal": "no",
+                        "type": "code_execution",
+                        "execution_seconds": f"{seconds:.3f}",
+                    },
                     content=f"Execution result of code block {i + 1}:\n```console\n{code_output}\n```",
                 )
                 exit_code_list.append(exit_code)
@@ -305,6 +451,7 @@ class CoderAgentConfig(BaseModel):
     """
     max_debug_rounds: int = 3
     summarize_output: bool = False
+    max_parallel_code_blocks: int = 1
     # Optionally add code_executor config if needed
 
 
@@ -354,6 +501,11 @@ class CoderAgent(BaseChatAgent, Component[CoderAgentConfig]):
    VERY IMPORTANT: If you intend to write code to be executed, do not end your response without a code block. If you want to write code you must provide a code block in the current generation.
     """
 
+    system_prompt_parallel_code_blocks = """
+    Code blocks run one after the other unless marked as independent.
+    Start a code block with the comment line `# independent` only if it does not use any file, module or package that an earlier code block in your response writes, downloads or installs. It may then run at the same time as those blocks.
+    """
+
     def __init__(
         self,
         name: str,
@@ -367,6 +519,7 @@ class CoderAgent(BaseChatAgent, Component[CoderAgentConfig]):
         bind_dir: Path | str | None = None,
         use_local_executor: bool = False,
         approval_guard: BaseApprovalGuard | None = None,
+        max_parallel_code_blocks: int = 1,
     ) -> None:
         """Initialize the CoderAgent.
 
@@ -380,6 +533,7 @@ class CoderAgent(BaseChatAgent, Component[CoderAgentConfig]):
             work_dir (Path | str | None, optional): Working directory for code execution. Default: None.
             bind_dir (Path | str | None, optional): Directory to bind for Docker executor. Default: None.
             use_local_executor (bool, optional): Whether to use local instead of Docker executor. Default: False.
+            max_parallel_code_blocks (int, optional): How many code blocks of a response may execute at the same time when they do not depend on each other. Default: 1, executing them one by one.
         """
         super().__init__(name, description)
         self._model_client = model_client
@@ -389,9 +543,13 @@ class CoderAgent(BaseChatAgent, Component[CoderAgentConfig]):
         self._chat_history: List[BaseChatMessage] = []
         self._max_debug_rounds = max_debug_rounds
         self._summarize_output = summarize_output
+        self._max_parallel_code_blocks = max_parallel_code_blocks
         self.is_paused = False
         self._paused = asyncio.Event()
         self._approval_guard = approval_guard
+        self.did_lazy_init = False
+        # Serializes the team's background warm-up with initialization on first use
+        self._lazy_init_lock = asyncio.Lock()
 
         if work_dir is None:
             self._work_dir = Path(tempfile.mkdtemp())
@@ -417,13 +575,20 @@ class CoderAgent(BaseChatAgent, Component[CoderAgentConfig]):
         """Initialize the code executor if it has a start method.
 
         This method is called after initialization to set up any async resources
-        needed by the code executor.
+        needed by the code executor, and again on first use, which waits for a
+        start that is still in progress.
         """
-        if self._code_executor:
-            # check if the code executor has a start method
-            if hasattr(self._code_executor, "start"):
-                # TODO: we should add a no-op start() method to the base class.
-                await self._code_executor.start()  # type: ignore
+        if self.did_lazy_init:
+            return
+        async with self._lazy_init_lock:
+            if self.did_lazy_init:
+                return
+            if self._code_executor:
+                # check if the code executor has a start method
+                if hasattr(self._code_executor, "start"):
+                    # TODO: we should add a no-op start() method to the base class.
+                    await self._code_executor.start()  # type: ignore
+            self.did_lazy_init = True
 
     async def close(self) -> None:
         """Clean up resources used by the agent.
@@ -480,6 +645,7 @@ class CoderAgent(BaseChatAgent, Component[CoderAgentConfig]):
                 )
             )
             return
+        await self.lazy_init()
         self._chat_history.extend(messages)
         last_message_received: BaseChatMessage = messages[-1]
         inner_messages: List[BaseChatMessage] = []
@@ -500,6 +666,8 @@ class CoderAgent(BaseChatAgent, Component[CoderAgentConfig]):
         system_prompt_coder = self.system_prompt_coder_template.format(
             date_today=datetime.now().strftime("%Y-%m-%d")
         )
+        if self._max_parallel_code_blocks > 1:
+            system_prompt_coder += self.system_prompt_parallel_code_blocks
 
         try:
             executed_code = False
@@ -514,6 +682,7 @@ class CoderAgent(BaseChatAgent, Component[CoderAgentConfig]):
                 cancellation_token=code_execution_token,
                 model_context=self._model_context,
                 approval_guard=self._approval_guard,
+                max_parallel_code_blocks=self._max_parallel_code_blocks,
             ):
                 if isinstance(msg, bool):
                     executed_code = msg
@@ -605,6 +774,7 @@ class CoderAgent(BaseChatAgent, Component[CoderAgentConfig]):
             description=self.description,
             max_debug_rounds=self._max_debug_rounds,
             summarize_output=self._summarize_output,
+            max_parallel_code_blocks=self._max_parallel_code_blocks,
             # TODO: Optionally add code_executor configuration if supported
         )
 
@@ -617,6 +787,7 @@ class CoderAgent(BaseChatAgent, Component[CoderAgentConfig]):
             description=config.description,
             max_debug_rounds=config.max_debug_rounds,
             summarize_output=config.summarize_output,
+            max_parallel_code_blocks=config.max_parallel_code_blocks,
             # TODO: Optionally load code_executor from config if provided
         )
 
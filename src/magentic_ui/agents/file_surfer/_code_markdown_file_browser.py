@@ -1,20 +1,19 @@
+import bisect
 import io
+import json
 import re
 import time
 from pathlib import Path
-from mimetypes import guess_type
-from typing import List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from autogen_core.code_executor import CodeExecutor, CodeBlock
 from autogen_core import CancellationToken
 
-from markitdown import FileConversionException, MarkItDown, UnsupportedFormatException
-from ._browser_code_helpers import (
-    get_path_validation_code,
-    get_is_dir_check_code,
-    get_file_conversion_code,
-    get_directory_listing_code,
-    get_find_files_code,
-)
+from markitdown import MarkItDown
+from ._browser_code_helpers import RESULT_PREFIX, get_file_helper_code
+
+# Pages end after the first whitespace at or past the viewport size
+_PAGE_BREAK_RE = re.compile(r"[ \t\r\n]")
+_NON_WORD_RE = re.compile(r"\W+")
 
 
 class CodeExecutorMarkdownFileBrowser:
@@ -47,6 +46,7 @@ class CodeExecutorMarkdownFileBrowser:
         self.viewport_current_page = 0
         self.viewport_pages: List[Tuple[int, int]] = list()
         self.image_path: Optional[str] = None
+        self.conversion_pending = False
         self._markdown_converter = MarkItDown()
         self._page_content: str = ""
         self._find_on_page_query: Union[str, None] = None
@@ -55,6 +55,10 @@ class CodeExecutorMarkdownFileBrowser:
         )
         self._code_executor = code_executor
         self.did_lazy_init = False
+        # Normalized page text for searches, see `_matching_viewports`
+        self._search_text: Optional[str] = None
+        self._search_page_starts: List[int] = list()
+        self._search_matches: Dict[str, List[int]] = dict()
 
     async def lazy_init(self) -> None:
         """
@@ -112,6 +116,8 @@ class CodeExecutorMarkdownFileBrowser:
             split_pages (bool, optional): Whether to split the content into pages based on the viewport size. Default: True
         """
         self._page_content = content
+        self._search_text = None
+        self._search_matches = {}
 
         if split_pages:
             self._split_pages()
@@ -205,20 +211,53 @@ class CodeExecutorMarkdownFileBrowser:
         if nquery.strip() == "":
             return None
 
-        idxs: List[int] = list()
-        idxs.extend(range(starting_viewport, len(self.viewport_pages)))
-        idxs.extend(range(0, starting_viewport))
-
-        for i in idxs:
-            bounds = self.viewport_pages[i]
-            content = self.page_content[bounds[0] : bounds[1]]
+        matches = self._matching_viewports(nquery)
+        if not matches:
+            return None
+        i = bisect.bisect_left(matches, starting_viewport)
+        return matches[i] if i < len(matches) else matches[0]
 
-            # TODO: Remove markdown links and images
-            ncontent = " " + (" ".join(re.split(r"\W+", content))).strip().lower() + " "
-            if re.search(nquery, ncontent):
-                return i
+    def _matching_viewports(self, nquery: str) -> List[int]:
+        """
+        Indexes of the viewport pages matching a normalized query, in order.
 
-        return None
+        The pages are normalized once per document into a single search text,
+        one page per line, so that a query is matched with one regex pass and
+        `find_next` is a lookup in its cached result.
+        """
+        matches = self._search_matches.get(nquery)
+        if matches is not None:
+            return matches
+
+        if self._search_text is None:
+            pages: List[str] = []
+            self._search_page_starts = []
+            offset = 0
+            for bounds in self.viewport_pages:
+                content = self.page_content[bounds[0] : bounds[1]]
+                # TODO: Remove markdown links and images
+                ncontent = " " + _NON_WORD_RE.sub(" ", content).strip().lower() + " "
+                pages.append(ncontent)
+                self._search_page_starts.append(offset)
+                offset += len(ncontent) + 1
+            # Normalized pages contain no newlines, so matches never span pages
+            self._search_text = "\n".join(pages)
+
+        matches = []
+        pattern = re.compile(nquery)
+        starts = self._search_page_starts
+        pos = 0
+        while True:
+            match = pattern.search(self._search_text, pos)
+            if match is None:
+                break
+            page = bisect.bisect_right(starts, match.start()) - 1
+            matches.append(page)
+            if page + 1 == len(starts):
+                break
+            pos = starts[page + 1]
+        self._search_matches[nquery] = matches
+        return matches
 
     async def open_path(self, path: str) -> str:
         """
@@ -244,27 +283,34 @@ class CodeExecutorMarkdownFileBrowser:
         while start_idx < len(self._page_content):
             end_idx = min(start_idx + self.viewport_size, len(self._page_content))
             # Adjust to end on a space
-            while end_idx < len(self._page_content) and self._page_content[
-                end_idx - 1
-            ] not in [" ", "\t", "\r", "\n"]:
-                end_idx += 1
+            if end_idx < len(self._page_content):
+                space = _PAGE_BREAK_RE.search(self._page_content, end_idx - 1)
+                end_idx = space.end() if space else len(self._page_content)
             self.viewport_pages.append((start_idx, end_idx))
             start_idx = end_idx
 
-    async def _validate_path(self, path: str) -> bool:
+    async def _run_helper(self, operation: str, argument: Any = None) -> Any:
         """
-        Validate that a path exists using the code executor.
+        Run a file operation in the code executor with a single code block.
+
         Args:
-            path (str): The path to validate.
+            operation (str): The operation, see `get_file_helper_code`
+            argument (Any, optional): Its path or query. Default: None
         Returns:
-            bool: True if the path exists, False otherwise.
+            Any: The operation's result
         """
-        code = get_path_validation_code(path)
         result = await self._code_executor.execute_code_blocks(
-            [CodeBlock(code=code, language="python")],
+            [
+                CodeBlock(
+                    code=get_file_helper_code(operation, argument), language="python"
+                )
+            ],
             cancellation_token=CancellationToken(),
         )
-        return result.output.strip().lower() == "true"
+        for line in reversed(result.output.splitlines()):
+            if line.startswith(RESULT_PREFIX):
+                return json.loads(line[len(RESULT_PREFIX) :])["result"]
+        raise RuntimeError(f"File operation '{operation}' failed: {result.output}")
 
     async def _open_path(
         self,
@@ -272,87 +318,67 @@ class CodeExecutorMarkdownFileBrowser:
     ) -> None:
         """
         Open a file for reading, converting it to Markdown in the process.
+        Validation, classification and conversion run in one code execution.
+        Large PDFs that were not converted before open with a preview of their
+        first pages and set `conversion_pending` (see `complete_conversion`).
         Args:
             path (str): The path to the file to open.
         """
-        if not await self._validate_path(path):
+        opened = await self._run_helper("open", path)
+        self.conversion_pending = bool(opened.get("partial"))
+        kind = opened["kind"]
+        error = opened.get("error")
+        if kind == "missing" or error == "FileNotFoundError":
             self.page_title = "FileNotFoundError"
             self._set_page_content(f"# FileNotFoundError\n\nFile not found: {path}")
+        elif kind == "directory":
+            res = self._markdown_converter.convert_stream(
+                io.BytesIO(opened["content"].encode("utf-8")),
+                file_extension=".txt",
+            )
+            self.page_title = res.title
+            self._set_page_content(res.text_content, split_pages=False)
+        elif kind == "image":
+            self.page_title = Path(path).name
+            self._set_page_content("")
+            work_dir = getattr(self._code_executor, "work_dir", ".")
+            self.image_path = str((Path(work_dir) / path).resolve())
+        elif error == "UnsupportedFormatException":
+            self.page_title = "UnsupportedFormatException"
+            self._set_page_content(
+                f"# UnsupportedFormatException\n\nCannot preview '{path}' as Markdown."
+            )
+        elif error is not None:
+            self.page_title = "FileConversionException."
+            self._set_page_content(
+                f"# FileConversionException\n\nError converting '{path}' to Markdown."
+            )
         else:
-            try:
-                code = get_is_dir_check_code(path)
-                result = await self._code_executor.execute_code_blocks(
-                    [CodeBlock(code=code, language="python")],
-                    cancellation_token=CancellationToken(),
-                )
-                is_dir = result.output.strip().lower() == "true"
-                mime_type, _ = guess_type(path)
-
-                if is_dir:
-                    dir_content = await self._fetch_local_dir(path)
-                    res = self._markdown_converter.convert_stream(
-                        io.BytesIO(dir_content.encode("utf-8")),
-                        file_extension=".txt",
-                    )
-                    self.page_title = res.title
-                    self._set_page_content(res.text_content, split_pages=False)
-                elif mime_type and mime_type.startswith("image/"):
-                    self.page_title = Path(path).name
-                    self._set_page_content("")
+            self.page_title = opened["title"] or None
+            markdown_content = opened["content"]
+            self._set_page_content(markdown_content)
+
+            # Save as .converted.md regardless of original extension
+            if self.save_converted_files and not self.conversion_pending:
+                try:
                     work_dir = getattr(self._code_executor, "work_dir", ".")
-                    self.image_path = str((Path(work_dir) / path).resolve())
-                else:
-                    # Read and convert file content using code executor
-                    convert_code = get_file_conversion_code(path)
-                    result = await self._code_executor.execute_code_blocks(
-                        [CodeBlock(code=convert_code, language="python")],
-                        cancellation_token=CancellationToken(),
-                    )
-
-                    # Parse the output to get title and content
-                    output_lines = result.output.split("\n")
-                    title_line = next(
-                        line for line in output_lines if line.startswith("TITLE:")
-                    )
-                    content_start = next(
-                        i
-                        for i, line in enumerate(output_lines)
-                        if line.startswith("CONTENT:")
-                    )
-
-                    self.page_title = title_line[6:] or None
-                    markdown_content = "\n".join(output_lines[content_start:])[8:]
-                    self._set_page_content(markdown_content)
-
-                    # Save as .converted.md regardless of original extension
-                    if self.save_converted_files:
-                        try:
-                            work_dir = getattr(self._code_executor, "work_dir", ".")
-                            converted_dir = Path(work_dir) / "converted_files"
-                            converted_dir.mkdir(
-                                parents=True, exist_ok=True
-                            )  # Create if it doesn't exist
-                            original_path = (Path(work_dir) / path).resolve()
-                            md_filename = original_path.stem + ".converted.md"
-                            md_path = converted_dir / md_filename
-                            md_path.write_text(markdown_content)
-                        except Exception as e:
-                            print(
-                                f"Warning: Failed to save markdown file for {path}: {e}"
-                            )
-            except UnsupportedFormatException:
-                self.page_title = "UnsupportedFormatException"
-                self._set_page_content(
-                    f"# UnsupportedFormatException\n\nCannot preview '{path}' as Markdown."
-                )
-            except FileConversionException:
-                self.page_title = "FileConversionException."
-                self._set_page_content(
-                    f"# FileConversionException\n\nError converting '{path}' to Markdown."
-                )
-            except FileNotFoundError:
-                self.page_title = "FileNotFoundError"
-                self._set_page_content(f"# FileNotFoundError\n\nFile not found: {path}")
+                    converted_dir = Path(work_dir) / "converted_files"
+                    converted_dir.mkdir(
+                        parents=True, exist_ok=True
+                    )  # Create if it doesn't exist
+                    original_path = (Path(work_dir) / path).resolve()
+                    md_filename = original_path.stem + ".converted.md"
+                    md_path = converted_dir / md_filename
+                    md_path.write_text(markdown_content)
+                except Exception as e:
+                    print(f"Warning: Failed to save markdown file for {path}: {e}")
+
+    async def complete_conversion(self) -> None:
+        """
+        Replace the preview of a large document with the full document once its conversion finished.
+        """
+        if self.conversion_pending:
+            await self._open_path(self.path)
 
     async def _fetch_local_dir(self, local_path: str) -> str:
         """
@@ -364,12 +390,7 @@ class CodeExecutorMarkdownFileBrowser:
         Returns:
             str: A string containing a Markdown-formatted table with columns for name, size, and modification date of directory entries.
         """
-        code = get_directory_listing_code(local_path)
-        result = await self._code_executor.execute_code_blocks(
-            [CodeBlock(code=code, language="python")],
-            cancellation_token=CancellationToken(),
-        )
-        return result.output
+        return await self._run_helper("list", local_path)
 
     async def find_files(self, query: str) -> str:
         """
@@ -382,9 +403,9 @@ class CodeExecutorMarkdownFileBrowser:
         Returns:
             str: Markdown formatted string with search results
         """
-        code = get_find_files_code(query)
-        result = await self._code_executor.execute_code_blocks(
-            [CodeBlock(code=code, language="python")],
-            cancellation_token=CancellationToken(),
-        )
-        return result.output
+        return json.dumps(await self._run_helper("find", query))
+
+    async def close(self) -> None:
+        """Stop the helper process that serves file operations in the code executor."""
+        if self.did_lazy_init:
+            await self._run_helper("stop")
@@ -163,12 +163,18 @@ class FileSurfer(BaseChatAgent, Component[FileSurferConfig]):
             save_converted_files=save_converted_files,
         )
         self.did_lazy_init = False
+        # Serializes the team's background warm-up with initialization on first use
+        self._lazy_init_lock = asyncio.Lock()
         self.is_paused = False
         self._pause_event = asyncio.Event()
 
     async def lazy_init(self) -> None:
         """Initialize code executor and browser on first use."""
-        if not self.did_lazy_init:
+        if self.did_lazy_init:
+            return
+        async with self._lazy_init_lock:
+            if self.did_lazy_init:
+                return
             if self._code_executor:
                 # check if the code executor has a start method
                 if hasattr(self._code_executor, "start"):
@@ -412,13 +418,16 @@ class FileSurfer(BaseChatAgent, Component[FileSurferConfig]):
                             self._browser.page_up()
 
                         case "page_down":
+                            await self._browser.complete_conversion()
                             self._browser.page_down()
 
                         case "find_on_page_ctrl_f":
+                            await self._browser.complete_conversion()
                             search_string = arguments["search_string"]
                             self._browser.find_on_page(search_string)
 
                         case "find_next":
+                            await self._browser.complete_conversion()
                             self._browser.find_next()
 
                         case "find_file":
@@ -588,12 +597,20 @@ class FileSurfer(BaseChatAgent, Component[FileSurferConfig]):
         header += (
             f" Viewport position: Showing page {current_page+1} of {total_pages}.\n"
         )
+        if self._browser.conversion_pending:
+            header += (
+                " The document is still being converted, more pages will follow.\n"
+            )
 
         return (header, self._browser.viewport)
 
     async def close(self) -> None:
         """Close the FileSurfer agent."""
         logger.info("Closing FileSurfer...")
+        try:
+            await self._browser.close()
+        except Exception as e:
+            logger.warning(f"Failed to stop the file helper: {e}")
         if hasattr(self, "_code_executor"):
             await self._code_executor.stop()
         await self._model_client.close()
@@ -0,0 +1,114 @@
+"""
+Perceptual comparison of consecutive screenshots, so that a viewport that did
+not visibly change is not sent to a model again.
+"""
+
+import io
+from dataclasses import dataclass
+from typing import BinaryIO, Optional, cast
+
+import numpy as np
+from numpy.typing import NDArray
+from PIL import Image
+
+NO_VISUAL_CHANGE_NOTE = "(The page looks the same as in the previous screenshot.)"
+
+
+def screenshot_fingerprint(
+    screenshot: bytes | Image.Image | io.BufferedIOBase, size: int = 64
+) -> NDArray[np.int16]:
+    """
+    Compute a perceptual fingerprint of a screenshot.
+
+    The fingerprint is a `size` x `size` grayscale thumbnail where every pixel
+    is the average of the block of the screenshot it covers, so that a few
+    pixels of anti-aliasing noise barely move it, while a changed character or
+    control does.
+
+    Args:
+        screenshot (bytes | Image.Image | io.BufferedIOBase): The screenshot as bytes, PIL Image or file-like object
+        size (int, optional): Side of the thumbnail. Default: 64.
+
+    Returns:
+        NDArray[np.int16]: The thumbnail pixels
+    """
+    if isinstance(screenshot, Image.Image):
+        image = screenshot
+    else:
+        if isinstance(screenshot, bytes):
+            screenshot = io.BytesIO(screenshot)
+        image = Image.open(cast(BinaryIO, screenshot))
+    thumbnail = image.convert("L").resize((size, size), Image.Resampling.BOX)
+    return np.asarray(thumbnail, dtype=np.int16)
+
+
+@dataclass
+class ScreenshotDedupStats:
+    """
+    Counters of a `ScreenshotDeduplicator`.
+
+    Attributes:
+        screenshots (int): Screenshots compared.
+        images_saved (int): Images not sent because nothing visibly changed.
+        tokens_avoided (int): Estimated prompt tokens of the images not sent.
+    """
+
+    screenshots: int = 0
+    images_saved: int = 0
+    tokens_avoided: int = 0
+
+
+class ScreenshotDeduplicator:
+    """
+    Remembers the last screenshot sent to a model and detects repeats.
+
+    Two screenshots are considered the same when no pixel of their
+    fingerprints differs by more than `tolerance` gray levels.
+
+    Args:
+        tokens_per_image (int): Estimated prompt tokens of one image, used for the statistics
+        tolerance (int, optional): Largest fingerprint difference still considered unchanged. Default: 4.
+        size (int, optional): Side of the fingerprint thumbnail. Default: 64.
+    """
+
+    def __init__(self, tokens_per_image: int, tolerance: int = 4, size: int = 64):
+        self.tokens_per_image = tokens_per_image
+        self.tolerance = tolerance
+        self.size = size
+        self.stats = ScreenshotDedupStats()
+        self._last: Optional[NDArray[np.int16]] = None
+
+    def observe(
+        self,
+        screenshot: bytes | Image.Image | io.BufferedIOBase,
+        images: int = 1,
+    ) -> bool:
+        """
+        Compare a screenshot with the last one that was sent
+
+        If it is unchanged, the caller is expected to leave out the `images`
+        images derived from it, which is recorded in `stats`. Otherwise it
+        becomes the new reference.
+
+        Args:
+            screenshot (bytes | Image.Image | io.BufferedIOBase): The new screenshot
+            images (int, optional): Images the caller would send for this screenshot. Default: 1.
+
+        Returns:
+            bool: True if the screenshot looks the same as the last one sent
+        """
+        fingerprint = screenshot_fingerprint(screenshot, self.size)
+        self.stats.screenshots += 1
+        if (
+            self._last is not None
+            and int(np.abs(fingerprint - self._last).max()) <= self.tolerance
+        ):
+            self.stats.images_saved += images
+            self.stats.tokens_avoided += images * self.tokens_per_image
+            return True
+        self._last = fingerprint
+        return False
+
+    def reset(self) -> None:
+        """Forget the last screenshot, so the next one is always sent"""
+        self._last = None
@@ -1,9 +1,13 @@
 import io
-from typing import BinaryIO, Dict, List, Tuple, cast
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, Dict, List, Optional, Tuple, cast
 
+import numpy as np
+from numpy.typing import NDArray
 from PIL import Image, ImageDraw, ImageFont
 
-from ...tools.playwright.types import DOMRectangle, InteractiveRegion
+from ...tools.playwright.types import InteractiveRegion
 
 """
 This module provides functionality to annotate screenshots with numbered markers for interactive regions.
@@ -12,6 +16,38 @@ It handles marking visible elements as well as tracking elements that are above
 
 TOP_NO_LABEL_ZONE = 20  # Don't print any labels close the top of the page
 
+MARK_COLOR = (255, 0, 0)  # Red color for outlines and label backgrounds
+TEXT_COLOR = (255, 255, 255)  # White text for better contrast
+OUTLINE_WIDTH = 2
+LABEL_PADDING = 3
+FONT_SIZE = 14
+
+
+@dataclass
+class SetOfMark:
+    """
+    Result of :func:`render_set_of_mark`.
+
+    Attributes:
+        image (Image.Image): The annotated screenshot
+        screenshot (Image.Image): The decoded screenshot without annotations
+        visible_rects (List[str]): Visible element IDs
+        rects_above (List[str]): Element IDs above the viewport
+        rects_below (List[str]): Element IDs below the viewport
+        id_mapping (Dict[str, str]): Mapping of displayed IDs to original element IDs
+        scaled_image (Image.Image, optional): `image` resized to the requested size
+        scaled_screenshot (Image.Image, optional): `screenshot` resized to the requested size
+    """
+
+    image: Image.Image
+    screenshot: Image.Image
+    visible_rects: List[str]
+    rects_above: List[str]
+    rects_below: List[str]
+    id_mapping: Dict[str, str]
+    scaled_image: Optional[Image.Image] = None
+    scaled_screenshot: Optional[Image.Image] = None
+
 
 def add_set_of_mark(
     screenshot: bytes | Image.Image | io.BufferedIOBase,
@@ -34,48 +70,141 @@ def add_set_of_mark(
         - List[str]: List of element IDs below viewport
         - Dict[str, str]: Mapping of displayed IDs to original element IDs
     """
-    if isinstance(screenshot, Image.Image):
-        return _add_set_of_mark(screenshot, ROIs, use_sequential_ids)
+    som = render_set_of_mark(screenshot, ROIs, use_sequential_ids)
+    if som.screenshot is not screenshot:
+        som.screenshot.close()
+    return (
+        som.image,
+        som.visible_rects,
+        som.rects_above,
+        som.rects_below,
+        som.id_mapping,
+    )
+
+
+def render_set_of_mark(
+    screenshot: bytes | Image.Image | io.BufferedIOBase,
+    ROIs: Dict[str, InteractiveRegion],
+    use_sequential_ids: bool = False,
+    scaled_size: Optional[Tuple[int, int]] = None,
+) -> SetOfMark:
+    """
+    Decode a screenshot once and derive the annotated image and, optionally,
+    model-sized copies of both the annotated and the plain screenshot from it.
+
+    Marks are drawn straight into one NumPy buffer: outline geometry for all
+    regions is computed at once and labels are pasted from cached pre-rendered
+    tiles, so no per-region text layout or alpha compositing is needed.
+
+    Args:
+        screenshot (bytes | Image.Image | io.BufferedIOBase): The screenshot image as bytes, PIL Image, or file-like object
+        ROIs (Dict[str, InteractiveRegion]): Dictionary mapping element IDs to their interactive regions
+        use_sequential_ids (bool): If True, assigns sequential numbers to elements instead of using original IDs
+        scaled_size (Tuple[int, int], optional): Also return both images resized to this (width, height). Default: None
 
-    if isinstance(screenshot, bytes):
-        screenshot = io.BytesIO(screenshot)
+    Returns:
+        SetOfMark: The annotated image, the decoded screenshot and the element ID lists
+    """
+    image = _decode(screenshot)
+    visible_rects, rects_above, rects_below = _partition_rects(image.size, ROIs)
+
+    id_mapping: Dict[str, str] = {}  # Maps new IDs to original IDs
+    original_to_new: Dict[str, str] = {}
 
-    image = Image.open(cast(BinaryIO, screenshot))
-    comp, visible_rects, rects_above, rects_below, id_mapping = _add_set_of_mark(
-        image, ROIs, use_sequential_ids
+    def map_ids(original_ids: List[str]) -> List[str]:
+        new_ids: List[str] = []
+        for original_id in original_ids:
+            new_id = str(len(id_mapping) + 1) if use_sequential_ids else original_id
+            id_mapping[new_id] = original_id
+            original_to_new[original_id] = new_id
+            new_ids.append(new_id)
+        return new_ids
+
+    # Map IDs in sequence: visible first, then above, then below
+    new_visible_rects = map_ids(visible_rects)
+    new_rects_above = map_ids(rects_above)
+    new_rects_below = map_ids(rects_below)
+
+    pixels = np.array(image)
+    _draw_marks(pixels, ROIs, original_to_new)
+    marked = Image.fromarray(pixels)
+
+    som = SetOfMark(
+        image=marked,
+        screenshot=image,
+        visible_rects=new_visible_rects,
+        rects_above=new_rects_above,
+        rects_below=new_rects_below,
+        id_mapping=id_mapping,
     )
-    image.close()
-    return comp, visible_rects, rects_above, rects_below, id_mapping
+    if scaled_size is not None:
+        som.scaled_image = marked.resize(scaled_size)
+        som.scaled_screenshot = image.resize(scaled_size)
+    return som
 
 
-def _add_set_of_mark(
-    screenshot: Image.Image,
-    ROIs: Dict[str, InteractiveRegion],
-    use_sequential_ids: bool = True,
-) -> Tuple[Image.Image, List[str], List[str], List[str], Dict[str, str]]:
+def scale_screenshot(
+    screenshot: bytes | Image.Image | io.BufferedIOBase, size: Tuple[int, int]
+) -> Image.Image:
     """
-    Internal implementation for adding markers to the screenshot.
+    Decode a screenshot the way :func:`render_set_of_mark` does and resize it.
 
     Args:
-        screenshot (Image.Image): PIL Image to annotate
+        screenshot (bytes | Image.Image | io.BufferedIOBase): The screenshot image as bytes, PIL Image, or file-like object
+        size (Tuple[int, int]): Target (width, height)
+
+    Returns:
+        Image.Image: The resized screenshot
+    """
+    image = _decode(screenshot)
+    scaled = image.resize(size)
+    if image is not screenshot:
+        image.close()
+    return scaled
+
+
+def _decode(screenshot: bytes | Image.Image | io.BufferedIOBase) -> Image.Image:
+    """Open a screenshot as an RGB image, reusing it if it already is one."""
+    if isinstance(screenshot, Image.Image):
+        image = screenshot
+    else:
+        if isinstance(screenshot, bytes):
+            screenshot = io.BytesIO(screenshot)
+        image = Image.open(cast(BinaryIO, screenshot))
+    if image.mode != "RGB":
+        converted = image.convert("RGB")
+        if image is not screenshot:
+            image.close()
+        image = converted
+    return image
+
+
+def _partition_rects(
+    size: Tuple[int, int], ROIs: Dict[str, InteractiveRegion]
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Sort element IDs into visible, above and below the viewport.
+
+    Args:
+        size (Tuple[int, int]): Width and height of the screenshot
         ROIs (Dict[str, InteractiveRegion]): Dictionary of interactive regions
-        use_sequential_ids (bool): Whether to use sequential numbers instead of original IDs
 
     Returns:
-        Same as :func:`add_set_of_mark`
+        Tuple of the visible, above and below element ID lists
     """
+    width, height = size
     visible_rects: List[str] = []
     rects_above: List[str] = []  # Scroll up to see
     rects_below: List[str] = []  # Scroll down to see
-    id_mapping: Dict[str, str] = {}  # Maps new IDs to original IDs
-
-    base = screenshot.convert("RGBA")
+    seen_above: set[str] = set()
+    seen_below: set[str] = set()
+    seen_visible: set[str] = set()
 
-    # First pass to identify all rectangles
     for original_id, roi in ROIs.items():
         # Handle options separately and add to visible only
         if roi.get("tag_name") == "option" or roi.get("tag_name") == "input, type=file":
-            if original_id not in visible_rects:
+            if original_id not in seen_visible:
+                seen_visible.add(original_id)
                 visible_rects.append(original_id)
             continue
 
@@ -84,59 +213,43 @@ def _add_set_of_mark(
             if not rect or rect["width"] * rect["height"] == 0:
                 continue
 
-            mid = (
-                (rect["right"] + rect["left"]) / 2.0,
-                (rect["top"] + rect["bottom"]) / 2.0,
-            )
+            mid_x = (rect["right"] + rect["left"]) / 2.0
+            mid_y = (rect["top"] + rect["bottom"]) / 2.0
 
             # Only process if x coordinate is valid
-            if 0 <= mid[0] < base.size[0]:
+            if 0 <= mid_x < width:
                 # Add to exactly one list based on y coordinate
-                if mid[1] < 0 and original_id not in rects_above:
-                    rects_above.append(original_id)
-                elif mid[1] >= base.size[1] and original_id not in rects_below:
-                    rects_below.append(original_id)
-                elif 0 <= mid[1] < base.size[1] and original_id not in visible_rects:
+                if mid_y < 0:
+                    if original_id not in seen_above:
+                        seen_above.add(original_id)
+                        rects_above.append(original_id)
+                elif mid_y >= height:
+                    if original_id not in seen_below:
+                        seen_below.add(original_id)
+                        rects_below.append(original_id)
+                elif original_id not in seen_visible:
+                    seen_visible.add(original_id)
                     visible_rects.append(original_id)
 
-    # Create new sequential IDs for all rectangles
-    next_id = 1
-    original_to_new: Dict[str, str] = {}  # Add reverse mapping
+    return visible_rects, rects_above, rects_below
 
-    # Helper function to create new mapped IDs
-    def map_ids(original_ids: List[str]) -> List[str]:
-        nonlocal next_id, original_to_new
-        new_ids: List[str] = []
-        for original_id in original_ids:
-            new_id = str(next_id)
-            id_mapping[new_id] = original_id
-            original_to_new[original_id] = new_id  # Store reverse mapping
-            new_ids.append(new_id)
-            next_id += 1
-        return new_ids
 
-    if use_sequential_ids:
-        # Map IDs in sequence: visible first, then above, then below
-        new_visible_rects = map_ids(visible_rects)
-        new_rects_above = map_ids(rects_above)
-        new_rects_below = map_ids(rects_below)
-    else:
-        # Use original IDs but still maintain the mapping
-        new_visible_rects = visible_rects.copy()
-        new_rects_above = rects_above.copy()
-        new_rects_below = rects_below.copy()
-        # Create identity mapping for all IDs
-        for id_list in [visible_rects, rects_above, rects_below]:
-            for original_id in id_list:
-                id_mapping[original_id] = original_id
-                original_to_new[original_id] = original_id
-
-    # Drawing code remains the same
-    fnt = ImageFont.load_default(14)
-    overlay = Image.new("RGBA", base.size)
-    draw = ImageDraw.Draw(overlay)
-
-    # Much simpler and faster lookup using the reverse mapping
+def _draw_marks(
+    pixels: NDArray[np.uint8],
+    ROIs: Dict[str, InteractiveRegion],
+    original_to_new: Dict[str, str],
+) -> None:
+    """
+    Draw outlines and labels for every on-screen rectangle, in place.
+
+    Args:
+        pixels (NDArray[np.uint8]): RGB pixels of the screenshot, modified in place
+        ROIs (Dict[str, InteractiveRegion]): Dictionary of interactive regions
+        original_to_new (Dict[str, str]): Mapping of original element IDs to displayed IDs
+    """
+    height, width = pixels.shape[:2]
+    boxes: List[Tuple[float, float, float, float]] = []
+    labels: List[str] = []
     for original_id, roi in ROIs.items():
         if roi.get("tag_name") == "option":
             continue
@@ -148,62 +261,98 @@ def _add_set_of_mark(
         for rect in roi["rects"]:
             if not rect or rect["width"] * rect["height"] == 0:
                 continue
-
-            mid = (
-                (rect["right"] + rect["left"]) / 2.0,
-                (rect["top"] + rect["bottom"]) / 2.0,
-            )
-
-            if 0 <= mid[0] < base.size[0] and 0 <= mid[1] < base.size[1]:
-                _draw_roi(draw, new_id, fnt, rect)
-
-    comp = Image.alpha_composite(base, overlay)
-    overlay.close()
-
-    return comp, new_visible_rects, new_rects_above, new_rects_below, id_mapping
-
-
-def _draw_roi(
-    draw: ImageDraw.ImageDraw,
-    idx: str | int,  # Fix type hint to allow both string and int indices
-    font: ImageFont.FreeTypeFont | ImageFont.ImageFont,
-    rect: DOMRectangle,
+            mid_x = (rect["right"] + rect["left"]) / 2.0
+            mid_y = (rect["top"] + rect["bottom"]) / 2.0
+            if 0 <= mid_x < width and 0 <= mid_y < height:
+                boxes.append((rect["left"], rect["top"], rect["right"], rect["bottom"]))
+                labels.append(new_id)
+
+    if not boxes:
+        return
+
+    # Integer pixel coordinates, truncated like PIL does
+    coords = np.array(boxes)
+    left, top, right, bottom = np.trunc(coords).astype(np.int64).T
+    _draw_outlines(pixels, left, top, right, bottom)
+
+    # Labels go above the box, or below it if too close to the top of the page
+    below = coords[:, 1] <= TOP_NO_LABEL_ZONE
+    anchor_y = np.where(below, bottom, top)
+    for label, x, y, is_below in zip(labels, right, anchor_y, below):
+        tile, dx, dy = _label_tile(label, "rt" if is_below else "rb")
+        _paste(pixels, tile, int(x) + dx, int(y) + dy)
+
+
+def _draw_outlines(
+    pixels: NDArray[np.uint8],
+    left: NDArray[np.int64],
+    top: NDArray[np.int64],
+    right: NDArray[np.int64],
+    bottom: NDArray[np.int64],
 ) -> None:
     """
-    Draw a single region of interest on the image.
+    Draw `OUTLINE_WIDTH` wide rectangle outlines for all boxes.
 
-    Args:
-        draw (ImageDraw.ImageDraw): PIL ImageDraw object
-        idx (str | int): Index/ID to display on the marker
-        font (ImageFont.FreeTypeFont | ImageFont.ImageFont): Font to use for the marker text
-        rect (DOMRectangle): Rectangle coordinates for the region
+    The edge strips of all boxes are computed and clipped at once; each strip
+    is then a single slice assignment, so the cost is proportional to the
+    outline length rather than to the image size.
     """
-    color = (255, 0, 0, 255)  # Red color for outline
-    text_color = (255, 255, 255, 255)  # White text for better contrast
+    height, width = pixels.shape[:2]
+    w = OUTLINE_WIDTH
+    # Boxes are inclusive of their right and bottom edges, as in PIL
+    x0, y0, x1, y1 = left, top, right + 1, bottom + 1
+    strips = np.concatenate(
+        [
+            np.stack([x0, y0, x1, np.minimum(y0 + w, y1)], axis=1),  # top
+            np.stack([x0, np.maximum(y1 - w, y0), x1, y1], axis=1),  # bottom
+            np.stack([x0, y0, np.minimum(x0 + w, x1), y1], axis=1),  # left
+            np.stack([np.maximum(x1 - w, x0), y0, x1, y1], axis=1),  # right
+        ]
+    )
+    strips[:, 0::2] = np.clip(strips[:, 0::2], 0, width)
+    strips[:, 1::2] = np.clip(strips[:, 1::2], 0, height)
+    strips = strips[(strips[:, 0] < strips[:, 2]) & (strips[:, 1] < strips[:, 3])]
+    for sx0, sy0, sx1, sy1 in strips.tolist():
+        pixels[sy0:sy1, sx0:sx1] = MARK_COLOR
 
-    roi = ((rect["left"], rect["top"]), (rect["right"], rect["bottom"]))
 
-    # Adjust label position if too close to top of screen
-    label_location = (rect["right"], rect["top"])
-    label_anchor = "rb"
+def _paste(pixels: NDArray[np.uint8], tile: NDArray[np.uint8], x: int, y: int) -> None:
+    """Copy `tile` into `pixels` with its top-left corner at (x, y), clipped to the image."""
+    height, width = pixels.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + tile.shape[1], width), min(y + tile.shape[0], height)
+    if x0 < x1 and y0 < y1:
+        pixels[y0:y1, x0:x1] = tile[y0 - y : y1 - y, x0 - x : x1 - x]
 
-    if label_location[1] <= TOP_NO_LABEL_ZONE:
-        label_location = (rect["right"], rect["bottom"])
-        label_anchor = "rt"
 
-    draw.rectangle(roi, outline=color, width=2)
+@lru_cache(maxsize=None)
+def _get_font(size: int = FONT_SIZE) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    return ImageFont.load_default(size)
 
-    bbox = draw.textbbox(
-        label_location, str(idx), font=font, anchor=label_anchor, align="center"
-    )
-    bbox = (bbox[0] - 3, bbox[1] - 3, bbox[2] + 3, bbox[3] + 3)
-    draw.rectangle(bbox, fill=color)
 
-    draw.text(
-        label_location,
-        str(idx),
-        fill=text_color,
+@lru_cache(maxsize=4096)
+def _label_tile(label: str, anchor: str) -> Tuple[NDArray[np.uint8], int, int]:
+    """
+    Render a label (text on its background box) once.
+
+    Args:
+        label (str): Text of the label
+        anchor (str): PIL text anchor the label is positioned by, "rb" or "rt"
+
+    Returns:
+        Tuple of the RGB tile and its offset from the anchor point
+    """
+    font = _get_font()
+    x0, y0, x1, y1 = font.getbbox(label, anchor=anchor)
+    pad = LABEL_PADDING
+    # PIL rectangles include their far edges, hence the extra pixel
+    tile = Image.new("RGB", (x1 - x0 + 2 * pad + 1, y1 - y0 + 2 * pad + 1), MARK_COLOR)
+    ImageDraw.Draw(tile).text(
+        (pad - x0, pad - y0),
+        label,
+        fill=TEXT_COLOR,
         font=font,
-        anchor=label_anchor,
+        anchor=anchor,
         align="center",
     )
+    return np.asarray(tile), int(x0) - pad, int(y0) - pad
@@ -26,7 +26,6 @@ from loguru import logger
 from urllib.parse import quote_plus
 from pydantic import Field
 import PIL.Image
-import tiktoken
 from autogen_agentchat.agents import BaseChatAgent
 from autogen_agentchat.base import Response
 from autogen_agentchat.messages import (
@@ -75,7 +74,12 @@ from ._prompts import (
     WEB_SURFER_SYSTEM_MESSAGE,
     WEB_SURFER_NO_TOOLS_PROMPT,
 )
-from ._set_of_mark import add_set_of_mark
+from ._screenshot_dedup import (
+    NO_VISUAL_CHANGE_NOTE,
+    ScreenshotDedupStats,
+    ScreenshotDeduplicator,
+)
+from ._set_of_mark import render_set_of_mark, scale_screenshot
 from ._tool_definitions import (
     TOOL_CLICK,
     TOOL_HISTORY_BACK,
@@ -101,6 +105,12 @@ from ._tool_definitions import (
 from ...tools.tool_metadata import get_tool_metadata, ToolMetadata
 from ...tools.playwright.types import InteractiveRegion
 from ...tools.playwright.playwright_controller import PlaywrightController
+from ...tools.playwright.utils.text_workers import (
+    decode_tokens,
+    encode_tokens,
+    get_text_worker_pool,
+    get_tokenizer,
+)
 from ...tools.playwright.playwright_state import (
     BrowserState,
     save_browser_state,
@@ -291,6 +301,14 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         self._prior_metadata_hash: str | None = None
         self.logger = logging.getLogger(EVENT_LOGGER_NAME + f".{self.name}.WebSurfer")
         self._chat_history: List[LLMMessage] = []
+        # Screenshots that look the same as the previous one are not sent again,
+        # neither in the final response to the other agents nor in the
+        # WebSurfer's own prompt
+        self._response_dedup = ScreenshotDeduplicator(self.SCREENSHOT_TOKENS)
+        self._prompt_dedup = ScreenshotDeduplicator(self.SCREENSHOT_TOKENS)
+        # The last screenshot scaled for the model and the bytes it came from;
+        # tools that attach the unchanged page reuse it instead of decoding again
+        self._scaled_screenshot: Tuple[bytes, PIL.Image.Image] | None = None
         self._last_outside_message: str = ""
         self._last_rejected_url: str | None = None
 
@@ -349,6 +367,8 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
             # TOOL_CLICK_FULL,
         ]
         self.did_lazy_init = False  # flag to check if we have initialized the browser
+        # Serializes the team's background warm-up with initialization on first use
+        self._lazy_init_lock = asyncio.Lock()
         self.is_paused = False
         self._pause_event = asyncio.Event()
         self.action_guard: BaseApprovalGuard | None = (
@@ -373,48 +393,56 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         """
         if self.did_lazy_init:
             return
+        async with self._lazy_init_lock:
+            if self.did_lazy_init:
+                return
+            self._last_download = None
+            self._prior_metadata_hash = None
 
-        self._last_download = None
-        self._prior_metadata_hash = None
-
-        await self._browser.__aenter__()
-
-        if isinstance(self._browser, VncDockerPlaywrightBrowser):
-            self.novnc_port = self._browser.novnc_port
-            self.playwright_port = self._browser.playwright_port
-
-        self._context = self._browser.browser_context
+            await self._browser.__aenter__()
 
-        # Create the page
-        assert self._context is not None
-        self._context.set_default_timeout(20000)  # 20 sec
+            if isinstance(self._browser, VncDockerPlaywrightBrowser):
+                self.novnc_port = self._browser.novnc_port
+                self.playwright_port = self._browser.playwright_port
 
-        self._page = None
-        self._page = await self._context.new_page()
-        await self._playwright_controller.on_new_page(self._page)
+            self._context = self._browser.browser_context
 
-        async def handle_new_page(new_pg: Page) -> None:
-            # last resort on new tabs
-            assert new_pg is not None
-            assert self._page is not None
-            await new_pg.wait_for_load_state("domcontentloaded")
-            new_url = new_pg.url
-            await new_pg.close()
-            await self._playwright_controller.visit_page(self._page, new_url)
+            # Create the page
+            assert self._context is not None
+            self._context.set_default_timeout(20000)  # 20 sec
 
-        if self.single_tab_mode:
-            # this will make sure any new tabs will be closed and redirected to the main page
-            # it is a last resort, the playwright controller handles most cases
-            self._context.on("page", lambda new_pg: handle_new_page(new_pg))
+            self._page = None
+            # Pooled and persistent contexts come with a blank page ready to use
+            if self._context.pages:
+                self._page = self._context.pages[0]
+            else:
+                self._page = await self._context.new_page()
+            await self._playwright_controller.on_new_page(self._page)
+
+            async def handle_new_page(new_pg: Page) -> None:
+                # last resort on new tabs
+                assert new_pg is not None
+                assert self._page is not None
+                await new_pg.wait_for_load_state("domcontentloaded")
+                new_url = new_pg.url
+                await new_pg.close()
+                await self._playwright_controller.visit_page(self._page, new_url)
+
+            if self.single_tab_mode:
+                # this will make sure any new tabs will be closed and redirected to the main page
+                # it is a last resort, the playwright controller handles most cases
+                self._context.on("page", lambda new_pg: handle_new_page(new_pg))
 
-        try:
-            await self._playwright_controller.visit_page(self._page, self.start_page)
-        except Exception:
-            pass
+            try:
+                await self._playwright_controller.visit_page(
+                    self._page, self.start_page
+                )
+            except Exception:
+                pass
 
-        # Prepare the debug directory -- which stores the screenshots generated throughout the process
-        await self._set_debug_dir()
-        self.did_lazy_init = True
+            # Prepare the debug directory -- which stores the screenshots generated throughout the process
+            await self._set_debug_dir()
+            self.did_lazy_init = True
 
     async def pause(self) -> None:
         """Pause the WebSurfer agent."""
@@ -456,6 +484,17 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         """Get the types of messages produced by the agent."""
         return [MultiModalMessage]
 
+    @property
+    def screenshot_dedup_stats(self) -> ScreenshotDedupStats:
+        """Images left out of messages and prompts because the page looked the same."""
+        responded = self._response_dedup.stats
+        prompted = self._prompt_dedup.stats
+        return ScreenshotDedupStats(
+            screenshots=responded.screenshots + prompted.screenshots,
+            images_saved=responded.images_saved + prompted.images_saved,
+            tokens_avoided=responded.tokens_avoided + prompted.tokens_avoided,
+        )
+
     async def on_reset(self, cancellation_token: CancellationToken) -> None:
         """Reset the WebSurfer agent's state."""
         if not self.did_lazy_init:
@@ -463,6 +502,9 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         assert self._page is not None
 
         self._chat_history.clear()
+        self._response_dedup.reset()
+        self._prompt_dedup.reset()
+        self._scaled_screenshot = None
         (
             reset_prior_metadata,
             reset_last_download,
@@ -786,15 +828,19 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
                             screenshot_png_name = (
                                 "screenshot_raw" + current_timestamp + ".png"
                             )
-                            PIL.Image.open(io.BytesIO(new_screenshot)).save(
-                                os.path.join(self.debug_dir, screenshot_png_name)
-                            )
+                            # The screenshot is already PNG encoded
+                            with open(
+                                os.path.join(self.debug_dir, screenshot_png_name), "wb"
+                            ) as f:
+                                f.write(new_screenshot)
                         all_screenshots.append(new_screenshot)
+                        # Decode and encode the screenshot once for both messages
+                        new_screenshot_image = AGImage.from_pil(
+                            PIL.Image.open(io.BytesIO(new_screenshot))
+                        )
                         content: list[str | AGImage] = [
                             action_result,
-                            AGImage.from_pil(
-                                PIL.Image.open(io.BytesIO(new_screenshot))
-                            ),
+                            new_screenshot_image,
                         ]
                         emited_responses.append(action_result)
                         # 4) Emit the observation
@@ -825,9 +871,7 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
                             UserMessage(
                                 content=[
                                     f"Observation: {action_result}\n\n{message_content}",
-                                    AGImage.from_pil(
-                                        PIL.Image.open(io.BytesIO(new_screenshot))
-                                    ),
+                                    new_screenshot_image,
                                 ],
                                 source=self.name,
                             )
@@ -888,10 +932,17 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
             assert maybe_new_screenshot is not None
             new_screenshot = maybe_new_screenshot
 
-            content = [
-                message_content,
-                AGImage.from_pil(PIL.Image.open(io.BytesIO(new_screenshot))),
-            ]
+            pil_screenshot = PIL.Image.open(io.BytesIO(new_screenshot))
+            content: list[str | AGImage]
+            if self._response_dedup.observe(pil_screenshot):
+                content = [f"{message_content}\n\n{NO_VISUAL_CHANGE_NOTE}"]
+            else:
+                content = [message_content, AGImage.from_pil(pil_screenshot)]
+            stats = self.screenshot_dedup_stats
+            self.logger.debug(
+                f"Screenshot dedup: {stats.images_saved} images and about "
+                f"{stats.tokens_avoided} tokens saved this run"
+            )
 
             final_usage = RequestUsage(
                 prompt_tokens=sum([u.prompt_tokens for u in self.model_usage]),
@@ -954,12 +1005,11 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         if not self.did_lazy_init:
             await self.lazy_init()
 
+        # Read the page state and screenshot in one go; this doubles as a
+        # liveness check of the page
         try:
             assert self._page is not None
-            assert (
-                await self._playwright_controller.get_interactive_rects(self._page)
-                is not None
-            )
+            snapshot = await self._playwright_controller.snapshot(self._page)
         except Exception as e:
             # open a new tab and point it to about:blank
             self.logger.error(f"Page is not accessible, creating a new one: {e}")
@@ -967,6 +1017,7 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
             self._page = await self._playwright_controller.create_new_tab(
                 self._context, "about:blank"
             )
+            snapshot = await self._playwright_controller.snapshot(self._page)
 
         # Clone the messages to give context, removing old screenshots
         history: List[LLMMessage] = []
@@ -985,13 +1036,25 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
                 filtered_history.extend(remove_images([msg]))
         history.extend(filtered_history)
 
-        # Ask the page for interactive elements, then prepare the state-of-mark screenshot
-        rects = await self._playwright_controller.get_interactive_rects(self._page)
-        viewport = await self._playwright_controller.get_visual_viewport(self._page)
-        screenshot = await self._playwright_controller.get_screenshot(self._page)
-        som_screenshot, visible_rects, rects_above, rects_below, element_id_mapping = (
-            add_set_of_mark(screenshot, rects, use_sequential_ids=True)
+        # Prepare the state-of-mark screenshot from the interactive elements
+        rects = snapshot["interactive_rects"]
+        viewport = snapshot["visual_viewport"]
+        screenshot = snapshot["screenshot"]
+        assert screenshot is not None
+        # Decode once; the model-sized images are scaled from the same buffers
+        som = render_set_of_mark(
+            screenshot,
+            rects,
+            use_sequential_ids=True,
+            scaled_size=(self.MLM_WIDTH, self.MLM_HEIGHT)
+            if self.is_multimodal
+            else None,
         )
+        som_screenshot = som.image
+        visible_rects = som.visible_rects
+        rects_above = som.rects_above
+        rects_below = som.rects_below
+        element_id_mapping = som.id_mapping
         # element_id_mapping is a mapping of new ids to original ids in the page
         # we need to reverse it to get the original ids from the new ids
         # for each element we click, we need to use the original id
@@ -1047,7 +1110,7 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         #    tools.append(TOOL_UPLOAD_FILE)
 
         # Focus hint
-        focused = await self._playwright_controller.get_focused_rect_id(self._page)
+        focused = snapshot["focused_rect_id"]
         focused = reverse_element_id_mapping.get(focused, focused)
 
         focused_hint = ""
@@ -1096,7 +1159,7 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
 
         tool_names = WebSurfer._tools_to_names(tools)
 
-        webpage_text = await self._playwright_controller.get_visible_text(self._page)
+        webpage_text = snapshot["visible_text"]
 
         if not self.json_model_output:
             text_prompt = WEB_SURFER_TOOL_PROMPT.format(
@@ -1127,28 +1190,30 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
             ).strip()
 
         if self.is_multimodal:
-            # Scale the screenshot for the MLM, and close the original
-            scaled_som_screenshot = som_screenshot.resize(
-                (self.MLM_WIDTH, self.MLM_HEIGHT)
-            )
-            screenshot_file = PIL.Image.open(io.BytesIO(screenshot))
-            scaled_screenshot = screenshot_file.resize(
-                (self.MLM_WIDTH, self.MLM_HEIGHT)
-            )
-            som_screenshot.close()
-            screenshot_file.close()
-
-            # Add the multimodal message and make the request
-            history.append(
-                UserMessage(
-                    content=[
-                        text_prompt,
-                        AGImage.from_pil(scaled_som_screenshot),
-                        AGImage.from_pil(scaled_screenshot),
-                    ],
-                    source=self.name,
-                )
-            )
+            # Use the screenshots scaled for the MLM
+            assert som.scaled_image is not None and som.scaled_screenshot is not None
+            scaled_som_screenshot = som.scaled_image
+            scaled_screenshot = som.scaled_screenshot
+            if isinstance(screenshot, bytes):
+                self._scaled_screenshot = (screenshot, scaled_screenshot)
+
+            # Add the multimodal message and make the request. The marks are
+            # always needed to pick a target, the plain screenshot only when
+            # the page changed since the previous request
+            if self._prompt_dedup.observe(som.screenshot):
+                prompt_content: List[str | AGImage] = [
+                    f"{text_prompt}\n\nThe page has not visibly changed since "
+                    "the previous step, so only the screenshot with the marked "
+                    "targets is attached.",
+                    AGImage.from_pil(scaled_som_screenshot),
+                ]
+            else:
+                prompt_content = [
+                    text_prompt,
+                    AGImage.from_pil(scaled_som_screenshot),
+                    AGImage.from_pil(scaled_screenshot),
+                ]
+            history.append(UserMessage(content=prompt_content, source=self.name))
         else:
             history.append(
                 UserMessage(
@@ -1156,6 +1221,8 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
                     source=self.name,
                 )
             )
+        som.image.close()
+        som.screenshot.close()
 
         # Re-initialize model context to meet token limit quota
         try:
@@ -1794,17 +1861,9 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         Returns:
             str: Extracted text from the image
         """
-        scaled_screenshot = None
-        if isinstance(image, PIL.Image.Image):
-            scaled_screenshot = image.resize((self.MLM_WIDTH, self.MLM_HEIGHT))
-        else:
-            pil_image = None
-            if not isinstance(image, io.BufferedIOBase):
-                pil_image = PIL.Image.open(io.BytesIO(image))
-            else:
-                pil_image = PIL.Image.open(cast(BinaryIO, image))
-            scaled_screenshot = pil_image.resize((self.MLM_WIDTH, self.MLM_HEIGHT))
-            pil_image.close()
+        if isinstance(image, io.BufferedIOBase):
+            image = cast(BinaryIO, image).read()
+        scaled_screenshot = self._scale_screenshot(image)
 
         # Add the multimodal message and make the request
         messages: List[LLMMessage] = []
@@ -1821,10 +1880,33 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
             messages, cancellation_token=cancellation_token
         )
         self.model_usage.append(response.usage)
-        scaled_screenshot.close()
         assert isinstance(response.content, str)
         return response.content
 
+    def _scale_screenshot(
+        self, screenshot: Union[bytes, PIL.Image.Image]
+    ) -> PIL.Image.Image:
+        """Scale a screenshot for the model, reusing the last one if the page looks the same.
+
+        The returned image may be shared with earlier messages and must not be closed.
+
+        Args:
+            screenshot (bytes | PIL.Image.Image): PNG bytes or a decoded screenshot
+
+        Returns:
+            PIL.Image.Image: The screenshot resized to the model's image size
+        """
+        if isinstance(screenshot, bytes):
+            if (
+                self._scaled_screenshot is not None
+                and self._scaled_screenshot[0] == screenshot
+            ):
+                return self._scaled_screenshot[1]
+            scaled = scale_screenshot(screenshot, (self.MLM_WIDTH, self.MLM_HEIGHT))
+            self._scaled_screenshot = (screenshot, scaled)
+            return scaled
+        return scale_screenshot(screenshot, (self.MLM_WIDTH, self.MLM_HEIGHT))
+
     async def _summarize_page(
         self,
         question: Optional[str] = None,
@@ -1847,12 +1929,9 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         )
         title: str = await self._page.title() or self._page.url
 
-        # Take a screenshot and scale it
+        # Take a screenshot and scale it, unless the page looks as in the last prompt
         screenshot = await self._playwright_controller.get_screenshot(self._page)
-        pil_image = PIL.Image.open(io.BytesIO(screenshot))
-        scaled_screenshot = pil_image.resize((self.MLM_WIDTH, self.MLM_HEIGHT))
-        pil_image.close()
-        ag_image = AGImage.from_pil(scaled_screenshot)
+        ag_image = AGImage.from_pil(self._scale_screenshot(screenshot))
 
         # Prepare the system prompt and user prompt
         messages: List[LLMMessage] = []
@@ -1862,8 +1941,7 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         prompt = WEB_SURFER_QA_PROMPT(title, question)
 
         # Truncate the page content if needed to fit within token limits
-        tokenizer = tiktoken.encoding_for_model("gpt-4o")
-        prompt_tokens = len(tokenizer.encode(prompt))
+        prompt_tokens = len(get_tokenizer().encode(prompt))
         # Reserve tokens for the image (SCREENSHOT_TOKENS) and some buffer for the response
         max_content_tokens = 128000 - self.SCREENSHOT_TOKENS - prompt_tokens - 1000
 
@@ -1871,11 +1949,13 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
             # If we don't have enough tokens, just use a minimal prompt
             content = prompt
         else:
-            # Truncate the page content to fit within the token limit
-            content_tokens = tokenizer.encode(page_markdown)
-            if len(content_tokens) > max_content_tokens:
-                truncated_content = tokenizer.decode(
-                    content_tokens[:max_content_tokens]
+            # Truncate the page content to fit within the token limit,
+            # tokenizing it off the event loop
+            text_workers = get_text_worker_pool()
+            tokens = await text_workers.run(encode_tokens, page_markdown)
+            if len(tokens) > max_content_tokens:
+                truncated_content = await text_workers.run(
+                    decode_tokens, tokens, max_content_tokens
                 )
                 content = f"Page content (truncated):\n{truncated_content}\n\n{prompt}"
             else:
@@ -1894,7 +1974,6 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
             messages, cancellation_token=cancellation_token
         )
         self.model_usage.append(response.usage)
-        scaled_screenshot.close()
 
         assert isinstance(response.content, str)
         return response.content
@@ -1975,10 +2054,15 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         )
 
     @classmethod
-    def _from_config(cls, config: WebSurferConfig) -> Self:
+    def _from_config(
+        cls,
+        config: WebSurferConfig,
+        model_client: Optional[ChatCompletionClient] = None,
+    ) -> Self:
         return cls(
             name=config.name,
-            model_client=ChatCompletionClient.load_component(config.model_client),
+            model_client=model_client
+            or ChatCompletionClient.load_component(config.model_client),
             browser=PlaywrightBrowser.load_component(config.browser),
             model_context_token_limit=config.model_context_token_limit,
             downloads_folder=config.downloads_folder,
@@ -1999,8 +2083,18 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         )
 
     @classmethod
-    def from_config(cls, config: WebSurferConfig) -> Self:
-        return cls._from_config(config)
+    def from_config(
+        cls,
+        config: WebSurferConfig,
+        model_client: Optional[ChatCompletionClient] = None,
+    ) -> Self:
+        """Create a WebSurfer from its configuration.
+
+        Args:
+            config (WebSurferConfig): The configuration
+            model_client (ChatCompletionClient, optional): Client to use instead of loading `config.model_client`. Default: None
+        """
+        return cls._from_config(config, model_client)
 
     async def save_state(self) -> Mapping[str, Any]:
         """Save the current state of the WebSurfer.
@@ -2008,9 +2102,12 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         Returns:
             A dictionary containing the chat history and browser state
         """
-        assert self._context is not None
-        # Get the browser state and convert it to a dict
-        browser_state = await save_browser_state(self._context, self._page)
+        # Get the browser state and convert it to a dict, there is none while
+        # the browser is still starting
+        browser_state = None
+        if self.did_lazy_init:
+            assert self._context is not None
+            browser_state = await save_browser_state(self._context, self._page)
 
         # Create and return the WebSurfer state
         state = WebSurferState(
@@ -2030,9 +2127,13 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
 
         # Update the chat history
         self._chat_history = web_surfer_state.chat_history
+        self._response_dedup.reset()
+        self._prompt_dedup.reset()
+        self._scaled_screenshot = None
 
         # Load the browser state if it exists
         if web_surfer_state.browser_state is not None:
+            await self.lazy_init()
             assert self._context is not None
             await load_browser_state(self._context, web_surfer_state.browser_state)
 
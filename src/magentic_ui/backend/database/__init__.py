@@ -1,5 +1,7 @@
+from .checkpoint_store import CheckpointStore
 from .db_manager import DatabaseManager
 
 __all__ = [
+    "CheckpointStore",
     "DatabaseManager",
 ]
@@ -0,0 +1,303 @@
+import base64
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from loguru import logger
+
+from ..datamodel import CheckpointBlob
+from ..utils.utils import compress_state, decompress_state
+from .db_manager import DatabaseManager
+
+SEGMENTED_STATE_FORMAT = "magentic-ui/segmented-state/v1"
+
+# A path of dict keys from an agent's state to one of its message threads
+ThreadPath = Tuple[str, ...]
+
+
+def _encode(segment: str) -> str:
+    return base64.b64encode(zlib.compress(segment.encode("utf-8"))).decode("utf-8")
+
+
+def _decode(data: str) -> str:
+    return zlib.decompress(base64.b64decode(data)).decode("utf-8")
+
+
+def _extract_threads(
+    node: Any, path: ThreadPath, min_length: int, threads: Dict[ThreadPath, List[Any]]
+) -> Any:
+    """Copy `node`, replacing every list of at least `min_length` items with None
+    and collecting the list into `threads` under its key path."""
+    if isinstance(node, dict):
+        return {
+            key: _extract_threads(value, path + (key,), min_length, threads)
+            for key, value in node.items()
+        }
+    if path and isinstance(node, list) and len(node) >= min_length:
+        threads[path] = node
+        return None
+    return node
+
+
+def split_state(
+    state: Mapping[str, Any], chunk_size: int = 32, min_thread_length: int = 8
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Split a team state into a manifest and content-addressed segments.
+
+    Each agent state becomes a base segment (everything except its long lists)
+    plus one list of fixed-size chunks per message thread. Appending to a
+    thread only changes its last chunk, so consecutive checkpoints share all
+    other segments.
+
+    Args:
+        state (Mapping[str, Any]): Team state as produced by `save_state`
+        chunk_size (int, optional): Items per thread chunk. Default: 32.
+        min_thread_length (int, optional): Lists shorter than this stay in the base segment. Default: 8.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, str]]: The manifest and a mapping of digest to serialized segment
+    """
+    segments: Dict[str, str] = {}
+
+    def add(value: Any) -> str:
+        serialized = json.dumps(value, separators=(",", ":"))
+        digest = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        segments.setdefault(digest, serialized)
+        return digest
+
+    agent_states: Mapping[str, Any] = state.get("agent_states", {"": state})
+    agents: Dict[str, Any] = {}
+    for name, agent_state in agent_states.items():
+        threads: Dict[ThreadPath, List[Any]] = {}
+        base = _extract_threads(agent_state, (), min_thread_length, threads)
+        agents[name] = {
+            "base": add(base),
+            "threads": [
+                {
+                    "path": list(path),
+                    "chunks": [
+                        add(items[i : i + chunk_size])
+                        for i in range(0, len(items), chunk_size)
+                    ],
+                }
+                for path, items in threads.items()
+            ],
+        }
+
+    manifest: Dict[str, Any] = {
+        "format": SEGMENTED_STATE_FORMAT,
+        "team": {k: v for k, v in state.items() if k != "agent_states"}
+        if "agent_states" in state
+        else None,
+        "agents": agents,
+    }
+    return manifest, segments
+
+
+def join_state(manifest: Mapping[str, Any], segments: Mapping[str, str]) -> Any:
+    """
+    Reassemble the team state described by a manifest from its segments.
+
+    Args:
+        manifest (Mapping[str, Any]): Manifest returned by `split_state`
+        segments (Mapping[str, str]): Mapping of digest to serialized segment
+
+    Returns:
+        Any: The original team state
+    """
+
+    def segment(digest: str) -> Any:
+        if digest not in segments:
+            raise ValueError(f"Checkpoint segment {digest} is missing")
+        return json.loads(segments[digest])
+
+    agent_states: Dict[str, Any] = {}
+    for name, entry in manifest["agents"].items():
+        agent_state = segment(entry["base"])
+        for thread in entry["threads"]:
+            *parents, key = thread["path"]
+            node = agent_state
+            for parent in parents:
+                node = node[parent]
+            node[key] = [item for d in thread["chunks"] for item in segment(d)]
+        agent_states[name] = agent_state
+
+    if manifest["team"] is None:
+        return agent_states[""]
+    return {**manifest["team"], "agent_states": agent_states}
+
+
+def referenced_digests(manifest: Mapping[str, Any]) -> Set[str]:
+    """Every segment digest a manifest depends on"""
+    digests: Set[str] = set()
+    for entry in manifest["agents"].values():
+        digests.add(entry["base"])
+        for thread in entry["threads"]:
+            digests.update(thread["chunks"])
+    return digests
+
+
+class CheckpointStore:
+    """
+    Incremental storage for the team state checkpointed during a run.
+
+    Instead of rewriting the whole compressed state on every checkpoint, the
+    state is split with `split_state` and only segments that are not stored yet
+    are inserted as `CheckpointBlob` rows. `Run.state` keeps a compressed
+    manifest that references the segments. Segments that are no longer
+    referenced are deleted by `compact`, which callers run once the latest
+    manifest has been written to `Run.state` (see `needs_compaction`) and
+    when the run is closed.
+
+    Args:
+        db_manager (DatabaseManager): Database manager used to store segments
+        chunk_size (int, optional): Items per thread chunk. Default: 32.
+        min_thread_length (int, optional): Lists shorter than this are not split out. Default: 8.
+        compact_every (int, optional): Checkpoints after which `needs_compaction` turns true. Default: 20.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        chunk_size: int = 32,
+        min_thread_length: int = 8,
+        compact_every: int = 20,
+    ):
+        self.db_manager = db_manager
+        self.chunk_size = chunk_size
+        self.min_thread_length = min_thread_length
+        self.compact_every = compact_every
+        self._stored: Dict[int, Set[str]] = {}
+        self._referenced: Dict[int, Set[str]] = {}
+        self._checkpoints: Dict[int, int] = {}
+
+    async def save(self, run_id: int, state: Mapping[str, Any]) -> str:
+        """
+        Persist new segments of a checkpoint and return the value for `Run.state`
+
+        If the segments cannot be written, the full compressed state is returned
+        instead so the checkpoint is never lost.
+
+        Args:
+            run_id (int): ID of the run being checkpointed
+            state (Mapping[str, Any]): Full team state
+
+        Returns:
+            str: Compressed manifest (or compressed full state on failure)
+        """
+        manifest, segments = split_state(state, self.chunk_size, self.min_thread_length)
+        stored = await self._stored_digests(run_id)
+        new_blobs = [
+            CheckpointBlob(run_id=run_id, digest=digest, data=_encode(segment))
+            for digest, segment in segments.items()
+            if digest not in stored
+        ]
+        response = await self.db_manager.insert_many(new_blobs)
+        if not response.status:
+            logger.warning(
+                f"Falling back to full checkpoint for run {run_id}: {response.message}"
+            )
+            # The batch was rolled back; re-read what is actually stored next time
+            self._stored.pop(run_id, None)
+            return compress_state(dict(state))
+
+        stored.update(blob.digest for blob in new_blobs)
+        self._referenced[run_id] = set(segments)
+        self._checkpoints[run_id] = self._checkpoints.get(run_id, 0) + 1
+        return compress_state(manifest)
+
+    def needs_compaction(self, run_id: int) -> bool:
+        """Whether enough checkpoints were saved since the last compaction"""
+        return self._checkpoints.get(run_id, 0) >= self.compact_every
+
+    async def load(
+        self, run_id: int, stored_state: Optional[str]
+    ) -> Optional[Mapping[str, Any] | str]:
+        """
+        Resolve the value stored in `Run.state` into a loadable team state
+
+        States written before segmented checkpoints existed are returned
+        unchanged; `TeamManager` already knows how to decode them.
+
+        Args:
+            run_id (int): ID of the run
+            stored_state (str, optional): Value of `Run.state`
+
+        Returns:
+            Optional[Mapping[str, Any] | str]: Full team state, or the stored value as is
+        """
+        if not stored_state:
+            return stored_state
+        try:
+            manifest = decompress_state(stored_state)
+        except Exception:
+            return stored_state
+        if manifest.get("format") != SEGMENTED_STATE_FORMAT:
+            return stored_state
+
+        response = await self.db_manager.get(
+            CheckpointBlob, filters={"run_id": run_id}, order=""
+        )
+        if not response.status:
+            raise RuntimeError(f"Failed to load checkpoint segments for run {run_id}")
+        segments = {blob.digest: _decode(blob.data) for blob in response.data}
+        self._stored[run_id] = set(segments)
+        self._referenced[run_id] = referenced_digests(manifest)
+        return join_state(manifest, segments)
+
+    async def compact(self, run_id: int) -> int:
+        """
+        Delete segments of a run that the latest manifest no longer references
+
+        Only call this once the manifest returned by the last `save` has been
+        written to `Run.state`; older manifests may reference deleted segments.
+
+        Args:
+            run_id (int): ID of the run
+
+        Returns:
+            int: Number of segments deleted
+        """
+        self._checkpoints[run_id] = 0
+        if run_id not in self._referenced:
+            return 0
+        stored = await self._stored_digests(run_id)
+        garbage = stored - self._referenced[run_id]
+        if not garbage:
+            return 0
+        response = await self.db_manager.delete(
+            CheckpointBlob, filters={"run_id": run_id, "digest": list(garbage)}
+        )
+        if not response.status:
+            return 0
+        stored -= garbage
+        return len(garbage)
+
+    async def close(self, run_id: int, compact: bool = True) -> None:
+        """
+        Drop the cached bookkeeping of a run whose stream ended
+
+        Args:
+            run_id (int): ID of the run
+            compact (bool, optional): Compact the run first. Pass False when the
+                latest manifest may not have been written to `Run.state`. Default: True.
+        """
+        try:
+            if compact:
+                await self.compact(run_id)
+        finally:
+            self._stored.pop(run_id, None)
+            self._referenced.pop(run_id, None)
+            self._checkpoints.pop(run_id, None)
+
+    async def _stored_digests(self, run_id: int) -> Set[str]:
+        if run_id not in self._stored:
+            response = await self.db_manager.get(
+                CheckpointBlob, filters={"run_id": run_id}, order=""
+            )
+            self._stored[run_id] = (
+                {blob.digest for blob in response.data} if response.status else set()
+            )
+        return self._stored[run_id]
@@ -1,21 +1,71 @@
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, List, Optional, Union, Dict
+from typing import Any, AsyncIterator, List, Optional, Sequence, Union, Dict
 
 from loguru import logger
-from sqlalchemy import exc, inspect, text
-from sqlmodel import Session, SQLModel, and_, create_engine, select
+from sqlalchemy import exc, inspect, make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import Session, SQLModel, and_, create_engine, or_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..datamodel import DatabaseModel, Response, Team
 from ..teammanager import TeamManager
 from .schema_manager import SchemaManager
 
 
+def to_async_uri(engine_uri: str) -> str:
+    """
+    Map a synchronous database URI onto the matching asyncio driver.
+
+    Args:
+        engine_uri (str): Database connection URI (e.g. sqlite:///db.sqlite3)
+
+    Returns:
+        str: The URI with an async driver (e.g. sqlite+aiosqlite:///db.sqlite3)
+    """
+    url = make_url(engine_uri)
+    backend = url.get_backend_name()
+    async_drivers = {"sqlite": "aiosqlite", "postgresql": "psycopg"}
+    if backend not in async_drivers:
+        return engine_uri
+    return url.set(drivername=f"{backend}+{async_drivers[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def _filter_conditions(
+    model_class: type[SQLModel], filters: dict[str, Any]
+) -> List[Any]:
+    """Build WHERE conditions; list, tuple and set values match any of their items."""
+    conditions: List[Any] = []
+    for col, value in filters.items():
+        column = getattr(model_class, col)
+        if isinstance(value, (list, tuple, set)):
+            conditions.append(column.in_(value))
+        else:
+            conditions.append(column == value)
+    return conditions
+
+
 class DatabaseManager:
+    """
+    Database access for the backend.
+
+    Schema management and migrations run on a synchronous engine, while all
+    CRUD operations (`upsert`, `get`, `delete`) are awaitable and run on a
+    pooled async engine so that database I/O never blocks the event loop.
+    """
+
     _init_lock = threading.Lock()
 
-    def __init__(self, engine_uri: str, base_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        engine_uri: str,
+        base_dir: Optional[Path] = None,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+    ):
         """
         Initialize DatabaseManager with database connection settings.
         Does not perform any database operations.
@@ -23,8 +73,11 @@ class DatabaseManager:
         Args:
             engine_uri (str): Database connection URI (e.g. sqlite:///db.sqlite3)
             base_dir (Path, optional): Base directory for migration files. If None, uses current directory. Default: None.
+            pool_size (int, optional): Number of pooled connections kept by the async engine (ignored for SQLite). Default: 10.
+            max_overflow (int, optional): Extra connections the async engine may open under load (ignored for SQLite). Default: 20.
         """
-        connection_args = {"check_same_thread": True} if "sqlite" in engine_uri else {}
+        is_sqlite = "sqlite" in engine_uri
+        connection_args = {"check_same_thread": True} if is_sqlite else {}
 
         self.engine = create_engine(engine_uri, connect_args=connection_args)
         self.schema_manager = SchemaManager(
@@ -32,6 +85,24 @@ class DatabaseManager:
             base_dir=base_dir,
         )
 
+        # SQLite serializes writers, so give concurrent runs time to take the
+        # lock instead of failing immediately with "database is locked".
+        async_engine_args: Dict[str, Any] = (
+            {"connect_args": {"timeout": 30}}
+            if is_sqlite
+            else {
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_pre_ping": True,
+            }
+        )
+        self.async_engine: AsyncEngine = create_async_engine(
+            to_async_uri(engine_uri), **async_engine_args
+        )
+        self._async_session = async_sessionmaker(
+            self.async_engine, class_=AsyncSession, expire_on_commit=False
+        )
+
     def _should_auto_upgrade(self) -> bool:
         """
         Check if auto upgrade should run based on schema differences
@@ -149,7 +220,7 @@ class DatabaseManager:
                 self._init_lock.release()
                 logger.info("Database reset lock released")
 
-    def upsert(self, model: DatabaseModel, return_json: bool = True) -> Response:
+    async def upsert(self, model: DatabaseModel, return_json: bool = True) -> Response:
         """Create or update an entity
 
         Args:
@@ -163,10 +234,12 @@ class DatabaseManager:
         model_class = type(model)
         existing_model = None
 
-        with Session(self.engine) as session:
+        async with self._async_session() as session:
             try:
-                existing_model = session.exec(
-                    select(model_class).where(model_class.id == model.id)
+                existing_model = (
+                    await session.exec(
+                        select(model_class).where(model_class.id == model.id)
+                    )
                 ).first()
                 if existing_model:
                     model.updated_at = datetime.now()
@@ -176,10 +249,10 @@ class DatabaseManager:
                     session.add(model)
                 else:
                     session.add(model)
-                session.commit()
-                session.refresh(model)
+                await session.commit()
+                await session.refresh(model)
             except Exception as e:
-                session.rollback()
+                await session.rollback()
                 logger.error(
                     "Error while updating/creating "
                     + str(model_class.__name__)
@@ -198,7 +271,79 @@ class DatabaseManager:
             data=model.model_dump() if return_json else model,
         )
 
-    def get(
+    async def insert_many(self, models: Sequence[DatabaseModel]) -> Response:
+        """Insert a batch of new entities in a single transaction
+
+        Unlike `upsert`, no existence check or refresh is done per row, which
+        makes this the right call for append-only records such as messages.
+
+        Args:
+            models (Sequence[DatabaseModel]): New model instances to insert
+
+        Returns:
+            Response: Contains status and message; data is the number of rows inserted
+        """
+        if not models:
+            return Response(message="Nothing to insert", status=True, data=0)
+
+        model_name = type(models[0]).__name__
+        async with self._async_session() as session:
+            try:
+                session.add_all(models)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                error_msg = f"Error while inserting {model_name} batch: {e}"
+                logger.error(error_msg)
+                return Response(message=error_msg, status=False, data=0)
+
+        return Response(
+            message=f"{len(models)} {model_name} Created Successfully",
+            status=True,
+            data=len(models),
+        )
+
+    async def update_fields(
+        self,
+        model_class: type[DatabaseModel],
+        entity_id: int,
+        values: Dict[str, Any],
+    ) -> Response:
+        """Update selected columns of one entity without reading it first
+
+        Args:
+            model_class (type[DatabaseModel]): The model class of the entity
+            entity_id (int): Primary key of the entity
+            values (Dict[str, Any]): Column values to write
+
+        Returns:
+            Response: Contains status and message; data is the number of rows updated
+        """
+        async with self._async_session() as session:
+            try:
+                result = await session.exec(
+                    update(model_class)
+                    .where(model_class.id == entity_id)  # type: ignore
+                    .values(**values, updated_at=datetime.now())
+                )
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                error_msg = f"Error while updating {model_class.__name__}: {e}"
+                logger.error(error_msg)
+                return Response(message=error_msg, status=False, data=0)
+
+        if not result.rowcount:
+            return Response(
+                message=f"{model_class.__name__} not found", status=False, data=0
+            )
+        return Response(
+            message=f"{model_class.__name__} Updated Successfully",
+            status=True,
+            data=result.rowcount,
+        )
+
+    async def get(
         self,
         model_class: type[DatabaseModel],
         filters: dict[str, Any] | None = None,
@@ -206,7 +351,7 @@ class DatabaseManager:
         order: str = "desc",
     ) -> Response:
         """List entities"""
-        with Session(self.engine) as session:
+        async with self._async_session() as session:
             result = []
             status = True
             status_message = ""
@@ -214,11 +359,9 @@ class DatabaseManager:
             try:
                 statement = select(model_class)
                 if filters:
-                    conditions = [
-                        getattr(model_class, col) == value
-                        for col, value in filters.items()
-                    ]
-                    statement = statement.where(and_(*conditions))
+                    statement = statement.where(
+                        and_(*_filter_conditions(model_class, filters))
+                    )
 
                 if hasattr(model_class, "created_at") and order:
                     order_by_clause = getattr(
@@ -226,14 +369,14 @@ class DatabaseManager:
                     )()  # Dynamically apply asc/desc
                     statement = statement.order_by(order_by_clause)
 
-                items = session.exec(statement).all()
+                items = (await session.exec(statement)).all()
                 result = [
                     item.model_dump(mode="json") if return_json else item
                     for item in items
                 ]
                 status_message = f"{model_class.__name__} Retrieved Successfully"
             except Exception as e:
-                session.rollback()
+                await session.rollback()
                 status = False
                 status_message = f"Error while fetching {model_class.__name__}"
                 logger.error(
@@ -245,44 +388,153 @@ class DatabaseManager:
 
             return Response(message=status_message, status=status, data=result)
 
-    def delete(
+    async def get_page(
+        self,
+        model_class: type[DatabaseModel],
+        filters: dict[str, Any] | None = None,
+        limit: int = 100,
+        cursor: Optional[int] = None,
+        return_json: bool = False,
+    ) -> Response:
+        """
+        List entities in chronological order, one page at a time.
+
+        Pages are read with keyset pagination on `(created_at, id)`, so every
+        page costs the same however deep into the history it is.
+
+        Args:
+            model_class (type[DatabaseModel]): Model with `created_at` and `id` columns
+            filters (dict[str, Any], optional): Column values to match. Default: None.
+            limit (int, optional): Maximum number of entities in the page. Default: 100.
+            cursor (int, optional): `next_cursor` of the previous page. Default: None (first page).
+            return_json (bool, optional): Whether to return dictionaries instead of models. Default: False.
+
+        Returns:
+            Response: `data` holds `items` and `next_cursor`, None on the last page
+        """
+        async with self._async_session() as session:
+            try:
+                created_at = model_class.created_at  # type: ignore
+                model_id = model_class.id  # type: ignore
+                conditions = _filter_conditions(model_class, filters or {})
+                if cursor is not None:
+                    # Compare with the stored timestamp, whatever its representation
+                    cursor_created_at = (
+                        select(created_at).where(model_id == cursor).scalar_subquery()
+                    )
+                    conditions.append(
+                        or_(
+                            created_at > cursor_created_at,
+                            and_(created_at == cursor_created_at, model_id > cursor),
+                        )
+                    )
+                statement = (
+                    select(model_class)
+                    .where(and_(*conditions))
+                    .order_by(created_at.asc(), model_id.asc())
+                    .limit(limit + 1)
+                )
+                items = list((await session.exec(statement)).all())
+            except Exception as e:
+                await session.rollback()
+                logger.error(
+                    f"Error while getting a page of {model_class.__name__}: {e}"
+                )
+                return Response(
+                    message=f"Error while fetching {model_class.__name__}",
+                    status=False,
+                    data={"items": [], "next_cursor": None},
+                )
+
+        next_cursor = items[limit - 1].id if len(items) > limit else None  # type: ignore
+        return Response(
+            message=f"{model_class.__name__} Retrieved Successfully",
+            status=True,
+            data={
+                "items": [
+                    item.model_dump(mode="json") if return_json else item
+                    for item in items[:limit]
+                ],
+                "next_cursor": next_cursor,
+            },
+        )
+
+    async def stream(
+        self,
+        model_class: type[DatabaseModel],
+        filters: dict[str, Any] | None = None,
+        batch_size: int = 100,
+        cursor: Optional[int] = None,
+        return_json: bool = False,
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate over entities in chronological order, reading them in batches.
+
+        Each batch is read with `get_page` in its own short transaction, so a
+        slow consumer does not hold a connection.
+
+        Args:
+            model_class (type[DatabaseModel]): Model with `created_at` and `id` columns
+            filters (dict[str, Any], optional): Column values to match. Default: None.
+            batch_size (int, optional): Entities read per query. Default: 100.
+            cursor (int, optional): Start after this entity, as in `get_page`. Default: None.
+            return_json (bool, optional): Whether to yield dictionaries instead of models. Default: False.
+
+        Yields:
+            Any: The entities
+
+        Raises:
+            RuntimeError: If a batch could not be read
+        """
+        while True:
+            page = await self.get_page(
+                model_class, filters, batch_size, cursor, return_json
+            )
+            if not page.status:
+                raise RuntimeError(page.message)
+            for item in page.data["items"]:
+                yield item
+            cursor = page.data["next_cursor"]
+            if cursor is None:
+                return
+
+    async def delete(
         self, model_class: type[SQLModel], filters: dict[str, Any] | None = None
     ) -> Response:
         """Delete an entity"""
         status_message = ""
         status = True
 
-        with Session(self.engine) as session:
+        async with self._async_session() as session:
             try:
                 if "sqlite" in str(self.engine.url):
-                    session.connection().execute(text("PRAGMA foreign_keys=ON"))
+                    connection = await session.connection()
+                    await connection.execute(text("PRAGMA foreign_keys=ON"))
                 statement = select(model_class)
                 if filters:
-                    conditions = [
-                        getattr(model_class, col) == value
-                        for col, value in filters.items()
-                    ]
-                    statement = statement.where(and_(*conditions))
+                    statement = statement.where(
+                        and_(*_filter_conditions(model_class, filters))
+                    )
 
-                rows = session.exec(statement).all()
+                rows = (await session.exec(statement)).all()
 
                 if rows:
                     for row in rows:
-                        session.delete(row)
-                    session.commit()
+                        await session.delete(row)
+                    await session.commit()
                     status_message = f"{model_class.__name__} Deleted Successfully"
                 else:
                     status_message = "Row not found"
                     logger.info(f"Row with filters {filters} not found")
 
             except exc.IntegrityError as e:
-                session.rollback()
+                await session.rollback()
                 status = False
                 status_message = f"Integrity error: The {model_class.__name__} is linked to another entity and cannot be deleted. {e}"
                 # Log the specific integrity error
                 logger.error(status_message)
             except Exception as e:
-                session.rollback()
+                await session.rollback()
                 status = False
                 status_message = f"Error while deleting: {e}"
                 logger.error(status_message)
@@ -315,7 +567,7 @@ class DatabaseManager:
             # Store in database
             team_db = Team(user_id=user_id, component=config, created_at=datetime.now())
 
-            result = self.upsert(team_db)
+            result = await self.upsert(team_db)
             return result
 
         except Exception as e:
@@ -375,7 +627,7 @@ class DatabaseManager:
         self, config: Dict[str, Any], user_id: str
     ) -> Optional[Team]:
         """Check if identical team config already exists"""
-        teams = self.get(Team, {"user_id": user_id}).data
+        teams = (await self.get(Team, {"user_id": user_id})).data
 
         if not teams:
             return None
@@ -390,7 +642,8 @@ class DatabaseManager:
         """Close database connections and cleanup resources"""
         logger.info("Closing database connections...")
         try:
-            # Dispose of the SQLAlchemy engine
+            # Dispose of the SQLAlchemy engines
+            await self.async_engine.dispose()
             self.engine.dispose()
             logger.info("Database connections closed successfully")
         except Exception as e:
@@ -1,4 +1,5 @@
 from .db import (
+    CheckpointBlob,
     Gallery,
     Message,
     Plan,
@@ -28,6 +29,7 @@ __all__ = [
     "Team",
     "Run",
     "RunStatus",
+    "CheckpointBlob",
     "Session",
     "Team",
     "Message",
@@ -6,7 +6,7 @@ from typing import Any, List, Optional, Union
 
 from autogen_core import ComponentModel
 from pydantic import field_serializer
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import ForeignKey, Index, Integer, Text, UniqueConstraint
 from sqlmodel import JSON, Column, DateTime, Field, SQLModel, func
 
 from .types import (
@@ -36,7 +36,11 @@ class Team(SQLModel, table=True):
 
 
 class Message(SQLModel, table=True):
-    __table_args__ = {"sqlite_autoincrement": True}
+    __table_args__ = (
+        # Serves a run's history in order, see DatabaseManager.get_page
+        Index("ix_message_run_id_created_at", "run_id", "created_at"),
+        {"sqlite_autoincrement": True},
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True), server_default=func.now()),
@@ -149,6 +153,33 @@ class Run(SQLModel, table=True):
             return value.isoformat()
 
 
+class CheckpointBlob(SQLModel, table=True):
+    """A content-addressed segment of a run's checkpointed team state.
+
+    `Run.state` holds a small manifest that references these segments by
+    digest; see `CheckpointStore` for how state is split and reassembled.
+    """
+
+    __table_args__ = (
+        UniqueConstraint("run_id", "digest"),
+        {"sqlite_autoincrement": True},
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), server_default=func.now()),
+    )  # pylint: disable=not-callable
+    updated_at: datetime = Field(
+        default_factory=datetime.now,
+        sa_column=Column(DateTime(timezone=True), onupdate=func.now()),
+    )  # pylint: disable=not-callable
+    run_id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(Integer, ForeignKey("run.id", ondelete="CASCADE"), index=True),
+    )
+    digest: str = Field(index=True)
+    data: str = Field(sa_column=Column(Text, nullable=False))
+
+
 class Gallery(SQLModel, table=True):
     __table_args__ = {"sqlite_autoincrement": True}
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -220,4 +251,6 @@ class Plan(SQLModel, table=True):
             return value.isoformat()
 
 
-DatabaseModel = Team | Message | Session | Run | Gallery | Settings | Plan
+DatabaseModel = (
+    Team | Message | Session | Run | CheckpointBlob | Gallery | Settings | Plan
+)
@@ -27,7 +27,8 @@ from autogen_core.logging import LLMCallEvent
 from ...task_team import get_task_team
 from ...teams import GroupChat
 from ...types import RunPaths
-from ...magentic_ui_config import MagenticUIConfig, ModelClientConfigs
+from ...magentic_ui_config import ModelClientConfigs
+from ...team_template_cache import get_team_template_cache
 from ...input_func import InputFuncType
 from ...agents import WebSurfer
 
@@ -136,6 +137,27 @@ class TeamManager:
 
         return configs
 
+    def _web_surfer(self) -> Optional[WebSurfer]:
+        """The WebSurfer of the current team, if any"""
+        if hasattr(self.team, "_participants"):
+            for agent in cast(list[ChatAgent], self.team._participants):  # type: ignore
+                if isinstance(agent, WebSurfer):
+                    return agent
+        return None
+
+    @staticmethod
+    def _browser_address_message(novnc_port: int, playwright_port: int) -> TextMessage:
+        return TextMessage(
+            source="system",
+            content=f"Browser noVNC address can be found at http://localhost:{novnc_port}/vnc.html",
+            metadata={
+                "internal": "no",
+                "type": "browser_address",
+                "novnc_port": str(novnc_port),
+                "playwright_port": str(playwright_port),
+            },
+        )
+
     async def _create_team(
         self,
         team_config: Union[str, Path, Dict[str, Any], ComponentModel],
@@ -153,12 +175,13 @@ class TeamManager:
         )
         try:
             if not self.load_from_config:
+                template_cache = get_team_template_cache()
                 # The settings_config dictionary provides the Model configs in a key `model_configs`
                 # But MagenticUIConfig expects `model_client_configs` so we need to update that here
                 settings_model_configs: Dict[str, Any] = {}
                 if "model_configs" in settings_config:
                     try:
-                        settings_model_configs = yaml.safe_load(
+                        settings_model_configs = template_cache.parse_model_configs(
                             settings_config["model_configs"]
                         )
                     except Exception as e:
@@ -189,20 +212,22 @@ class TeamManager:
                     ),
                 )
 
-                magentic_ui_config = MagenticUIConfig(
-                    **{
+                # The validated config is shared by runs with the same settings,
+                # each run gets a copy with its own ports
+                magentic_ui_config = template_cache.magentic_ui_config(
+                    {
                         # Lowest priority defaults
                         **self.config,  # type: ignore
                         # Provided settings override defaults
                         **settings_config,  # type: ignore,
                         # Set to manually merged dictionary
                         "model_client_configs": model_client_configs,
-                        # These must always be set to the values computed above
-                        "playwright_port": playwright_port,
-                        "novnc_port": novnc_port,
                         # Defer to self for inside_docker
                         "inside_docker": self.inside_docker,
-                    }
+                    },
+                    # These must always be set to the values computed above
+                    playwright_port=playwright_port,
+                    novnc_port=novnc_port,
                 )
 
                 self.team = cast(
@@ -211,13 +236,13 @@ class TeamManager:
                         magentic_ui_config=magentic_ui_config,
                         input_func=input_func,
                         paths=paths,
+                        template_cache=template_cache,
                     ),
                 )
-                if hasattr(self.team, "_participants"):
-                    for agent in cast(list[ChatAgent], self.team._participants):  # type: ignore
-                        if isinstance(agent, WebSurfer):
-                            novnc_port = agent.novnc_port
-                            playwright_port = agent.playwright_port
+                web_surfer = self._web_surfer()
+                if web_surfer is not None:
+                    novnc_port = web_surfer.novnc_port
+                    playwright_port = web_surfer.playwright_port
 
                 if state:
                     if isinstance(state, str):
@@ -311,16 +336,7 @@ class TeamManager:
                 )
                 known_files = {file["name"] for file in initial_files}
 
-                yield TextMessage(
-                    source="system",
-                    content=f"Browser noVNC address can be found at http://localhost:{_novnc_port}/vnc.html",
-                    metadata={
-                        "internal": "no",
-                        "type": "browser_address",
-                        "novnc_port": str(_novnc_port),
-                        "playwright_port": str(_playwright_port),
-                    },
-                )
+                yield self._browser_address_message(_novnc_port, _playwright_port)
 
                 async for message in self.team.run_stream(  # type: ignore
                     task=task, cancellation_token=cancellation_token
@@ -365,6 +381,20 @@ class TeamManager:
                             global_new_files.extend(new_files)
                             yield file_message
 
+                    # The browser starts in the background and may have moved
+                    # to new ports if its first start failed
+                    web_surfer = self._web_surfer()
+                    if (
+                        web_surfer is not None
+                        and web_surfer.did_lazy_init
+                        and web_surfer.novnc_port != _novnc_port
+                    ):
+                        _novnc_port = web_surfer.novnc_port
+                        _playwright_port = web_surfer.playwright_port
+                        yield self._browser_address_message(
+                            _novnc_port, _playwright_port
+                        )
+
                     if isinstance(message, TaskResult):
                         yield TeamResult(
                             task_result=message,
@@ -13,6 +13,10 @@ class Settings(BaseSettings):
     API_DOCS: bool = False
     CLEANUP_INTERVAL: int = 300  # 5 minutes
     SESSION_TIMEOUT: int = 3600 * 24  # 24 hour
+    MESSAGE_BATCH_SIZE: int = 50  # streamed messages written per bulk insert
+    MESSAGE_FLUSH_INTERVAL: float = 1.0  # seconds a streamed message may stay buffered
+    MEMORY_MAX_RESIDENT: int = 16  # plan memory controllers kept in memory
+    MEMORY_IDLE_TIMEOUT: float = 1800.0  # seconds before an unused one is dropped
     CONFIG_DIR: str = "configs"  # Default config directory relative to app_root
     DEFAULT_USER_ID: str = "guestuser@gmail.com"
 
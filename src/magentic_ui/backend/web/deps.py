@@ -5,6 +5,9 @@ from typing import Any, Dict, Optional
 from pathlib import Path
 from fastapi import HTTPException, status
 
+from ...learning.memory_provider import MemoryControllerProvider
+from ...team_template_cache import get_team_template_cache
+from ...tools.playwright.browser import get_browser_pool
 from ..database import DatabaseManager
 from .config import settings
 from .managers.connection import WebSocketManager
@@ -93,9 +96,17 @@ async def init_managers(
             external_workspace_root=Path(external_workspace_root),
             inside_docker=inside_docker,
             config=config,
+            message_batch_size=settings.MESSAGE_BATCH_SIZE,
+            message_flush_interval=settings.MESSAGE_FLUSH_INTERVAL,
         )
         logger.info("Connection manager initialized")
 
+        # Plan memory controllers are shared by runs and the plans routes
+        MemoryControllerProvider(
+            max_resident=settings.MEMORY_MAX_RESIDENT,
+            idle_timeout=settings.MEMORY_IDLE_TIMEOUT,
+        )
+
     except Exception as e:
         logger.error(f"Failed to initialize managers: {str(e)}")
         await cleanup_managers()  # Cleanup any partially initialized managers
@@ -120,6 +131,18 @@ async def cleanup_managers() -> None:
     # TeamManager doesn't need explicit cleanup since WebSocketManager handles it
     _team_manager = None
 
+    # Close the model clients shared between runs, now that the runs stopped
+    try:
+        await get_team_template_cache().close()
+    except Exception as e:
+        logger.error(f"Error closing shared model clients: {str(e)}")
+
+    # Close the browsers pooled between runs
+    try:
+        await get_browser_pool().close()
+    except Exception as e:
+        logger.error(f"Error closing the browser pool: {str(e)}")
+
     # Cleanup database manager last
     if _db_manager:
         try:
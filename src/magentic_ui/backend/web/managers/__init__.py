@@ -1,3 +1,5 @@
 from .connection import WebSocketManager
+from .message_sink import MessageSink
+from .run_cache import RunCache
 
-__all__ = ["WebSocketManager"]
+__all__ = ["WebSocketManager", "MessageSink", "RunCache"]
@@ -22,7 +22,7 @@ from autogen_core import CancellationToken
 from fastapi import WebSocket, WebSocketDisconnect
 from pathlib import Path
 from ....types import CheckpointEvent
-from ...database import DatabaseManager
+from ...database import CheckpointStore, DatabaseManager
 from ...datamodel import (
     LLMCallEventMessage,
     Message,
@@ -34,7 +34,8 @@ from ...datamodel import (
     TeamResult,
 )
 from ...teammanager import TeamManager
-from ...utils.utils import compress_state
+from .message_sink import MessageSink
+from .run_cache import RunCache
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +50,8 @@ class WebSocketManager:
         external_workspace_root (Path): Path to the external root directory
         inside_docker (bool): Flag indicating if the application is running inside Docker
         config (dict): Configuration for Magentic-UI
+        message_batch_size (int, optional): Streamed messages buffered per run before they are written in bulk. Default: 50.
+        message_flush_interval (float, optional): Maximum seconds a streamed message stays buffered. Default: 1.0.
     """
 
     def __init__(
@@ -58,6 +61,8 @@ class WebSocketManager:
         external_workspace_root: Path,
         inside_docker: bool,
         config: Dict[str, Any],
+        message_batch_size: int = 50,
+        message_flush_interval: float = 1.0,
     ):
         self.db_manager = db_manager
         self.internal_workspace_root = internal_workspace_root
@@ -70,6 +75,13 @@ class WebSocketManager:
         self._closed_connections: set[int] = set()
         self._input_responses: Dict[int, asyncio.Queue[str]] = {}
         self._team_managers: Dict[int, TeamManager] = {}
+        self._message_sink = MessageSink(
+            db_manager,
+            max_batch_size=message_batch_size,
+            flush_interval=message_flush_interval,
+        )
+        self._checkpoint_store = CheckpointStore(db_manager)
+        self._run_cache = RunCache(db_manager)
         self._cancel_message = TeamResult(
             task_result=TaskResult(
                 messages=[TextMessage(source="user", content="Run cancelled by user")],
@@ -166,10 +178,11 @@ class WebSocketManager:
 
             state = None
             if run:
-                run.task = MessageConfig(content=task, source="user").model_dump()
-                run.status = RunStatus.ACTIVE
-                state = run.state
-                self.db_manager.upsert(run)
+                state = await self._checkpoint_store.load(run_id, run.state)
+                await self._run_cache.update(
+                    run_id,
+                    task=MessageConfig(content=task, source="user").model_dump(),
+                )
                 await self._update_run_status(run_id, RunStatus.ACTIVE)
 
             # add task as message
@@ -223,12 +236,17 @@ class WebSocketManager:
 
                 if isinstance(message, CheckpointEvent):
                     # Save state to run
-                    run = await self._get_run(run_id)
-                    if run:
-                        # Use compress_state utility to compress the state
-                        state_dict = json.loads(message.state)
-                        run.state = compress_state(state_dict)
-                        self.db_manager.upsert(run)
+                    # Only segments that changed since the last checkpoint are
+                    # written; run.state becomes a small manifest
+                    state_dict = json.loads(message.state)
+                    await self._run_cache.update(
+                        run_id,
+                        state=await self._checkpoint_store.save(run_id, state_dict),
+                    )
+                    if self._checkpoint_store.needs_compaction(run_id):
+                        # Compaction is only safe once the latest manifest is stored
+                        if await self._run_cache.flush(run_id):
+                            await self._checkpoint_store.compact(run_id)
                     continue
 
                 # do not show internal messages
@@ -260,6 +278,9 @@ class WebSocketManager:
                     elif isinstance(message, TeamResult):
                         final_result = message.model_dump()
                     self._team_managers[run_id] = team_manager  # Track the team manager
+
+            # Persist everything streamed so far before the run is marked done
+            await self._message_sink.close(run_id)
             if (
                 not cancellation_token.is_cancelled()
                 and run_id not in self._closed_connections
@@ -293,14 +314,31 @@ class WebSocketManager:
             traceback.print_exc()
             await self._handle_stream_error(run_id, e)
         finally:
+            await self._message_sink.close(run_id)
+            await self._close_run_state(run_id)
             self._cancellation_tokens.pop(run_id, None)
             self._team_managers.pop(run_id, None)  # Remove the team manager when done
 
+    async def _close_run_state(self, run_id: int) -> None:
+        """
+        Write back and evict the cached run and its checkpoint bookkeeping
+
+        Checkpoint segments are only compacted when the latest manifest is
+        known to be stored; otherwise the older stored manifest may still
+        reference segments that compaction would delete.
+
+        Args:
+            run_id (int): ID of the run
+        """
+        flushed = await self._run_cache.close(run_id)
+        await self._checkpoint_store.close(run_id, compact=flushed)
+
     async def _save_message(
         self, run_id: int, message: Union[AgentEvent | ChatMessage, LLMCallEventMessage]
     ) -> None:
         """
-        Save a message to the database
+        Queue a message for persistence. Messages are written in batches by
+        the message sink; see `MessageSink` for the flush policy.
 
         Args:
             run_id (int): ID of the run
@@ -316,7 +354,7 @@ class WebSocketManager:
                 config=message.model_dump(),
                 user_id=run.user_id,  # Pass the user_id from the run object
             )
-            self.db_manager.upsert(db_message)
+            await self._message_sink.add(run_id, db_message)
 
     async def _update_run(
         self,
@@ -334,14 +372,12 @@ class WebSocketManager:
             team_result (TeamResult | dict[str, Any], optional): Optional team result to set
             error (str, optional): Optional error message
         """
-        run = await self._get_run(run_id)
-        if run:
-            run.status = status
-            if team_result:
-                run.team_result = team_result
-            if error:
-                run.error_message = error
-            self.db_manager.upsert(run)
+        fields: Dict[str, Any] = {"status": status}
+        if team_result:
+            fields["team_result"] = team_result
+        if error:
+            fields["error_message"] = error
+        await self._run_cache.update(run_id, flush=True, **fields)
 
     def create_input_func(self, run_id: int, timeout: int = 600) -> InputFuncType:
         """
@@ -380,11 +416,13 @@ class WebSocketManager:
                     },
                 )
 
-                # Store input_request in the Run object
-                run = await self._get_run(run_id)
-                if run:
-                    run.input_request = {"prompt": prompt, "input_type": input_type}
-                    self.db_manager.upsert(run)
+                # Store input_request in the Run object; written right away so
+                # that a reloaded client can still see the pending request
+                await self._run_cache.update(
+                    run_id,
+                    flush=True,
+                    input_request={"prompt": prompt, "input_type": input_type},
+                )
 
                 # Wait for response with timeout
                 if run_id in self._input_responses:
@@ -490,6 +528,7 @@ class WebSocketManager:
 
         # Cancel any running tasks
         await self.stop_run(run_id, "Connection closed")
+        await self._close_run_state(run_id)
 
         # Clean up resources
         self._connections.pop(run_id, None)
@@ -532,6 +571,7 @@ class WebSocketManager:
             run_id (int): ID of the run
             error (Exception): Exception that occurred
         """
+        await self._message_sink.close(run_id)
         if run_id not in self._closed_connections:
             error_result = TeamResult(
                 task_result=TaskResult(
@@ -612,7 +652,7 @@ class WebSocketManager:
             return None
 
     async def _get_run(self, run_id: int) -> Optional[Run]:
-        """Get run from database
+        """Get run from the run cache, reading the database on first access
 
         Args:
             run_id (int): int of the run to retrieve
@@ -620,8 +660,7 @@ class WebSocketManager:
         Returns:
             Optional[Run]: Run object if found, None otherwise
         """
-        response = self.db_manager.get(Run, filters={"id": run_id}, return_json=False)
-        return response.data[0] if response.status and response.data else None
+        return await self._run_cache.get(run_id)
 
     async def _get_settings(self, user_id: str) -> Optional[Settings]:
         """Get user settings from database
@@ -630,7 +669,7 @@ class WebSocketManager:
         Returns:
             Optional[Settings]: User settings if found, None otherwise
         """
-        response = self.db_manager.get(
+        response = await self.db_manager.get(
             filters={"user_id": user_id}, model_class=Settings, return_json=False
         )
         return response.data[0] if response.status and response.data else None
@@ -645,11 +684,14 @@ class WebSocketManager:
             status (RunStatus): New status to set
             error (str, optional): Optional error message
         """
-        run = await self._get_run(run_id)
-        if run:
-            run.status = status
-            run.error_message = error
-            self.db_manager.upsert(run)
+        # Anything but ACTIVE (e.g. awaiting input) matters to clients that
+        # reload the page, so only ACTIVE is left to the coalesced write-back
+        await self._run_cache.update(
+            run_id,
+            flush=status != RunStatus.ACTIVE,
+            status=status,
+            error_message=error,
+        )
         # send system message to client with status
         await self._send_message(
             run_id,
@@ -685,9 +727,12 @@ class WebSocketManager:
                         duration=0,
                     ).model_dump()
 
-                    run.status = RunStatus.STOPPED
-                    run.team_result = interrupted_result
-                    self.db_manager.upsert(run)
+                    await self._run_cache.update(
+                        run_id,
+                        flush=True,
+                        status=RunStatus.STOPPED,
+                        team_result=interrupted_result,
+                    )
 
             # Then disconnect all websockets with timeout
             # 10 second timeout for entire cleanup
@@ -707,6 +752,8 @@ class WebSocketManager:
         except Exception as e:
             logger.error(f"Error during WebSocketManager cleanup: {e}")
         finally:
+            await self._message_sink.close_all()
+            await self._run_cache.close_all()
             # Always clear internal state, even if cleanup had errors
             self._connections.clear()
             self._cancellation_tokens.clear()
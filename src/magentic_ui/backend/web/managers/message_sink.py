@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from typing import Dict, List
+
+from ...database import DatabaseManager
+from ...datamodel import Message
+
+logger = logging.getLogger(__name__)
+
+
+class MessageSink:
+    """
+    Write-behind buffer for messages streamed by active runs.
+
+    Messages are buffered per run and written with a single bulk insert once
+    `max_batch_size` messages are pending or `flush_interval` seconds after the
+    first buffered message, whichever comes first. Callers must `close` a run
+    when it ends (completion, cancellation or error) to flush what is left;
+    that final flush is retried `close_retries` times, waiting `retry_delay`
+    seconds and doubling the wait after each attempt, before the messages are
+    dropped.
+
+    Args:
+        db_manager (DatabaseManager): Database manager used for the bulk inserts
+        max_batch_size (int, optional): Pending messages that trigger an immediate flush. Default: 50.
+        flush_interval (float, optional): Maximum seconds a message stays buffered. Default: 1.0.
+        close_retries (int, optional): Retries of the final flush of a run. Default: 3.
+        retry_delay (float, optional): Seconds before the first retry. Default: 0.2.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        max_batch_size: int = 50,
+        flush_interval: float = 1.0,
+        close_retries: int = 3,
+        retry_delay: float = 0.2,
+    ):
+        self.db_manager = db_manager
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.close_retries = close_retries
+        self.retry_delay = retry_delay
+        self._buffers: Dict[int, List[Message]] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._timers: Dict[int, asyncio.Task[None]] = {}
+
+    async def add(self, run_id: int, message: Message) -> None:
+        """
+        Buffer a message for a run, flushing if the batch is full
+
+        Args:
+            run_id (int): ID of the run the message belongs to
+            message (Message): Message row to persist
+        """
+        buffer = self._buffers.setdefault(run_id, [])
+        buffer.append(message)
+        if len(buffer) >= self.max_batch_size:
+            await self.flush(run_id)
+        elif run_id not in self._timers:
+            self._timers[run_id] = asyncio.create_task(self._flush_later(run_id))
+
+    async def flush(self, run_id: int) -> bool:
+        """
+        Write all buffered messages of a run to the database
+
+        On failure the messages are put back at the front of the buffer so the
+        next flush retries them in their original order.
+
+        Args:
+            run_id (int): ID of the run to flush
+
+        Returns:
+            bool: True if the buffer was written (or empty), False otherwise
+        """
+        lock = self._locks.setdefault(run_id, asyncio.Lock())
+        async with lock:
+            timer = self._timers.pop(run_id, None)
+            if timer and timer is not asyncio.current_task():
+                timer.cancel()
+
+            batch = self._buffers.pop(run_id, [])
+            if not batch:
+                return True
+
+            response = await self.db_manager.insert_many(batch)
+            if not response.status:
+                logger.error(
+                    f"Failed to flush {len(batch)} messages for run {run_id}: "
+                    f"{response.message}"
+                )
+                self._buffers[run_id] = batch + self._buffers.get(run_id, [])
+                return False
+            return True
+
+    async def close(self, run_id: int) -> None:
+        """
+        Flush and forget a run. Safe to call more than once.
+
+        Args:
+            run_id (int): ID of the run that ended
+        """
+        try:
+            flushed = await self.flush(run_id)
+            delay = self.retry_delay
+            for _ in range(self.close_retries):
+                if flushed:
+                    break
+                await asyncio.sleep(delay)
+                delay *= 2
+                flushed = await self.flush(run_id)
+            if not flushed:
+                dropped = len(self._buffers.pop(run_id, []))
+                logger.error(f"Dropped {dropped} unsaved messages for run {run_id}")
+        finally:
+            self._locks.pop(run_id, None)
+
+    async def close_all(self) -> None:
+        """Flush every run that still has buffered messages"""
+        for run_id in list(self._buffers.keys() | self._timers.keys()):
+            await self.close(run_id)
+
+    def pending(self, run_id: int) -> int:
+        """Number of messages buffered but not yet written for a run"""
+        return len(self._buffers.get(run_id, []))
+
+    async def _flush_later(self, run_id: int) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush(run_id)
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+from pydantic import BaseModel
+
+from ...database import DatabaseManager
+from ...datamodel import Run
+
+logger = logging.getLogger(__name__)
+
+
+class RunCache:
+    """
+    Authoritative in-memory copy of the `Run` rows of active streams.
+
+    A run is read from the database once and then served from memory. Field
+    changes made through `update` are tracked per run and written back as a
+    single UPDATE of only the changed columns, either right away (`flush=True`)
+    or coalesced with other changes after `flush_interval` seconds. Callers
+    must `close` a run when its stream ends to write back pending changes and
+    drop it from the cache.
+
+    Args:
+        db_manager (DatabaseManager): Database manager used to read and write runs
+        flush_interval (float, optional): Maximum seconds a change stays unwritten. Default: 0.5.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, flush_interval: float = 0.5):
+        self.db_manager = db_manager
+        self.flush_interval = flush_interval
+        self._runs: Dict[int, Run] = {}
+        self._dirty: Dict[int, Set[str]] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._timers: Dict[int, asyncio.Task[None]] = {}
+
+    async def get(self, run_id: int) -> Optional[Run]:
+        """
+        Get a run, reading it from the database only if it is not cached
+
+        Args:
+            run_id (int): ID of the run
+
+        Returns:
+            Optional[Run]: The cached run, or None if it does not exist
+        """
+        if run_id not in self._runs:
+            response = await self.db_manager.get(
+                Run, filters={"id": run_id}, return_json=False
+            )
+            if not response.status or not response.data:
+                return None
+            # Another caller may have loaded it while we were waiting
+            self._runs.setdefault(run_id, response.data[0])
+        return self._runs[run_id]
+
+    async def update(
+        self, run_id: int, flush: bool = False, **fields: Any
+    ) -> Optional[Run]:
+        """
+        Set fields on a cached run and schedule their write-back
+
+        Args:
+            run_id (int): ID of the run
+            flush (bool, optional): Write the changes before returning. Default: False.
+            **fields: Run attributes to set
+
+        Returns:
+            Optional[Run]: The updated run, or None if it does not exist
+        """
+        run = await self.get(run_id)
+        if run is None:
+            return None
+        for name, value in fields.items():
+            setattr(run, name, value)
+        self._dirty.setdefault(run_id, set()).update(fields)
+
+        if flush:
+            await self.flush(run_id)
+        elif run_id not in self._timers:
+            self._timers[run_id] = asyncio.create_task(self._flush_later(run_id))
+        return run
+
+    async def flush(self, run_id: int) -> bool:
+        """
+        Write the changed fields of a run to the database
+
+        Args:
+            run_id (int): ID of the run
+
+        Returns:
+            bool: True if nothing was pending or the write succeeded
+        """
+        lock = self._locks.setdefault(run_id, asyncio.Lock())
+        async with lock:
+            timer = self._timers.pop(run_id, None)
+            if timer and timer is not asyncio.current_task():
+                timer.cancel()
+
+            dirty = self._dirty.pop(run_id, set())
+            run = self._runs.get(run_id)
+            if not dirty or run is None:
+                return True
+
+            values = {name: _to_column(getattr(run, name)) for name in sorted(dirty)}
+            response = await self.db_manager.update_fields(Run, run_id, values)
+            if not response.status:
+                logger.error(
+                    f"Failed to write back run {run_id} ({', '.join(values)}): "
+                    f"{response.message}"
+                )
+                self._dirty.setdefault(run_id, set()).update(dirty)
+                return False
+            return True
+
+    async def close(self, run_id: int) -> bool:
+        """
+        Write back and evict a run. Safe to call more than once.
+
+        Args:
+            run_id (int): ID of the run
+
+        Returns:
+            bool: True if nothing was pending or the final write succeeded
+        """
+        try:
+            return await self.flush(run_id)
+        finally:
+            self._runs.pop(run_id, None)
+            self._dirty.pop(run_id, None)
+            self._locks.pop(run_id, None)
+
+    async def close_all(self) -> None:
+        """Write back and evict every cached run"""
+        for run_id in list(self._runs):
+            await self.close(run_id)
+
+    def is_dirty(self, run_id: int) -> bool:
+        """Whether a run has changes that are not written yet"""
+        return bool(self._dirty.get(run_id))
+
+    async def _flush_later(self, run_id: int) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush(run_id)
+
+
+def _to_column(value: Any) -> Any:
+    """Convert nested models to the plain data stored in JSON columns"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    return value
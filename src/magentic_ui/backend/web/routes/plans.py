@@ -14,6 +14,7 @@ from ....learning import learn_plan_from_messages
 from ....learning.memory_provider import MemoryControllerProvider
 
 from ...datamodel import Plan
+from ..config import settings
 from ..deps import get_db
 from .sessions import list_session_runs
 
@@ -23,14 +24,14 @@ router = APIRouter()
 @router.get("/")
 async def list_plans(user_id: str, db=Depends(get_db)) -> Dict:
     """Get all plans for a user"""
-    response = db.get(Plan, filters={"user_id": user_id})
+    response = await db.get(Plan, filters={"user_id": user_id})
     return {"status": True, "data": response.data}
 
 
 @router.get("/{plan_id}")
 async def get_plan(plan_id: int, user_id: str, db=Depends(get_db)) -> Dict:
     """Get a specific plan"""
-    response = db.get(Plan, filters={"id": plan_id, "user_id": user_id})
+    response = await db.get(Plan, filters={"id": plan_id, "user_id": user_id})
     if not response.status or not response.data:
         raise HTTPException(status_code=404, detail="Plan not found")
     return {"status": True, "data": response.data[0]}
@@ -42,7 +43,7 @@ async def create_plan(plan: Plan, db=Depends(get_db)) -> Dict:
     if not plan.user_id:
         raise HTTPException(status_code=400, detail="user_id is required")
 
-    plan_response = db.upsert(plan)
+    plan_response = await db.upsert(plan)
     if not plan_response.status:
         raise HTTPException(status_code=400, detail=plan_response.message)
 
@@ -53,11 +54,11 @@ async def create_plan(plan: Plan, db=Depends(get_db)) -> Dict:
 async def update_plan(
     plan_id: int, user_id: str, plan: Plan, db=Depends(get_db)
 ) -> Dict:
-    existing_plan = db.get(Plan, filters={"id": plan_id, "user_id": user_id})
+    existing_plan = await db.get(Plan, filters={"id": plan_id, "user_id": user_id})
     if not existing_plan.status or not existing_plan.data:
         raise HTTPException(status_code=404, detail="Plan not found")
 
-    response = db.upsert(plan)
+    response = await db.upsert(plan)
     if not response.status:
         raise HTTPException(status_code=400, detail=response.message)
     return {
@@ -70,7 +71,7 @@ async def update_plan(
 @router.delete("/{plan_id}")
 async def delete_plan(plan_id: int, user_id: str, db=Depends(get_db)) -> Dict:
     """Delete a specific plan"""
-    response = db.delete(Plan, filters={"id": plan_id, "user_id": user_id})
+    response = await db.delete(Plan, filters={"id": plan_id, "user_id": user_id})
     if not response.status:
         raise HTTPException(status_code=400, detail=response.message)
     return {"status": True, "data": response.data}
@@ -197,7 +198,7 @@ async def learn_plan(
         db_plan = Plan(
             task=plan.task, steps=steps_as_dicts, user_id=user_id, session_id=session_id
         )
-        response = db.upsert(db_plan)
+        response = await db.upsert(db_plan)
 
         # Add the plan to memory
         try:
@@ -206,6 +207,8 @@ async def learn_plan(
                 external_workspace_root=Path(os.environ.get("EXTERNAL_WORKSPACE_ROOT")),
                 inside_docker=os.environ.get("INSIDE_DOCKER", "false").lower()
                 == "true",
+                max_resident=settings.MEMORY_MAX_RESIDENT,
+                idle_timeout=settings.MEMORY_IDLE_TIMEOUT,
             )
             memory_controller = memory_provider.get_memory_controller(
                 user_id, model_client
@@ -1,7 +1,9 @@
 # /api/runs routes
-from typing import Dict
+import json
+from typing import AsyncIterator, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from ...datamodel import Message, Run, RunStatus, Session
@@ -22,7 +24,7 @@ async def create_run(
 ) -> Dict:
     """Return the existing run for a session or create a new one"""
     # First check if session exists and belongs to user
-    session_response = db.get(
+    session_response = await db.get(
         Session,
         filters={"id": request.session_id, "user_id": request.user_id},
         return_json=False,
@@ -31,7 +33,7 @@ async def create_run(
         raise HTTPException(status_code=404, detail="Session not found")
 
     # Get the latest run for this session
-    run_response = db.get(
+    run_response = await db.get(
         Run,
         filters={"session_id": request.session_id},
         return_json=False,
@@ -40,7 +42,7 @@ async def create_run(
     if not run_response.status or not run_response.data:
         # Create a new run if one doesn't exist
         try:
-            run_response = db.upsert(
+            run_response = await db.upsert(
                 Run(
                     session_id=request.session_id,
                     status=RunStatus.CREATED,
@@ -71,18 +73,64 @@ async def create_run(
 @router.get("/{run_id}")
 async def get_run(run_id: int, db=Depends(get_db)) -> Dict:
     """Get run details including task and result"""
-    run = db.get(Run, filters={"id": run_id}, return_json=False)
+    run = await db.get(Run, filters={"id": run_id}, return_json=False)
     if not run.status or not run.data:
         raise HTTPException(status_code=404, detail="Run not found")
 
     return {"status": True, "data": run.data[0]}
 
 
+MAX_PAGE_SIZE = 1000
+
+
 @router.get("/{run_id}/messages")
-async def get_run_messages(run_id: int, db=Depends(get_db)) -> Dict:
-    """Get all messages for a run"""
-    messages = db.get(
-        Message, filters={"run_id": run_id}, order="created_at asc", return_json=False
+async def get_run_messages(
+    run_id: int,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = None,
+    db=Depends(get_db),
+) -> Dict:
+    """Get the messages of a run in order, all of them or one page at a time.
+
+    With `limit`, the response holds at most that many messages and a
+    `next_cursor` to pass as `cursor` for the next page, None on the last one.
+    """
+    if limit is None:
+        messages = await db.get(
+            Message, filters={"run_id": run_id}, order="asc", return_json=False
+        )
+        if not messages.status:
+            raise HTTPException(status_code=500, detail=messages.message)
+        return {"status": True, "data": messages.data}
+
+    page = await db.get_page(
+        Message, filters={"run_id": run_id}, limit=limit, cursor=cursor
     )
+    if not page.status:
+        raise HTTPException(status_code=500, detail=page.message)
+    return {
+        "status": True,
+        "data": page.data["items"],
+        "next_cursor": page.data["next_cursor"],
+    }
+
+
+@router.get("/{run_id}/messages/stream")
+async def stream_run_messages(
+    run_id: int,
+    cursor: Optional[int] = None,
+    db=Depends(get_db),
+) -> StreamingResponse:
+    """Stream the messages of a run as newline-delimited JSON, one per line.
+
+    The messages are read from the database in batches while the response is
+    sent, so neither side holds the whole history in memory.
+    """
+
+    async def lines() -> AsyncIterator[str]:
+        async for message in db.stream(
+            Message, filters={"run_id": run_id}, cursor=cursor, return_json=True
+        ):
+            yield json.dumps(message) + "\n"
 
-    return {"status": True, "data": messages.data}
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,11 +1,12 @@
 # api/routes/sessions.py
-from typing import Dict
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from loguru import logger
 
 from ...datamodel import Message, Run, Session, RunStatus
 from ..deps import get_db
+from .runs import MAX_PAGE_SIZE
 
 router = APIRouter()
 
@@ -13,14 +14,14 @@ router = APIRouter()
 @router.get("/")
 async def list_sessions(user_id: str, db=Depends(get_db)) -> Dict:
     """List all sessions for a user"""
-    response = db.get(Session, filters={"user_id": user_id})
+    response = await db.get(Session, filters={"user_id": user_id})
     return {"status": True, "data": response.data}
 
 
 @router.get("/{session_id}")
 async def get_session(session_id: int, user_id: str, db=Depends(get_db)) -> Dict:
     """Get a specific session"""
-    response = db.get(Session, filters={"id": session_id, "user_id": user_id})
+    response = await db.get(Session, filters={"id": session_id, "user_id": user_id})
     if not response.status or not response.data:
         raise HTTPException(status_code=404, detail="Session not found")
     return {"status": True, "data": response.data[0]}
@@ -30,13 +31,13 @@ async def get_session(session_id: int, user_id: str, db=Depends(get_db)) -> Dict
 async def create_session(session: Session, db=Depends(get_db)) -> Dict:
     """Create a new session with an associated run"""
     # Create session
-    session_response = db.upsert(session)
+    session_response = await db.upsert(session)
     if not session_response.status:
         raise HTTPException(status_code=400, detail=session_response.message)
 
     # Create associated run
     try:
-        run = db.upsert(
+        run = await db.upsert(
             Run(
                 session_id=session.id,
                 status=RunStatus.CREATED,
@@ -61,12 +62,12 @@ async def update_session(
 ) -> Dict:
     """Update an existing session"""
     # First verify the session belongs to user
-    existing = db.get(Session, filters={"id": session_id, "user_id": user_id})
+    existing = await db.get(Session, filters={"id": session_id, "user_id": user_id})
     if not existing.status or not existing.data:
         raise HTTPException(status_code=404, detail="Session not found")
 
     # Update the session
-    response = db.upsert(session)
+    response = await db.upsert(session)
     if not response.status:
         raise HTTPException(status_code=400, detail=response.message)
 
@@ -81,18 +82,27 @@ async def update_session(
 async def delete_session(session_id: int, user_id: str, db=Depends(get_db)) -> Dict:
     """Delete a session and all its associated runs and messages"""
     # Delete the session
-    db.delete(filters={"id": session_id, "user_id": user_id}, model_class=Session)
+    await db.delete(filters={"id": session_id, "user_id": user_id}, model_class=Session)
 
     return {"status": True, "message": "Session deleted successfully"}
 
 
 @router.get("/{session_id}/runs")
-async def list_session_runs(session_id: int, user_id: str, db=Depends(get_db)) -> Dict:
-    """Get complete session history organized by runs"""
+async def list_session_runs(
+    session_id: int,
+    user_id: str,
+    messages_limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    db=Depends(get_db),
+) -> Dict:
+    """Get complete session history organized by runs
+
+    With `messages_limit`, each run holds only its first messages and a
+    `next_cursor` to load the rest from `GET /runs/{run_id}/messages`.
+    """
 
     try:
         # 1. Verify session exists and belongs to user
-        session = db.get(
+        session = await db.get(
             Session, filters={"id": session_id, "user_id": user_id}, return_json=False
         )
         if not session.status:
@@ -105,7 +115,7 @@ async def list_session_runs(session_id: int, user_id: str, db=Depends(get_db)) -
             )
 
         # 2. Get ordered runs for session
-        runs = db.get(
+        runs = await db.get(
             Run, filters={"session_id": session_id}, order="asc", return_json=False
         )
         if not runs.status:
@@ -116,31 +126,43 @@ async def list_session_runs(session_id: int, user_id: str, db=Depends(get_db)) -
         # 3. Build response with messages per run
         run_data = []
         if runs.data:  # It's ok to have no runs
+            # Without a limit, fetch the messages of all runs in one query
+            messages_by_run: Dict[int, List[Any]] = {}
+            if messages_limit is None:
+                messages = await db.get(
+                    Message,
+                    filters={"run_id": [run.id for run in runs.data]},
+                    order="asc",
+                    return_json=False,
+                )
+                if not messages.status:
+                    logger.error(f"Failed to fetch messages for session {session_id}")
+                for message in messages.data or []:
+                    messages_by_run.setdefault(message.run_id, []).append(message)
+
             for run in runs.data:
                 try:
-                    # Get messages for this specific run
-                    messages = db.get(
-                        Message,
-                        filters={"run_id": run.id},
-                        order="asc",
-                        return_json=False,
-                    )
-                    if not messages.status:
-                        logger.error(f"Failed to fetch messages for run {run.id}")
+                    run_entry: Dict[str, Any] = {
+                        "id": str(run.id),
+                        "created_at": run.created_at,
+                        "status": run.status,
+                        "task": run.task,
+                        "team_result": run.team_result,
+                        "messages": messages_by_run.get(run.id, []),
+                        "input_request": getattr(run, "input_request", None),
+                    }
+                    if messages_limit is not None:
+                        # Get the first messages for this specific run
+                        page = await db.get_page(
+                            Message, filters={"run_id": run.id}, limit=messages_limit
+                        )
+                        if not page.status:
+                            logger.error(f"Failed to fetch messages for run {run.id}")
                         # Continue processing other runs even if one fails
-                        messages.data = []
+                        run_entry["messages"] = page.data["items"]
+                        run_entry["next_cursor"] = page.data["next_cursor"]
 
-                    run_data.append(
-                        {
-                            "id": str(run.id),
-                            "created_at": run.created_at,
-                            "status": run.status,
-                            "task": run.task,
-                            "team_result": run.team_result,
-                            "messages": messages.data or [],
-                            "input_request": getattr(run, "input_request", None),
-                        }
-                    )
+                    run_data.append(run_entry)
                 except Exception as e:
                     logger.error(f"Error processing run {run.id}: {str(e)}")
                     # Include run with error state instead of failing entirely
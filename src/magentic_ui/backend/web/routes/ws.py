@@ -23,7 +23,7 @@ async def run_websocket(
 ):
     """WebSocket endpoint for run communication"""
     # Verify run exists and is in valid state
-    run_response = db.get(Run, filters={"id": run_id}, return_json=False)
+    run_response = await db.get(Run, filters={"id": run_id}, return_json=False)
     if not run_response.status or not run_response.data:
         logger.warning(f"Run not found: {run_id}")
         await websocket.close(code=4004, reason="Run not found")
@@ -6,10 +6,12 @@ import time
 import json
 import random
 import datetime
+import functools
 from typing import Optional, Union, List, Tuple, Callable
 from .benchmark import load_benchmark_class, Benchmark
 from .basesystem import load_system_class, BaseSystem
 from .models import AllCandidateTypes, AllEvalResultTypes
+from .scheduler import SUCCEEDED, RunManifest, TaskOutcome, TaskScheduler
 
 
 # ----------------------------------------------------------------------
@@ -266,6 +268,8 @@ def run_benchmark_func(
     seed: Optional[int] = 42,
     reload_benchmark_per_task: bool = False,
     reload_system_per_task: bool = False,
+    task_timeout: Optional[float] = None,
+    max_retries: int = 0,
 ) -> None:
     """Run benchmark evaluation.
 
@@ -283,17 +287,21 @@ def run_benchmark_func(
         seed (int, optional): Random seed for reproducibility. Default: 42
         reload_benchmark_per_task (bool, optional): Whether to reload benchmark for each task. Default: False
         reload_system_per_task (bool, optional): Whether to reload system for each task. Default: False
+        task_timeout (float, optional): Seconds a task may run before it is abandoned and its worker process replaced
+        max_retries (int, optional): Extra attempts for a task that failed, timed out or crashed its worker. Default: 0
 
     The workflow:
     1. Sets up benchmark and system instances/constructors
     2. Prepares tasks with optional subsampling
-    3. Executes tasks in parallel or sequentially
-    4. Collects and logs results
+    3. Skips the tasks the run manifest records as succeeded
+    4. Executes the remaining tasks in worker processes or sequentially
+    5. Records and logs each result as it lands
 
     Key features:
-    - Supports parallel processing
+    - Supports parallel processing, with idle workers taking the next task
+    - Per-task timeouts and retries
     - Handles system/benchmark reloading per task
-    - Caches results to disk
+    - Caches results to disk and resumes interrupted runs from the manifest
     - Provides progress logging
     """
     _setup_file_logging(runs_dir, system_name, benchmark_name, split, run_id)
@@ -360,40 +368,66 @@ def run_benchmark_func(
     if subsample and 0 < subsample <= 1:
         task_ids = random.sample(task_ids, int(len(task_ids) * subsample))
 
-    # Task preparation bundles all necessary data for parallel execution
-    tasks_system_data = [
-        (
-            system_constructor,
-            task_id,
-            output_dir,
-            reload_system_per_task,
-            benchmark_constructor if reload_benchmark_per_task else benchmark,
-            benchmark_dir,
-            reload_benchmark_per_task,
-            benchmark_name,
+    # The manifest records every result as it lands, so an interrupted run
+    # started again only runs the tasks that did not succeed
+    manifest = RunManifest(output_dir, task_ids)
+    remaining = manifest.remaining(task_ids)
+    if len(remaining) < len(task_ids):
+        logger.info(
+            f"Resuming run: {len(task_ids) - len(remaining)} of {len(task_ids)} tasks already succeeded."
         )
-        for task_id in task_ids
-    ]
+
+    # Everything but the task id is bound here for the worker processes
+    run_task = functools.partial(
+        _run_single_task,
+        system_constructor,
+        output_dir=output_dir,
+        reload_system=reload_system_per_task,
+        benchmark_constructor=benchmark_constructor
+        if reload_benchmark_per_task
+        else benchmark,
+        benchmark_dir=benchmark_dir,
+        reload_benchmark=reload_benchmark_per_task,
+        benchmark_name=benchmark_name,
+    )
+
+    finished = len(task_ids) - len(remaining)
+
+    def on_outcome(outcome: TaskOutcome) -> None:
+        nonlocal finished
+        manifest.record(outcome)
+        if outcome.final:
+            finished += 1
+        if outcome.status == SUCCEEDED:
+            logger.info(
+                f"[{finished}/{len(task_ids)}] {outcome.task_id} succeeded in {outcome.duration:.1f}s"
+            )
+        else:
+            retry = "" if outcome.final else ", retrying"
+            logger.info(
+                f"[{finished}/{len(task_ids)}] {outcome.task_id} {outcome.status} on attempt {outcome.attempt}{retry}: {outcome.error}"
+            )
 
     logger.info(
         f"Starting run_benchmark with {'sequential' if parallel == 1 else str(parallel) + ' processes'}..."
     )
+    scheduler = TaskScheduler(
+        run_task,
+        parallel=parallel,
+        task_timeout=task_timeout,
+        max_retries=max_retries,
+        on_outcome=on_outcome,
+        on_start=manifest.mark_running,
+    )
+    scheduler.run(remaining)
 
-    # Separate path for non-parallel execution
-    if parallel == 1:
-        results: List[Tuple[str, Optional[AllCandidateTypes], float]] = []
-        for task_data in tasks_system_data:
-            results.append(_run_single_task(*task_data))
-    else:
-        with multiprocessing.Pool(processes=parallel) as pool:
-            results = pool.starmap(_run_single_task, tasks_system_data)
-
-    success_count = sum(1 for _, answer, _ in results if answer is not None)
-    total_time = sum(t for _, a, t in results if a is not None)
+    records = [manifest.tasks[str(task_id)] for task_id in task_ids]
+    success_count = sum(1 for record in records if record.status == SUCCEEDED)
+    total_time = sum(r.duration for r in records if r.status == SUCCEEDED)
     avg_time = total_time / success_count if success_count else 0
     logger.info(f"Average time per successful task: {avg_time:.4f} seconds")
 
-    fail_count = len(results) - success_count
+    fail_count = len(records) - success_count
 
     logger.info(f"Run completed: {success_count} succeeded, {fail_count} failed.")
 
@@ -643,6 +677,8 @@ def run_evaluate_benchmark_func(
     redo_eval: bool = False,
     reload_benchmark_per_task: bool = False,
     reload_system_per_task: bool = False,
+    task_timeout: Optional[float] = None,
+    max_retries: int = 0,
 ) -> None:
     """Run benchmark evaluation and compute metrics.
 
@@ -661,6 +697,8 @@ def run_evaluate_benchmark_func(
         redo_eval (bool, optional): Whether to redo evaluation even if results exist. Default: False
         reload_benchmark_per_task (bool, optional): Whether to reload benchmark for each task. Default: False
         reload_system_per_task (bool, optional): Whether to reload system for each task. Default: False
+        task_timeout (float, optional): Seconds a task may run before it is abandoned
+        max_retries (int, optional): Extra attempts for a task that did not succeed. Default: 0
     """
     if isinstance(run_id, int):
         run_ids = [run_id]
@@ -682,6 +720,8 @@ def run_evaluate_benchmark_func(
             seed=seed,
             reload_benchmark_per_task=reload_benchmark_per_task,
             reload_system_per_task=reload_system_per_task,
+            task_timeout=task_timeout,
+            max_retries=max_retries,
         )
     evaluate_benchmark_func(
         benchmark_name=benchmark_name,
@@ -0,0 +1,398 @@
+import os
+import json
+import time
+import logging
+import tempfile
+import traceback
+import multiprocessing
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .models import AllCandidateTypes
+
+logger = logging.getLogger(__name__)
+
+# A task runner takes a task id and returns (task id, answer or None, duration)
+TaskResult = Tuple[str, Optional[AllCandidateTypes], float]
+TaskRunner = Callable[[str], TaskResult]
+
+# Task states recorded in the run manifest
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+CRASHED = "crashed"
+
+
+@dataclass
+class TaskOutcome:
+    """The outcome of one attempt at a task.
+
+    Attributes:
+        task_id (str): Task identifier
+        status (str): One of SUCCEEDED, FAILED, TIMED_OUT or CRASHED
+        attempt (int): Attempt number, starting at 1
+        answer (AllCandidateTypes, optional): The system's answer, if any
+        duration (float): Time the system took to answer, in seconds
+        error (str, optional): Why the attempt failed
+        final (bool): Whether no further attempt will be made
+    """
+
+    task_id: str
+    status: str
+    attempt: int
+    answer: Optional[AllCandidateTypes] = None
+    duration: float = 0.0
+    error: Optional[str] = None
+    final: bool = True
+
+
+@dataclass
+class TaskRecord:
+    """The state of a task in a run manifest."""
+
+    status: str = PENDING
+    attempts: int = 0
+    duration: float = 0.0
+    error: Optional[str] = None
+    updated_at: float = field(default_factory=time.time)
+
+
+class RunManifest:
+    """Resumable record of a benchmark run.
+
+    The state of every task is kept in `manifest.json` inside the run
+    directory and rewritten atomically after each attempt, and every attempt
+    is appended to `results.jsonl` as it finishes. A run started again in the
+    same directory only schedules the tasks that have not succeeded yet.
+
+    Args:
+        output_dir (str): Directory of the run
+        task_ids (List[str]): Tasks of the run
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    RESULTS_FILE = "results.jsonl"
+
+    def __init__(self, output_dir: str, task_ids: List[str]) -> None:
+        self.manifest_path = os.path.join(output_dir, self.MANIFEST_FILE)
+        self.results_path = os.path.join(output_dir, self.RESULTS_FILE)
+        self.tasks: Dict[str, TaskRecord] = {}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, "r") as f:
+                    data = json.load(f)
+                self.tasks = {
+                    task_id: TaskRecord(**record)
+                    for task_id, record in data.get("tasks", {}).items()
+                }
+            except Exception as e:
+                logger.info(f"Ignoring unreadable manifest {self.manifest_path}: {e}")
+        for task_id in task_ids:
+            self.tasks.setdefault(str(task_id), TaskRecord())
+        self.save()
+
+    def remaining(self, task_ids: List[str]) -> List[str]:
+        """Tasks among `task_ids` that have not succeeded yet, in order."""
+        return [
+            task_id
+            for task_id in task_ids
+            if self.tasks[str(task_id)].status != SUCCEEDED
+        ]
+
+    def mark_running(self, task_id: str, attempt: int) -> None:
+        """Record that an attempt at a task started."""
+        record = self.tasks[str(task_id)]
+        record.status = RUNNING
+        record.attempts = attempt
+        record.updated_at = time.time()
+        self.save()
+
+    def record(self, outcome: TaskOutcome) -> None:
+        """Persist the outcome of an attempt.
+
+        Args:
+            outcome (TaskOutcome): The finished attempt
+        """
+        record = self.tasks[str(outcome.task_id)]
+        record.status = outcome.status if outcome.final else PENDING
+        record.attempts = outcome.attempt
+        record.duration = outcome.duration
+        record.error = outcome.error
+        record.updated_at = time.time()
+        with open(self.results_path, "a") as f:
+            f.write(
+                json.dumps(
+                    {
+                        "task_id": outcome.task_id,
+                        "status": outcome.status,
+                        "attempt": outcome.attempt,
+                        "duration": outcome.duration,
+                        "error": outcome.error,
+                        "timestamp": record.updated_at,
+                    }
+                )
+                + "\n"
+            )
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest, replacing the previous one atomically."""
+        directory = os.path.dirname(self.manifest_path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {
+                        "tasks": {
+                            task_id: asdict(record)
+                            for task_id, record in self.tasks.items()
+                        }
+                    },
+                    f,
+                    indent=2,
+                )
+            os.replace(tmp_path, self.manifest_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def _worker_main(run_task: TaskRunner, conn: Connection) -> None:
+    """Run the tasks sent over `conn` until it is closed."""
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        task_id, attempt = message
+        try:
+            result: TaskResult = run_task(task_id)
+            error = None
+        except Exception:
+            result = (task_id, None, 0.0)
+            error = traceback.format_exc(limit=5)
+        conn.send((task_id, attempt, result, error))
+
+
+@dataclass
+class _Worker:
+    process: BaseProcess
+    conn: Connection
+    task: Optional[Tuple[str, int]] = None
+    deadline: Optional[float] = None
+
+
+class TaskScheduler:
+    """Run benchmark tasks on a pool of worker processes.
+
+    Workers are long-lived and take the next pending task as soon as they are
+    idle, so a few slow tasks do not hold back the rest of the queue. A task
+    that runs past `task_timeout` or whose worker dies is abandoned, the worker
+    is replaced, and the task is retried like a failed one. Outcomes are
+    reported through `on_outcome` as they land.
+
+    With `parallel=1` and no timeout the tasks run in the calling process.
+
+    Args:
+        run_task (TaskRunner): Function running one task; it must be picklable for the worker processes
+        parallel (int): Number of worker processes
+        task_timeout (float, optional): Seconds an attempt may take before it is abandoned
+        max_retries (int, optional): Extra attempts for a task that did not produce an answer. Default: 0
+        on_outcome (Callable[[TaskOutcome], None], optional): Called in the calling process after every attempt
+        on_start (Callable[[str, int], None], optional): Called with the task id and attempt number when an attempt starts
+    """
+
+    # Seconds a worker gets to exit after SIGTERM before it is killed
+    TERMINATE_GRACE = 5.0
+
+    def __init__(
+        self,
+        run_task: TaskRunner,
+        parallel: int,
+        task_timeout: Optional[float] = None,
+        max_retries: int = 0,
+        on_outcome: Optional[Callable[[TaskOutcome], None]] = None,
+        on_start: Optional[Callable[[str, int], None]] = None,
+    ) -> None:
+        if parallel < 1:
+            raise ValueError("parallel must be at least 1")
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+        self._run_task = run_task
+        self._parallel = parallel
+        self._task_timeout = task_timeout
+        self._max_retries = max_retries
+        self._on_outcome = on_outcome
+        self._on_start = on_start
+
+    def run(self, task_ids: List[str]) -> Dict[str, TaskOutcome]:
+        """Run the tasks and return the final outcome of each of them.
+
+        Args:
+            task_ids (List[str]): Tasks to run
+
+        Returns:
+            Dict[str, TaskOutcome]: Final outcome per task id, in the order of `task_ids`
+        """
+        if self._parallel == 1 and self._task_timeout is None:
+            outcomes = self._run_inline(task_ids)
+        else:
+            outcomes = self._run_workers(task_ids)
+        return {task_id: outcomes[task_id] for task_id in task_ids}
+
+    def _finish(
+        self,
+        task_id: str,
+        attempt: int,
+        status: str,
+        result: Optional[TaskResult] = None,
+        error: Optional[str] = None,
+    ) -> TaskOutcome:
+        answer = result[1] if result is not None else None
+        if status == SUCCEEDED and answer is None:
+            status = FAILED
+            error = error or "No answer"
+        outcome = TaskOutcome(
+            task_id=task_id,
+            status=status,
+            attempt=attempt,
+            answer=answer,
+            duration=result[2] if result is not None else 0.0,
+            error=error,
+            final=status == SUCCEEDED or attempt > self._max_retries,
+        )
+        if self._on_outcome is not None:
+            self._on_outcome(outcome)
+        return outcome
+
+    def _run_inline(self, task_ids: List[str]) -> Dict[str, TaskOutcome]:
+        outcomes: Dict[str, TaskOutcome] = {}
+        for task_id in task_ids:
+            attempt = 0
+            while task_id not in outcomes:
+                attempt += 1
+                if self._on_start is not None:
+                    self._on_start(task_id, attempt)
+                try:
+                    outcome = self._finish(
+                        task_id, attempt, SUCCEEDED, self._run_task(task_id)
+                    )
+                except Exception:
+                    outcome = self._finish(
+                        task_id, attempt, FAILED, error=traceback.format_exc(limit=5)
+                    )
+                if outcome.final:
+                    outcomes[task_id] = outcome
+        return outcomes
+
+    def _start_worker(self) -> _Worker:
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_worker_main, args=(self._run_task, child_conn), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process=process, conn=parent_conn)
+
+    def _stop_worker(self, worker: _Worker, graceful: bool = False) -> None:
+        if graceful:
+            # An idle worker exits on its own once told to
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join(self.TERMINATE_GRACE)
+        worker.conn.close()
+        if worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join(self.TERMINATE_GRACE)
+            if worker.process.is_alive():
+                worker.process.kill()
+        worker.process.join()
+
+    def _run_workers(self, task_ids: List[str]) -> Dict[str, TaskOutcome]:
+        outcomes: Dict[str, TaskOutcome] = {}
+        pending: Deque[Tuple[str, int]] = deque((task_id, 1) for task_id in task_ids)
+        workers: List[_Worker] = []
+
+        def settle(worker: _Worker, outcome: TaskOutcome) -> None:
+            worker.task = None
+            worker.deadline = None
+            if outcome.final:
+                outcomes[outcome.task_id] = outcome
+            else:
+                # Retry after the tasks that have not been tried yet
+                pending.append((outcome.task_id, outcome.attempt + 1))
+
+        def replace(worker: _Worker) -> None:
+            self._stop_worker(worker)
+            workers[workers.index(worker)] = self._start_worker()
+
+        try:
+            for _ in range(min(self._parallel, len(task_ids))):
+                workers.append(self._start_worker())
+
+            while len(outcomes) < len(task_ids):
+                # Hand the next tasks to the idle workers
+                for worker in workers:
+                    if worker.task is None and pending:
+                        worker.task = pending.popleft()
+                        if self._task_timeout is not None:
+                            worker.deadline = time.monotonic() + self._task_timeout
+                        if self._on_start is not None:
+                            self._on_start(*worker.task)
+                        worker.conn.send(worker.task)
+
+                busy = [worker for worker in workers if worker.task is not None]
+                deadlines = [w.deadline for w in busy if w.deadline is not None]
+                timeout = (
+                    max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                )
+                ready = wait(
+                    [w.conn for w in busy] + [w.process.sentinel for w in busy],
+                    timeout,
+                )
+
+                for worker in busy:
+                    assert worker.task is not None
+                    task_id, attempt = worker.task
+                    if worker.conn in ready:
+                        try:
+                            _, _, result, error = worker.conn.recv()
+                        except (EOFError, OSError):
+                            pass
+                        else:
+                            status = SUCCEEDED if error is None else FAILED
+                            settle(
+                                worker,
+                                self._finish(task_id, attempt, status, result, error),
+                            )
+                            continue
+                    if worker.process.sentinel in ready or worker.conn in ready:
+                        error = f"Worker exited with code {worker.process.exitcode}"
+                        settle(
+                            worker,
+                            self._finish(task_id, attempt, CRASHED, error=error),
+                        )
+                        replace(worker)
+                    elif (
+                        worker.deadline is not None
+                        and time.monotonic() >= worker.deadline
+                    ):
+                        error = f"Timed out after {self._task_timeout} seconds"
+                        settle(
+                            worker,
+                            self._finish(task_id, attempt, TIMED_OUT, error=error),
+                        )
+                        replace(worker)
+        finally:
+            for worker in workers:
+                self._stop_worker(worker, graceful=worker.task is None)
+        return outcomes
@@ -1,7 +1,10 @@
 import os
 import hashlib
 import base64
-from typing import Optional, Dict, ClassVar
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, ClassVar
 from loguru import logger
 from pathlib import Path
 
@@ -18,24 +21,68 @@ MEMORY_SUBDIR = "memory_bank"
 LOG_SUBDIR = "pagelogs"
 
 
+@dataclass
+class MemoryProviderMetrics:
+    """
+    Counters and gauges of the `MemoryControllerProvider`.
+
+    Attributes:
+        resident (int): Memory controllers currently held in memory.
+        hits (int): Requests served by a resident controller.
+        loads (int): Controllers created, including reloads after eviction.
+        evictions (int): Controllers dropped because of the cap or idleness.
+        last_load_seconds (float): Time taken by the most recent load.
+        total_load_seconds (float): Time taken by all loads.
+    """
+
+    resident: int = 0
+    hits: int = 0
+    loads: int = 0
+    evictions: int = 0
+    last_load_seconds: float = 0.0
+    total_load_seconds: float = 0.0
+
+
+@dataclass
+class _ResidentController:
+    controller: MemoryController
+    last_used: float
+
+
 class MemoryControllerProvider:
-    """Singleton provider for memory controller instances"""
+    """
+    Singleton provider for memory controller instances
+
+    At most `max_resident` controllers are kept in memory, each with its memo
+    bank and page logger. The least recently used one is dropped when another
+    is needed, and controllers unused for `idle_timeout` seconds are dropped
+    on the next request. Memos are persisted by the memory bank as they are
+    added, so a dropped controller is reloaded from disk on its next request.
+    Callers should request the controller when they need it rather than keep
+    it, so that dropped controllers are freed.
+    """
 
     _instance: ClassVar[Optional["MemoryControllerProvider"]] = None
-    _memory_controllers: Dict[str, MemoryController] = {}
+    _memory_controllers: "OrderedDict[str, _ResidentController]" = OrderedDict()
+    _metrics: MemoryProviderMetrics
     _internal_workspace_root: Optional[Path] = None
     _external_workspace_root: Optional[Path] = None
     _inside_docker: bool = False
+    max_resident: int = 16
+    idle_timeout: float = 1800.0
 
     def __new__(
         cls,
         internal_workspace_root: Optional[Path] = None,
         external_workspace_root: Optional[Path] = None,
         inside_docker: bool = False,
+        max_resident: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
     ):
         if cls._instance is None:
             cls._instance = super(MemoryControllerProvider, cls).__new__(cls)
-            cls._instance._memory_controllers = {}
+            cls._instance._memory_controllers = OrderedDict()
+            cls._instance._metrics = MemoryProviderMetrics()
             cls._instance._internal_workspace_root = internal_workspace_root
             cls._instance._external_workspace_root = external_workspace_root
             cls._instance._inside_docker = inside_docker
@@ -46,6 +93,8 @@ class MemoryControllerProvider:
         internal_workspace_root: Optional[Path] = None,
         external_workspace_root: Optional[Path] = None,
         inside_docker: bool = False,
+        max_resident: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
     ):
         """
         Initialize the memory controller provider with paths
@@ -54,7 +103,13 @@ class MemoryControllerProvider:
             internal_workspace_root (Path, optional): Path to workspace root inside docker
             external_workspace_root (Path, optional): Path to workspace root on host
             inside_docker (bool, optional): Whether code is running inside Docker. Default: False
+            max_resident (int, optional): Maximum number of controllers kept in memory. Default: unchanged (16)
+            idle_timeout (float, optional): Seconds after which an unused controller is dropped. Default: unchanged (1800)
         """
+        if max_resident is not None:
+            self.max_resident = max_resident
+        if idle_timeout is not None:
+            self.idle_timeout = idle_timeout
 
         if internal_workspace_root is not None:
             self._internal_workspace_root = internal_workspace_root
@@ -152,13 +207,20 @@ class MemoryControllerProvider:
     ) -> MemoryController:
         """Get or create a memory controller for the specified user"""
         safe_key = self.get_safe_key(memory_controller_key)
+        now = time.monotonic()
+        self._evict_idle(now)
 
-        if safe_key in self._memory_controllers and not reset:
-            return self._memory_controllers[safe_key]
+        resident = self._memory_controllers.get(safe_key)
+        if resident is not None and not reset:
+            resident.last_used = now
+            self._memory_controllers.move_to_end(safe_key)
+            self._metrics.hits += 1
+            return resident.controller
 
         memory_path = self.get_path(MEMORY_SUBDIR, safe_key)
         log_path = self.get_path(LOG_SUBDIR, safe_key)
 
+        start = time.perf_counter()
         try:
             page_logger = PageLogger(config={"level": "INFO", "path": str(log_path)})
 
@@ -185,13 +247,55 @@ class MemoryControllerProvider:
                 config=memory_controller_config,
             )
 
-            self._memory_controllers[safe_key] = memory_controller
-            return memory_controller
-
         except Exception as e:
             logger.error(f"Error creating memory controller: {e}")
             raise
 
+        load_seconds = time.perf_counter() - start
+        self._metrics.loads += 1
+        self._metrics.last_load_seconds = load_seconds
+        self._metrics.total_load_seconds += load_seconds
+
+        self._memory_controllers[safe_key] = _ResidentController(
+            memory_controller, time.monotonic()
+        )
+        self._memory_controllers.move_to_end(safe_key)
+        while len(self._memory_controllers) > max(self.max_resident, 1):
+            evicted_key, _ = self._memory_controllers.popitem(last=False)
+            self._metrics.evictions += 1
+            logger.info(f"Evicted memory controller (safe key: {evicted_key})")
+
+        metrics = self.metrics()
+        logger.info(
+            f"Loaded memory controller (safe key: {safe_key}) in {load_seconds:.3f}s; "
+            f"{metrics.resident}/{self.max_resident} resident, {metrics.hits} hits, "
+            f"{metrics.loads} loads, {metrics.evictions} evictions"
+        )
+        return memory_controller
+
+    def metrics(self) -> MemoryProviderMetrics:
+        """Current provider counters and gauges"""
+        return MemoryProviderMetrics(
+            resident=len(self._memory_controllers),
+            hits=self._metrics.hits,
+            loads=self._metrics.loads,
+            evictions=self._metrics.evictions,
+            last_load_seconds=self._metrics.last_load_seconds,
+            total_load_seconds=self._metrics.total_load_seconds,
+        )
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop controllers that were not requested within the idle timeout"""
+        idle_keys = [
+            key
+            for key, resident in self._memory_controllers.items()
+            if now - resident.last_used > self.idle_timeout
+        ]
+        for key in idle_keys:
+            del self._memory_controllers[key]
+            self._metrics.evictions += 1
+            logger.info(f"Evicted idle memory controller (safe key: {key})")
+
     def close_memory_controller(self, memory_controller_key: str) -> None:
         """Close a memory controller and clean up resources"""
         safe_key = self.get_safe_key(memory_controller_key)
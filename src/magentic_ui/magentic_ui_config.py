@@ -80,6 +80,10 @@ class MagenticUIConfig(BaseModel):
         inside_docker (bool, optional): Whether to run inside a docker container. Default: True.
         browser_headless (bool, optional): Whether to run a headless browser or not. Default: False.
         browser_local (bool, optional): Whether to run a local browser (as opposed to dockerized browser). Default: False.
+        browser_pool (bool, optional): Whether a local browser leases its context from the process-wide browser pool, which keeps the browser launched by the first run for later runs. Default: False.
+        max_parallel_code_blocks (int, optional): How many independent code blocks of a coder response may execute at the same time. Default: 1.
+        memory_max_resident (int, optional): Maximum number of plan memory controllers the process keeps in memory. Default: None (keep the current limit, initially 16).
+        memory_idle_timeout (float, optional): Seconds after which an unused plan memory controller is dropped. Default: None (keep the current timeout, initially 1800).
     """
 
     model_client_configs: ModelClientConfigs = Field(default_factory=ModelClientConfigs)
@@ -111,3 +115,7 @@ class MagenticUIConfig(BaseModel):
     inside_docker: bool = True
     browser_headless: bool = False
     browser_local: bool = False
+    browser_pool: bool = False
+    max_parallel_code_blocks: int = 1
+    memory_max_resident: Optional[int] = None
+    memory_idle_timeout: Optional[float] = None
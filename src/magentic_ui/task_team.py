@@ -19,6 +19,7 @@ from .input_func import InputFuncType, make_agentchat_input_func
 from .learning.memory_provider import MemoryControllerProvider
 from .magentic_ui_config import MagenticUIConfig, ModelClientConfigs
 from .teams import GroupChat, RoundRobinGroupChat
+from .team_template_cache import TeamTemplateCache
 from .teams.orchestrator.orchestrator_config import OrchestratorConfig
 from .tools.playwright.browser import get_browser_resource_config
 from .types import RunPaths
@@ -30,6 +31,7 @@ async def get_task_team(
     input_func: Optional[InputFuncType] = None,
     *,
     paths: RunPaths,
+    template_cache: Optional[TeamTemplateCache] = None,
 ) -> GroupChat | RoundRobinGroupChat:
     """
     Creates and returns a GroupChat team with specified configuration.
@@ -37,9 +39,10 @@ async def get_task_team(
     Args:
         magentic_ui_config (MagenticUIConfig, optional): Magentic UI configuration for team. Default: None.
         paths (RunPaths): Paths for internal and external run directories.
+        template_cache (TeamTemplateCache, optional): Cache of model clients shared with other runs. Default: None (new clients for this team).
 
     Returns:
-        GroupChat | RoundRobinGroupChat: An instance of GroupChat or RoundRobinGroupChat with the specified agents and configuration.
+        GroupChat | RoundRobinGroupChat: An instance of GroupChat or RoundRobinGroupChat with the specified agents and configuration. A GroupChat is returned while its agents are still warming up, see `GroupChat.readiness`.
     """
     if magentic_ui_config is None:
         magentic_ui_config = MagenticUIConfig()
@@ -49,11 +52,13 @@ async def get_task_team(
         is_action_guard: bool = False,
     ) -> ChatCompletionClient:
         if model_client_config is None:
-            return ChatCompletionClient.load_component(
+            model_client_config = (
                 ModelClientConfigs.get_default_client_config()
                 if not is_action_guard
                 else ModelClientConfigs.get_default_action_guard_config()
             )
+        if template_cache is not None:
+            return template_cache.model_client(model_client_config)
         return ChatCompletionClient.load_component(model_client_config)
 
     if not magentic_ui_config.inside_docker:
@@ -88,6 +93,7 @@ async def get_task_team(
             magentic_ui_config.inside_docker,
             headless=magentic_ui_config.browser_headless,
             local=magentic_ui_config.browser_local,
+            use_browser_pool=magentic_ui_config.browser_pool,
         )
     )
 
@@ -186,7 +192,9 @@ async def get_task_team(
             ),
         )
     with ApprovalGuardContext.populate_context(approval_guard):
-        web_surfer = WebSurfer.from_config(websurfer_config)
+        web_surfer = WebSurfer.from_config(
+            websurfer_config, model_client=get_model_client(websurfer_model_client)
+        )
     if websurfer_loop_team:
         # simplified team of only the web surfer
         team = RoundRobinGroupChat(
@@ -203,6 +211,7 @@ async def get_task_team(
         bind_dir=paths.external_run_dir,
         model_context_token_limit=magentic_ui_config.model_context_token_limit,
         approval_guard=approval_guard,
+        max_parallel_code_blocks=magentic_ui_config.max_parallel_code_blocks,
     )
 
     file_surfer = FileSurfer(
@@ -229,6 +238,8 @@ async def get_task_team(
             internal_workspace_root=paths.internal_root_dir,
             external_workspace_root=paths.external_root_dir,
             inside_docker=magentic_ui_config.inside_docker,
+            max_resident=magentic_ui_config.memory_max_resident,
+            idle_timeout=magentic_ui_config.memory_idle_timeout,
         )
     else:
         memory_provider = None
@@ -248,5 +259,6 @@ async def get_task_team(
         memory_provider=memory_provider,
     )
 
-    await team.lazy_init()
+    # Browsers and code executors start while the orchestrator plans
+    team.start_warm_up()
     return team
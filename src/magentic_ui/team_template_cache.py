@@ -0,0 +1,364 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+import yaml
+from autogen_core import CancellationToken, ComponentModel
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from .magentic_ui_config import MagenticUIConfig
+
+
+def config_hash(config: Any) -> str:
+    """Stable hash of a JSON-like configuration.
+
+    Args:
+        config (Any): Dicts, lists, scalars and pydantic models
+
+    Returns:
+        str: The hex digest
+    """
+
+    def default(value: Any) -> Any:
+        if isinstance(value, BaseModel):
+            return value.model_dump(mode="json")
+        return str(value)
+
+    encoded = json.dumps(config, sort_keys=True, default=default)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class _SharedModelClient:
+    """A cached model client and the number of handles open on it."""
+
+    def __init__(self, client: ChatCompletionClient) -> None:
+        self.client = client
+        self.handles = 0
+        self.dropped = False
+        self._closed = False
+
+    async def release(self) -> None:
+        """Called when a handle is closed."""
+        self.handles -= 1
+        await self._close_if_unused()
+
+    async def drop(self) -> None:
+        """Called when the cache no longer hands out this client."""
+        self.dropped = True
+        await self._close_if_unused()
+
+    async def _close_if_unused(self) -> None:
+        if self.dropped and self.handles == 0 and not self._closed:
+            self._closed = True
+            await self.client.close()
+
+
+class SharedChatCompletionClient(ChatCompletionClient):
+    """
+    Per-run handle on a model client shared between runs.
+
+    Requests are delegated to the shared client, which keeps its connection
+    pool between runs. Usage is counted per handle. Closing a handle only
+    closes the shared client once the cache dropped it and no other handle
+    is open on it.
+
+    Args:
+        client (ChatCompletionClient | _SharedModelClient): The shared client,
+            or the cache's record of it to count the handle in
+    """
+
+    def __init__(self, client: Union[ChatCompletionClient, _SharedModelClient]) -> None:
+        self._shared: Optional[_SharedModelClient] = None
+        if isinstance(client, _SharedModelClient):
+            self._shared = client
+            client.handles += 1
+            client = client.client
+        self._client = client
+        self._closed = False
+        self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    def _add_usage(self, usage: RequestUsage) -> None:
+        self._total_usage = RequestUsage(
+            prompt_tokens=self._total_usage.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=self._total_usage.completion_tokens
+            + usage.completion_tokens,
+        )
+        self._actual_usage = RequestUsage(
+            prompt_tokens=self._actual_usage.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=self._actual_usage.completion_tokens
+            + usage.completion_tokens,
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        result = await self._client.create(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        self._add_usage(result.usage)
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        stream = self._client.create_stream(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        try:
+            async for chunk in stream:
+                if isinstance(chunk, CreateResult):
+                    self._add_usage(chunk.usage)
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def close(self) -> None:
+        # The shared client outlives the runs that use it
+        if self._closed:
+            return
+        self._closed = True
+        if self._shared is not None:
+            await self._shared.release()
+
+    def actual_usage(self) -> RequestUsage:
+        return self._actual_usage
+
+    def total_usage(self) -> RequestUsage:
+        return self._total_usage
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        return self._client.capabilities  # type: ignore
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._client.model_info
+
+    def dump_component(self) -> ComponentModel:
+        return self._client.dump_component()
+
+
+@dataclass
+class TeamTemplateCacheMetrics:
+    """
+    Counters and gauges of a `TeamTemplateCache`.
+
+    Attributes:
+        hits (int): Lookups served from the cache.
+        misses (int): Lookups that had to build or parse their value.
+        model_clients (int): Shared model clients currently cached.
+        templates (int): Validated configurations currently cached.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    model_clients: int = 0
+    templates: int = 0
+
+
+class TeamTemplateCache:
+    """
+    Process-wide cache of the immutable pieces needed to create a team.
+
+    Creating a team for a run used to re-parse the model configurations,
+    re-validate the `MagenticUIConfig` and construct every model client from
+    scratch. This cache keeps, keyed by a hash of their configuration:
+
+    - parsed YAML model configurations,
+    - validated `MagenticUIConfig` templates, copied for each run,
+    - model clients, handed out as `SharedChatCompletionClient` handles so
+      that runs share their connection pools but not their usage counters.
+
+    Agents, browsers, code executors and workbenches hold per-run state and
+    are still created for every run. Each kind of entry is bounded to
+    `max_entries`, dropping the least recently used one.
+
+    Args:
+        max_entries (int, optional): Maximum entries of each kind. Default: 32.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self._max_entries = max_entries
+        self._model_configs: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._templates: OrderedDict[str, MagenticUIConfig] = OrderedDict()
+        self._model_clients: OrderedDict[str, _SharedModelClient] = OrderedDict()
+        self._metrics = TeamTemplateCacheMetrics()
+        self._closing: Set["asyncio.Task[None]"] = set()
+
+    def _get(self, entries: "OrderedDict[str, Any]", key: str) -> Any:
+        value = entries.get(key)
+        if value is None:
+            self._metrics.misses += 1
+        else:
+            self._metrics.hits += 1
+            entries.move_to_end(key)
+        return value
+
+    def _put(self, entries: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+        entries[key] = value
+        while len(entries) > self._max_entries:
+            _, evicted = entries.popitem(last=False)
+            if isinstance(evicted, _SharedModelClient):
+                self._drop(evicted)
+
+    def _drop(self, shared: _SharedModelClient) -> None:
+        """Close a dropped model client in the background once it is unused."""
+        try:
+            task = asyncio.get_running_loop().create_task(shared.drop())
+        except RuntimeError:
+            # No event loop to close it on, the last handle closes it
+            shared.dropped = True
+            return
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def parse_model_configs(self, model_configs: str) -> Dict[str, Any]:
+        """Parse the YAML model configurations of the settings.
+
+        Args:
+            model_configs (str): The YAML document
+
+        Returns:
+            Dict[str, Any]: The parsed configurations, not to be modified
+        """
+        key = config_hash(model_configs)
+        parsed = self._get(self._model_configs, key)
+        if parsed is None:
+            parsed = yaml.safe_load(model_configs) or {}
+            self._put(self._model_configs, key, parsed)
+        return parsed
+
+    def magentic_ui_config(
+        self, config: Dict[str, Any], **run_values: Any
+    ) -> MagenticUIConfig:
+        """Validate a configuration once and return a copy for one run.
+
+        Args:
+            config (Dict[str, Any]): The configuration shared by many runs
+            **run_values (Any): Per-run fields set on the copy, e.g. ports
+
+        Returns:
+            MagenticUIConfig: A configuration owned by the caller
+        """
+        key = config_hash(config)
+        template = self._get(self._templates, key)
+        if template is None:
+            template = MagenticUIConfig(**config)
+            self._put(self._templates, key, template)
+        return template.model_copy(update=run_values, deep=True)
+
+    def model_client(
+        self, config: Union[ComponentModel, Dict[str, Any]]
+    ) -> ChatCompletionClient:
+        """Get a handle on the shared model client of a configuration.
+
+        Args:
+            config (ComponentModel | Dict[str, Any]): The model client configuration
+
+        Returns:
+            ChatCompletionClient: A handle owned by the caller
+        """
+        key = config_hash(config)
+        shared = self._get(self._model_clients, key)
+        if shared is None:
+            shared = _SharedModelClient(ChatCompletionClient.load_component(config))
+            self._put(self._model_clients, key, shared)
+        return SharedChatCompletionClient(shared)
+
+    def metrics(self) -> TeamTemplateCacheMetrics:
+        """Current cache counters and gauges"""
+        return TeamTemplateCacheMetrics(
+            hits=self._metrics.hits,
+            misses=self._metrics.misses,
+            model_clients=len(self._model_clients),
+            templates=len(self._templates),
+        )
+
+    def clear(self) -> None:
+        """Drop all cached entries. Handles already handed out keep working.
+
+        Dropped model clients are closed once their last handle is closed.
+        """
+        self._model_configs.clear()
+        self._templates.clear()
+        for shared in self._model_clients.values():
+            self._drop(shared)
+        self._model_clients.clear()
+
+    async def close(self) -> None:
+        """Drop all cached entries and close the model clients that are unused.
+
+        Model clients with open handles are closed with their last handle.
+        """
+        shared_clients = list(self._model_clients.values())
+        self._model_configs.clear()
+        self._templates.clear()
+        self._model_clients.clear()
+        await asyncio.gather(
+            *(shared.drop() for shared in shared_clients),
+            *self._closing,
+            return_exceptions=True,
+        )
+
+
+_team_template_cache: Optional[TeamTemplateCache] = None
+
+
+def get_team_template_cache() -> TeamTemplateCache:
+    """Return the process-wide `TeamTemplateCache`, creating it on first use."""
+    global _team_template_cache
+    if _team_template_cache is None:
+        _team_template_cache = TeamTemplateCache()
+    return _team_template_cache
@@ -0,0 +1,140 @@
+from typing import Dict, List, Sequence, Tuple
+
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+from autogen_agentchat.utils import remove_images
+from autogen_core.models import (
+    ChatCompletionClient,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+)
+
+from ...utils import message_to_context
+
+
+class IncrementalContext:
+    """
+    Builds the Orchestrator's model context without redoing per-message work.
+
+    The Orchestrator rebuilds its context from the whole message thread every
+    round and again on every JSON retry. Converting a chat message and
+    counting its tokens only depends on the message itself, so both are
+    cached per message object: a round only converts and counts the messages
+    added since the previous one, plus the few prompt messages created for the
+    request. Entries of messages that left the thread are pruned once they
+    outnumber the live ones, so dropped messages are released.
+
+    Token limiting follows `TokenLimitedChatCompletionContext`: messages are
+    dropped from the middle until the context fits. The total is the sum of
+    the cached per-message counts, corrected for the fixed overhead the client
+    adds once per request.
+
+    Args:
+        model_client (ChatCompletionClient): The client whose token counting is used
+        agent_name (str): Name of the agent whose own messages become assistant messages
+        is_multimodal (bool): Whether images are kept in the context
+        token_limit (int, optional): Maximum tokens of a request. Default: the model's limit.
+    """
+
+    # Cached entries beyond twice the current messages that trigger pruning
+    PRUNE_SLACK = 32
+
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        agent_name: str,
+        is_multimodal: bool,
+        token_limit: int | None = None,
+    ) -> None:
+        self._model_client = model_client
+        self._agent_name = agent_name
+        self._is_multimodal = is_multimodal
+        self._token_limit = token_limit
+        self._request_overhead: int | None = None
+        # Keyed by id(); the object is kept alongside so that the id stays valid
+        self._conversions: Dict[
+            int, Tuple[BaseChatMessage | BaseAgentEvent, List[LLMMessage]]
+        ] = {}
+        self._token_counts: Dict[int, Tuple[LLMMessage, int]] = {}
+
+    def thread_to_context(
+        self, messages: Sequence[BaseChatMessage | BaseAgentEvent]
+    ) -> List[LLMMessage]:
+        """Convert the message thread to a context for the model.
+
+        Same result as `magentic_ui.utils.thread_to_context`, but messages that
+        were converted in an earlier call are not converted again.
+
+        Args:
+            messages (Sequence[BaseChatMessage | BaseAgentEvent]): The message thread
+
+        Returns:
+            List[LLMMessage]: The model messages
+        """
+        conversions = self._conversions
+        context: List[LLMMessage] = []
+        for message in messages:
+            cached = conversions.get(id(message))
+            if cached is None or cached[0] is not message:
+                converted = message_to_context(message, self._agent_name)
+                if not self._is_multimodal:
+                    converted = remove_images(converted)
+                cached = (message, converted)
+                conversions[id(message)] = cached
+            context.extend(cached[1])
+        if len(conversions) > 2 * len(messages) + self.PRUNE_SLACK:
+            self._conversions = {id(m): conversions[id(m)] for m in messages}
+        return context
+
+    def fit(self, messages: Sequence[LLMMessage]) -> List[LLMMessage]:
+        """Drop messages from the middle until the context fits the token limit.
+
+        Args:
+            messages (Sequence[LLMMessage]): The context
+
+        Returns:
+            List[LLMMessage]: The messages to send
+        """
+        limit = self._get_token_limit()
+        token_counts = self._token_counts
+        counted: List[Tuple[LLMMessage, int]] = []
+        for message in messages:
+            cached = token_counts.get(id(message))
+            if cached is None or cached[0] is not message:
+                cached = (message, self._count_tokens(message))
+                token_counts[id(message)] = cached
+            counted.append(cached)
+        if len(token_counts) > 2 * len(messages) + self.PRUNE_SLACK:
+            self._token_counts = {id(m): token_counts[id(m)] for m in messages}
+
+        if limit is not None:
+            total = self._overhead() + sum(count for _, count in counted)
+            while total > limit and counted:
+                _, count = counted.pop(len(counted) // 2)
+                total -= count
+        fitted = [message for message, _ in counted]
+        if fitted and isinstance(fitted[0], FunctionExecutionResultMessage):
+            fitted = fitted[1:]
+        return fitted
+
+    def clear(self) -> None:
+        """Drop all cached conversions and token counts."""
+        self._conversions = {}
+        self._token_counts = {}
+
+    def _overhead(self) -> int:
+        # Tokens the client adds once per request, e.g. reply priming
+        if self._request_overhead is None:
+            self._request_overhead = self._model_client.count_tokens([])
+        return self._request_overhead
+
+    def _count_tokens(self, message: LLMMessage) -> int:
+        return self._model_client.count_tokens([message]) - self._overhead()
+
+    def _get_token_limit(self) -> int | None:
+        if self._token_limit is not None:
+            return self._token_limit
+        try:
+            # remaining_tokens(messages) is the model's limit minus count_tokens(messages)
+            return self._model_client.remaining_tokens([]) + self._overhead()
+        except Exception:
+            return None
@@ -2,6 +2,8 @@ import logging
 from typing import Callable, List, Dict, Any, Mapping, AsyncGenerator, Sequence
 import json
 import asyncio
+import time
+from dataclasses import dataclass
 from pydantic import BaseModel
 import inspect
 
@@ -35,6 +37,22 @@ class GroupChatConfig(BaseModel):
     termination_condition: ComponentModel | None = None
 
 
+@dataclass
+class AgentReadiness:
+    """
+    Warm-up progress of one participant.
+
+    Attributes:
+        status (str): "pending", "ready" or "failed".
+        seconds (float, optional): Time the warm-up took, once finished. Default: None
+        error (str, optional): Why the warm-up failed. Default: None
+    """
+
+    status: str = "pending"
+    seconds: float | None = None
+    error: str | None = None
+
+
 class GroupChatState(BaseState):
     agent_states: Dict[str, Any]
     orchestrater_state: Any
@@ -80,6 +98,9 @@ class GroupChat(BaseGroupChat, Component[GroupChatConfig]):
         self.is_paused = False
         self._message_factory = MessageFactory()
         self._memory_provider = memory_provider
+        self._warm_up_tasks: Dict[str, asyncio.Task[None]] = {}
+        self._readiness: Dict[str, AgentReadiness] = {}
+        self._warm_up_errors: Dict[str, Exception] = {}
 
     def _create_group_chat_manager_factory(
         self,
@@ -155,16 +176,92 @@ class GroupChat(BaseGroupChat, Component[GroupChatConfig]):
             if hasattr(agent, "resume"):
                 await agent.resume()  # type: ignore
 
-    async def lazy_init(self) -> None:
-        await asyncio.gather(
-            *(
-                getattr(agent, "lazy_init")()
-                for agent in self._participants
-                if hasattr(agent, "lazy_init")
-                and inspect.iscoroutinefunction(getattr(agent, "lazy_init"))
-            )
+    def start_warm_up(self) -> None:
+        """Start initializing every participant's resources in the background.
+
+        Browsers, code executors and file browsers of all participants start
+        concurrently while the orchestrator plans. A participant that is
+        addressed before its warm-up finished waits for it in its own
+        `lazy_init`. Calling this again has no effect.
+        """
+        for agent in self._participants:
+            lazy_init = getattr(agent, "lazy_init", None)
+            if (
+                agent.name in self._warm_up_tasks
+                or lazy_init is None
+                or not inspect.iscoroutinefunction(lazy_init)
+            ):
+                continue
+            self._start_participant_warm_up(agent.name, lazy_init)
+
+    def _start_participant_warm_up(
+        self, name: str, lazy_init: Callable[[], Any]
+    ) -> None:
+        self._warm_up_errors.pop(name, None)
+        self._readiness[name] = AgentReadiness()
+        self._warm_up_tasks[name] = asyncio.create_task(self._warm_up(name, lazy_init))
+
+    async def _warm_up(self, name: str, lazy_init: Callable[[], Any]) -> None:
+        start = time.perf_counter()
+        readiness = self._readiness[name]
+        try:
+            await lazy_init()
+        except Exception as e:
+            # Left to the participant's own lazy_init to raise on first use
+            readiness.status, readiness.error = "failed", str(e)
+            self._warm_up_errors[name] = e
+            trace_logger.warning(f"Warm-up of {name} failed: {e}")
+        else:
+            readiness.status = "ready"
+        finally:
+            readiness.seconds = time.perf_counter() - start
+        trace_logger.info(
+            f"Warm-up of {name} finished in {readiness.seconds:.2f}s: {readiness.status}"
         )
 
+    def readiness(self) -> Dict[str, AgentReadiness]:
+        """
+        Get the warm-up progress of the participants that have resources to start.
+
+        Returns:
+            Dict[str, AgentReadiness]: Progress by participant name.
+        """
+        return {
+            name: AgentReadiness(**vars(readiness))
+            for name, readiness in self._readiness.items()
+        }
+
+    async def wait_until_ready(self, *names: str) -> None:
+        """Wait for the warm-up of the given participants, or of all of them.
+
+        Args:
+            *names (str): Participant names. Default: all participants
+        """
+        tasks = [
+            task
+            for name, task in self._warm_up_tasks.items()
+            if not names or name in names
+        ]
+        await asyncio.gather(*tasks)
+
+    async def lazy_init(self) -> None:
+        """Initialize every participant's resources concurrently and wait for them.
+
+        Participants whose warm-up failed are initialized again, and the
+        error of the first one that still fails is raised.
+        """
+        self.start_warm_up()
+        await self.wait_until_ready()
+        # Retry failed warm-ups, the participant may have started since on first use
+        failed = [
+            agent for agent in self._participants if agent.name in self._warm_up_errors
+        ]
+        for agent in failed:
+            self._start_participant_warm_up(agent.name, agent.lazy_init)  # type: ignore
+        await self.wait_until_ready(*(agent.name for agent in failed))
+        for error in self._warm_up_errors.values():
+            raise error
+
     def _to_config(self) -> GroupChatConfig:
         return GroupChatConfig(
             participants=[agent.dump_component() for agent in self._participants],
@@ -216,6 +313,8 @@ class GroupChat(BaseGroupChat, Component[GroupChatConfig]):
             self._is_running = False
 
     async def close(self) -> None:
+        # Let warm-ups finish so that the resources they started are released
+        await self.wait_until_ready()
         if hasattr(self._model_client, "close"):
             await self._model_client.close()
 
@@ -1,6 +1,6 @@
 import json
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Mapping, Callable
+from typing import Any, Awaitable, Dict, List, Optional, Mapping, Callable, Tuple
 import io
 import PIL.Image
 from autogen_core import Image as AGImage
@@ -15,11 +15,11 @@ from autogen_core import (
 )
 from autogen_core.models import (
     ChatCompletionClient,
+    CreateResult,
     LLMMessage,
     SystemMessage,
     UserMessage,
 )
-from autogen_core.model_context import TokenLimitedChatCompletionContext
 from autogen_agentchat.base import Response, TerminationCondition
 from autogen_agentchat.messages import (
     BaseChatMessage,
@@ -40,10 +40,11 @@ from autogen_agentchat.teams._group_chat._base_group_chat_manager import (
     BaseGroupChatManager,
 )
 from autogen_agentchat.state import BaseGroupChatManagerState
+from autogen_ext.experimental.task_centric_memory import MemoryController
 from ...learning.memory_provider import MemoryControllerProvider
 
 from ...types import HumanInputFormat, Plan
-from ...utils import dict_to_str, thread_to_context
+from ...utils import dict_to_str
 from ...tools.bing_search import get_bing_search_results
 from ...teams.orchestrator.orchestrator_config import OrchestratorConfig
 from ._prompts import (
@@ -56,10 +57,18 @@ from ._prompts import (
     ORCHESTRATOR_PLAN_PROMPT_JSON,
     ORCHESTRATOR_PLAN_REPLAN_JSON,
     INSTRUCTION_AGENT_FORMAT,
+    validate_ledger_field,
     validate_ledger_json,
+    validate_plan_field,
     validate_plan_json,
 )
-from ._utils import is_accepted_str, extract_json_from_string
+from ._context import IncrementalContext
+from ._utils import (
+    IncrementalJsonParser,
+    JsonStreamError,
+    is_accepted_str,
+    extract_json_from_string,
+)
 from loguru import logger as trace_logger
 
 
@@ -147,8 +156,11 @@ class Orchestrator(BaseGroupChatManager):
             message_factory=message_factory,
         )
         self._model_client: ChatCompletionClient = model_client
-        self._model_context = TokenLimitedChatCompletionContext(
-            model_client, token_limit=config.model_context_token_limit
+        self._model_context = IncrementalContext(
+            model_client,
+            agent_name=self._name,
+            is_multimodal=model_client.model_info["vision"],
+            token_limit=config.model_context_token_limit,
         )
         self._config: OrchestratorConfig = config
         self._user_agent_topic = "user_proxy"
@@ -162,19 +174,17 @@ class Orchestrator(BaseGroupChatManager):
                     f"User agent topic {self._user_agent_topic} not in participant names {self._participant_names}"
                 )
 
-        self._memory_controller = None
         self._memory_provider = memory_provider
+        # The provider may drop idle controllers, so it is asked again on each use
+        self._memory_enabled = False
         if (
             self._config.memory_controller_key
             and self._model_client
             and self._memory_provider is not None
         ):
             try:
-                provider = self._memory_provider
-                self._memory_controller = provider.get_memory_controller(
-                    memory_controller_key=self._config.memory_controller_key,
-                    client=self._model_client,
-                )
+                self._get_memory_controller()
+                self._memory_enabled = True
                 trace_logger.info("Memory controller initialized successfully.")
             except Exception as e:
                 trace_logger.warning(f"Failed to initialize memory controller: {e}")
@@ -310,6 +320,12 @@ class Orchestrator(BaseGroupChatManager):
     def _validate_plan_json(self, json_response: Dict[str, Any]) -> bool:
         return validate_plan_json(json_response)
 
+    def _validate_ledger_field(self, key: str, value: Any) -> bool:
+        return validate_ledger_field(key, value, self._agent_execution_names)
+
+    def _validate_plan_field(self, key: str, value: Any) -> bool:
+        return validate_plan_field(key, value)
+
     async def validate_group_state(
         self, messages: List[BaseChatMessage] | None
     ) -> None:
@@ -388,42 +404,126 @@ class Orchestrator(BaseGroupChatManager):
             cancellation_token=cancellation_token,
         )
 
+    async def _stream_json_response(
+        self,
+        messages: List[LLMMessage],
+        validate_field: Callable[[str, Any], bool] | None,
+        on_fields: Callable[[Dict[str, Any]], Awaitable[bool]] | None,
+        cancellation_token: CancellationToken,
+    ) -> Tuple[str, Dict[str, Any], bool, str, bool]:
+        """Stream a JSON response, checking every top-level field as it completes.
+
+        Args:
+            messages (List[LLMMessage]): The messages to send to the model client.
+            validate_field (callable, optional): Checks a completed field; the response is aborted as soon as it returns False.
+            on_fields (callable, optional): Called with the fields parsed so far whenever one completes; returns True once the caller acted on the response.
+            cancellation_token (CancellationToken): A token to cancel the request if needed.
+
+        Returns:
+            Tuple containing:
+                - str: The response text received
+                - Dict[str, Any]: The top-level fields parsed
+                - bool: Whether the fields form a complete object
+                - str: Why the response was aborted, or "" if it was not
+                - bool: Whether on_fields acted on the response
+        """
+        parser = IncrementalJsonParser()
+        chunks: List[str] = []
+        committed = False
+        stream = self._model_client.create_stream(
+            messages,
+            json_output=True if self._model_client.model_info["json_output"] else False,
+            cancellation_token=cancellation_token,
+        )
+        try:
+            async for chunk in stream:
+                if isinstance(chunk, CreateResult):
+                    assert isinstance(chunk.content, str)
+                    chunks = [chunk.content]
+                    break
+                chunks.append(chunk)
+                try:
+                    completed = parser.feed(chunk)
+                except JsonStreamError as e:
+                    return (
+                        "".join(chunks),
+                        parser.fields,
+                        False,
+                        f"Failed to parse JSON response, retrying. You must return a valid JSON object parsed from the response. Error: {e}",
+                        committed,
+                    )
+                for key, value in completed:
+                    if validate_field is not None and not validate_field(key, value):
+                        return (
+                            "".join(chunks),
+                            parser.fields,
+                            False,
+                            f"Validation failed for the {key} field of the JSON response, retrying. You must return a valid JSON object parsed from the response.",
+                            committed,
+                        )
+                if completed and on_fields is not None and not committed:
+                    committed = await on_fields(dict(parser.fields))
+        finally:
+            # Stops the generation when the response is aborted early
+            await stream.aclose()
+        return "".join(chunks), parser.fields, parser.done, "", committed
+
     async def _get_json_response(
         self,
         messages: List[LLMMessage],
         validate_json: Callable[[Dict[str, Any]], bool],
         cancellation_token: CancellationToken,
+        validate_field: Callable[[str, Any], bool] | None = None,
+        on_fields: Callable[[Dict[str, Any]], Awaitable[bool]] | None = None,
     ) -> Dict[str, Any] | None:
         """Get a JSON response from the model client.
+
+        The response is streamed and parsed as it arrives, so that a malformed
+        or invalid field aborts the request right away instead of after the
+        whole completion.
+
         Args:
             messages (List[LLMMessage]): The messages to send to the model client.
             validate_json (callable): A function to validate the JSON response. The function should return True if the JSON response is valid, otherwise False.
             cancellation_token (CancellationToken): A token to cancel the request if needed.
+            validate_field (callable, optional): A function to validate a top-level field of the JSON response as soon as it is complete.
+            on_fields (callable, optional): Called with the fields parsed so far whenever one completes. Once it returns True the response is no longer retried and the fields received are returned even if the rest of the response is invalid.
         """
         retries = 0
         exception_message = ""
         try:
             while retries < self._config.max_json_retries:
-                # Re-initialize model context to meet token limit quota
-                await self._model_context.clear()
-                for msg in messages:
-                    await self._model_context.add_message(msg)
+                # Fit the messages to the token limit quota, reusing the
+                # token counts of earlier rounds and retries
+                request_messages = list(messages)
                 if exception_message != "":
-                    await self._model_context.add_message(
+                    request_messages.append(
                         UserMessage(content=exception_message, source=self._name)
                     )
-                token_limited_messages = await self._model_context.get_messages()
-
-                response = await self._model_client.create(
+                token_limited_messages = self._model_context.fit(request_messages)
+
+                (
+                    response_text,
+                    fields,
+                    complete,
+                    exception_message,
+                    committed,
+                ) = await self._stream_json_response(
                     token_limited_messages,
-                    json_output=True
-                    if self._model_client.model_info["json_output"]
-                    else False,
-                    cancellation_token=cancellation_token,
+                    validate_field,
+                    on_fields,
+                    cancellation_token,
                 )
-                assert isinstance(response.content, str)
+                if committed:
+                    return fields
+                if exception_message != "":
+                    await self._log_message(
+                        f"Aborted JSON response early, retrying ({retries}/{self._config.max_json_retries}): {exception_message}"
+                    )
+                    retries += 1
+                    continue
                 try:
-                    json_response = json.loads(response.content)
+                    json_response = fields if complete else json.loads(response_text)
                     # Use the validate_json function to check the response
                     if validate_json(json_response):
                         return json_response
@@ -433,7 +533,7 @@ class Orchestrator(BaseGroupChatManager):
                             f"Validation failed for JSON response, retrying ({retries}/{self._config.max_json_retries})"
                         )
                 except json.JSONDecodeError as e:
-                    json_response = extract_json_from_string(response.content)
+                    json_response = extract_json_from_string(response_text)
                     if json_response is not None:
                         if validate_json(json_response):
                             return json_response
@@ -615,6 +715,15 @@ class Orchestrator(BaseGroupChatManager):
             trace_logger.exception(f"Error in getting web surfer screenshot: {e}")
             pass
 
+    def _get_memory_controller(self) -> MemoryController:
+        """Get the memory controller of this run from the memory provider."""
+        assert self._memory_provider is not None
+        assert self._config.memory_controller_key is not None
+        return self._memory_provider.get_memory_controller(
+            memory_controller_key=self._config.memory_controller_key,
+            client=self._model_client,
+        )
+
     async def _handle_relevant_plan_from_memory(
         self,
         context: Optional[List[LLMMessage]] = None,
@@ -625,16 +734,17 @@ class Orchestrator(BaseGroupChatManager):
             For 'reuse', returns the most relevant plan (or None).
             For 'hint', appends a relevant plan as a UserMessage to the context if found.
         """
-        if not self._memory_controller:
+        if not self._memory_enabled:
             return None
         try:
+            memory_controller = self._get_memory_controller()
             mode = self._config.retrieve_relevant_plans
             task = self._state.task
             source = self._name
             trace_logger.info(
                 f"retrieving relevant plan from memory for mode: {mode} ..."
             )
-            memos = await self._memory_controller.retrieve_relevant_memos(task=task)
+            memos = await memory_controller.retrieve_relevant_memos(task=task)
             trace_logger.info(f"{len(memos)} relevant plan(s) retrieved from memory")
             if len(memos) > 0:
                 most_relevant_plan = memos[0].insight
@@ -758,7 +868,10 @@ class Orchestrator(BaseGroupChatManager):
                 )
             )
             plan_response = await self._get_json_response(
-                context, self._validate_plan_json, cancellation_token
+                context,
+                self._validate_plan_json,
+                cancellation_token,
+                validate_field=self._validate_plan_field,
             )
             if self._state.is_paused:
                 # let user speak next if paused
@@ -820,7 +933,10 @@ class Orchestrator(BaseGroupChatManager):
                     )
                 )
                 plan_response = await self._get_json_response(
-                    context, self._validate_plan_json, cancellation_token
+                    context,
+                    self._validate_plan_json,
+                    cancellation_token,
+                    validate_field=self._validate_plan_field,
                 )
                 if self._state.is_paused:
                     # let user speak next if paused
@@ -917,10 +1033,25 @@ class Orchestrator(BaseGroupChatManager):
         )
         context.append(UserMessage(content=progress_ledger_prompt, source=self._name))
 
+        dispatched = False
+
+        async def dispatch_early(fields: Dict[str, Any]) -> bool:
+            nonlocal dispatched
+            if not self._can_dispatch_early(fields, first_step=True):
+                return False
+            await self._broadcast_instruction(fields, cancellation_token)
+            await self._request_step(fields, cancellation_token)
+            dispatched = True
+            return True
+
         progress_ledger = await self._get_json_response(
-            context, self._validate_ledger_json, cancellation_token
+            context,
+            self._validate_ledger_json,
+            cancellation_token,
+            validate_field=self._validate_ledger_field,
+            on_fields=dispatch_early if self._config.early_dispatch else None,
         )
-        if self._state.is_paused:
+        if self._state.is_paused and not dispatched:
             # let user speak next if paused
             await self._request_next_speaker(self._user_agent_topic, cancellation_token)
             return
@@ -929,11 +1060,46 @@ class Orchestrator(BaseGroupChatManager):
         await self._log_message_agentchat(dict_to_str(progress_ledger), internal=True)
 
         # Broadcast the next step
+        if not dispatched:
+            await self._broadcast_instruction(progress_ledger, cancellation_token)
+        await self._log_step_execution(progress_ledger)
+        # Request that the step be completed
+        if not dispatched:
+            await self._request_step(progress_ledger, cancellation_token)
+
+    def _can_dispatch_early(self, fields: Dict[str, Any], first_step: bool) -> bool:
+        """Whether the ledger streamed so far already determines the next speaker.
+
+        Args:
+            fields (Dict[str, Any]): The fields of the progress ledger received so far
+            first_step (bool): Whether this is the ledger of the first step, which ignores step completion and replanning
+        """
+        if self._state.is_paused or "instruction_or_question" not in fields:
+            return False
+        # The no-action agent makes the Orchestrator run the next round itself
+        if fields["instruction_or_question"]["agent_name"] == "no_action_agent":
+            return False
+        if first_step:
+            return True
+        if "need_to_replan" not in fields or "is_current_step_complete" not in fields:
+            return False
+        if fields["need_to_replan"]["answer"]:
+            return False
+        # Completing the last step leads to the final answer instead
+        assert self._state.plan is not None
+        return not (
+            fields["is_current_step_complete"]["answer"]
+            and self._state.current_step_idx + 1 >= len(self._state.plan)
+        )
+
+    async def _broadcast_instruction(
+        self, progress_ledger: Dict[str, Any], cancellation_token: CancellationToken
+    ) -> None:
+        """Add the instruction of the progress ledger to the thread and send it to the team."""
         new_instruction = self.get_agent_instruction(
             progress_ledger["instruction_or_question"]["answer"],
             progress_ledger["instruction_or_question"]["agent_name"],
         )
-
         message_to_send = TextMessage(
             content=new_instruction, source=self._name, metadata={"internal": "yes"}
         )
@@ -942,20 +1108,28 @@ class Orchestrator(BaseGroupChatManager):
         await self._publish_group_chat_message(
             message_to_send.content, cancellation_token, internal=True
         )
+
+    async def _log_step_execution(self, progress_ledger: Dict[str, Any]) -> None:
+        """Show the current step and its instruction in the UI."""
+        assert self._state.plan is not None
         json_step_execution = {
             "title": self._state.plan[self._state.current_step_idx].title,
             "index": self._state.current_step_idx,
             "details": self._state.plan[self._state.current_step_idx].details,
             "agent_name": progress_ledger["instruction_or_question"]["agent_name"],
             "instruction": progress_ledger["instruction_or_question"]["answer"],
-            "progress_summary": progress_ledger["progress_summary"],
+            "progress_summary": progress_ledger.get("progress_summary", ""),
             "plan_length": len(self._state.plan),
         }
         await self._log_message_agentchat(
             json.dumps(json_step_execution),
             metadata={"internal": "no", "type": "step_execution"},
         )
-        # Request that the step be completed
+
+    async def _request_step(
+        self, progress_ledger: Dict[str, Any], cancellation_token: CancellationToken
+    ) -> None:
+        """Request that the agent named in the progress ledger completes the step."""
         valid_next_speaker: bool = False
         next_speaker = progress_ledger["instruction_or_question"]["agent_name"]
         for participant_name in self._agent_execution_names:
@@ -995,16 +1169,45 @@ class Orchestrator(BaseGroupChatManager):
 
         context.append(UserMessage(content=progress_ledger_prompt, source=self._name))
 
+        dispatched = False
+
+        async def dispatch_early(fields: Dict[str, Any]) -> bool:
+            nonlocal dispatched
+            if not self._can_dispatch_early(fields, first_step=False):
+                return False
+            # The instruction is sent under the header of the step it belongs to
+            if fields["is_current_step_complete"]["answer"]:
+                self._state.current_step_idx += 1
+            await self._broadcast_instruction(fields, cancellation_token)
+            await self._request_step(fields, cancellation_token)
+            dispatched = True
+            return True
+
         progress_ledger = await self._get_json_response(
-            context, self._validate_ledger_json, cancellation_token
+            context,
+            self._validate_ledger_json,
+            cancellation_token,
+            validate_field=self._validate_ledger_field,
+            on_fields=dispatch_early if self._config.early_dispatch else None,
         )
-        if self._state.is_paused:
+        if self._state.is_paused and not dispatched:
             await self._request_next_speaker(self._user_agent_topic, cancellation_token)
             return
         assert progress_ledger is not None
         # log the progress ledger
         await self._log_message_agentchat(dict_to_str(progress_ledger), internal=True)
 
+        if dispatched:
+            # The next speaker is already working on the step, which
+            # dispatch_early advanced to; only the progress that the rest of
+            # the ledger reported is left to record
+            if progress_ledger.get("progress_summary", "") != "":
+                self._state.information_collected += (
+                    "\n" + progress_ledger["progress_summary"]
+                )
+            await self._log_step_execution(progress_ledger)
+            return
+
         # Check for replans
         need_to_replan = progress_ledger["need_to_replan"]["answer"]
         replan_reason = progress_ledger["need_to_replan"]["reason"]
@@ -1045,44 +1248,11 @@ class Orchestrator(BaseGroupChatManager):
             return
 
         # Broadcast the next step
-        new_instruction = self.get_agent_instruction(
-            progress_ledger["instruction_or_question"]["answer"],
-            progress_ledger["instruction_or_question"]["agent_name"],
-        )
-        message_to_send = TextMessage(
-            content=new_instruction, source=self._name, metadata={"internal": "yes"}
-        )
-        self._state.message_history.append(message_to_send)  # My copy
-
-        await self._publish_group_chat_message(
-            message_to_send.content, cancellation_token, internal=True
-        )
-        json_step_execution = {
-            "title": self._state.plan[self._state.current_step_idx].title,
-            "index": self._state.current_step_idx,
-            "details": self._state.plan[self._state.current_step_idx].details,
-            "agent_name": progress_ledger["instruction_or_question"]["agent_name"],
-            "instruction": progress_ledger["instruction_or_question"]["answer"],
-            "progress_summary": progress_ledger["progress_summary"],
-            "plan_length": len(self._state.plan),
-        }
-        await self._log_message_agentchat(
-            json.dumps(json_step_execution),
-            metadata={"internal": "no", "type": "step_execution"},
-        )
+        await self._broadcast_instruction(progress_ledger, cancellation_token)
+        await self._log_step_execution(progress_ledger)
 
         # Request that the step be completed
-        valid_next_speaker: bool = False
-        next_speaker = progress_ledger["instruction_or_question"]["agent_name"]
-        for participant_name in self._agent_execution_names:
-            if participant_name == next_speaker:
-                await self._request_next_speaker(next_speaker, cancellation_token)
-                valid_next_speaker = True
-                break
-        if not valid_next_speaker:
-            raise ValueError(
-                f"Invalid next speaker: {next_speaker} from the ledger, participants are: {self._agent_execution_names}"
-            )
+        await self._request_step(progress_ledger, cancellation_token)
 
     async def _replan(self, reason: str, cancellation_token: CancellationToken) -> None:
         # Let's create a new plan
@@ -1116,7 +1286,10 @@ class Orchestrator(BaseGroupChatManager):
             )
         )
         plan_response = await self._get_json_response(
-            context, self._validate_plan_json, cancellation_token
+            context,
+            self._validate_plan_json,
+            cancellation_token,
+            validate_field=self._validate_plan_field,
         )
         assert plan_response is not None
 
@@ -1178,11 +1351,8 @@ class Orchestrator(BaseGroupChatManager):
                 )
             )
 
-            # Re-initialize model context to meet token limit quota
-            await self._model_context.clear()
-            for msg in context:
-                await self._model_context.add_message(msg)
-            token_limited_context = await self._model_context.get_messages()
+            # Fit the context to the token limit quota
+            token_limited_context = self._model_context.fit(context)
 
             response = await self._model_client.create(
                 token_limited_context, cancellation_token=cancellation_token
@@ -1236,18 +1406,8 @@ class Orchestrator(BaseGroupChatManager):
                     )
                 )
             )
-        if self._model_client.model_info["vision"]:
-            context_messages.extend(
-                thread_to_context(
-                    messages=chat_messages, agent_name=self._name, is_multimodal=True
-                )
-            )
-        else:
-            context_messages.extend(
-                thread_to_context(
-                    messages=chat_messages, agent_name=self._name, is_multimodal=False
-                )
-            )
+        # Only messages added since the previous round are converted
+        context_messages.extend(self._model_context.thread_to_context(chat_messages))
         return context_messages
 
     async def save_state(self) -> Mapping[str, Any]:
@@ -1294,3 +1454,4 @@ class Orchestrator(BaseGroupChatManager):
 
         # Update the state
         self._state = new_state
+        self._model_context.clear()
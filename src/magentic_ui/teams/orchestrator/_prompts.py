@@ -443,3 +443,31 @@ def validate_plan_json(json_response: Dict[str, Any]) -> bool:
         if "title" not in item or "details" not in item or "agent_name" not in item:
             return False
     return True
+
+
+def validate_ledger_field(key: str, value: Any, agent_names: List[str]) -> bool:
+    """Check one top-level field of a progress ledger as soon as it is complete."""
+    if key in ["is_current_step_complete", "need_to_replan"]:
+        return isinstance(value, dict) and "reason" in value and "answer" in value
+    if key == "instruction_or_question":
+        return (
+            isinstance(value, dict)
+            and "answer" in value
+            and value.get("agent_name") in agent_names
+        )
+    if key == "progress_summary":
+        return isinstance(value, str)
+    return True
+
+
+def validate_plan_field(key: str, value: Any) -> bool:
+    """Check one top-level field of a plan as soon as it is complete."""
+    if key == "steps":
+        return isinstance(value, list) and all(
+            isinstance(item, dict)
+            and "title" in item
+            and "details" in item
+            and "agent_name" in item
+            for item in value
+        )
+    return True
@@ -40,3 +40,111 @@ def extract_json_from_string(s: str) -> Optional[Any]:
         except json.JSONDecodeError:
             return None
     return None
+
+
+class JsonStreamError(ValueError):
+    """Raised when streamed text can no longer become a valid JSON object."""
+
+
+class IncrementalJsonParser:
+    """
+    Parses a JSON object from a stream of text chunks.
+
+    Every top-level member is decoded as soon as its value is complete, so the
+    caller can act on the first fields of a response while the model is still
+    writing the rest. Text before the opening brace, such as a code fence, is
+    skipped, as is anything after the closing one.
+    """
+
+    _CLOSERS = {"{": "}", "[": "]"}
+    _LITERAL = re.compile(r"true|false|null|-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?")
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._member_start = -1
+        # Start of the literal (number, true, false or null) being read
+        self._literal_start = -1
+        self.fields: dict[str, Any] = {}
+        self.done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """
+        Add text to the stream.
+
+        Args:
+            chunk (str): The next piece of the response
+
+        Returns:
+            list[tuple[str, Any]]: The top-level members completed by this chunk
+
+        Raises:
+            JsonStreamError: If the text can no longer form a valid JSON object
+        """
+        completed: list[tuple[str, Any]] = []
+        if self.done:
+            return completed
+        self._text += chunk
+        text = self._text
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif not self._stack:
+                # Skip anything before the object
+                if char == "{":
+                    self._stack.append("}")
+                    self._member_start = pos + 1
+            elif char not in ' \t\r\n,:"{}[]':
+                if self._literal_start < 0:
+                    self._literal_start = pos
+            else:
+                if self._literal_start >= 0:
+                    self._end_literal(pos)
+                if char == '"':
+                    self._in_string = True
+                elif char in self._CLOSERS:
+                    self._stack.append(self._CLOSERS[char])
+                elif char in "}]":
+                    if char != self._stack.pop():
+                        raise JsonStreamError(f"Unexpected {char!r} at position {pos}")
+                    if not self._stack:
+                        completed.extend(self._close_member(pos))
+                        self.done = True
+                        self._pos = pos + 1
+                        return completed
+                elif char == "," and len(self._stack) == 1:
+                    member = self._close_member(pos)
+                    if not member:
+                        raise JsonStreamError(f"Empty member at position {pos}")
+                    completed.extend(member)
+                    self._member_start = pos + 1
+        self._pos = len(text)
+        return completed
+
+    def _end_literal(self, end: int) -> None:
+        literal = self._text[self._literal_start : end]
+        if self._LITERAL.fullmatch(literal) is None:
+            raise JsonStreamError(
+                f"Invalid value {literal!r} at position {self._literal_start}"
+            )
+        self._literal_start = -1
+
+    def _close_member(self, end: int) -> list[tuple[str, Any]]:
+        member = self._text[self._member_start : end]
+        if not member.strip():
+            return []
+        try:
+            parsed = json.loads("{" + member + "}")
+        except json.JSONDecodeError as e:
+            raise JsonStreamError(f"Malformed member {member.strip()!r}: {e}") from e
+        self.fields.update(parsed)
+        return list(parsed.items())
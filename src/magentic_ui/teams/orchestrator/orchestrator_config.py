@@ -24,6 +24,7 @@ class OrchestratorConfig(BaseModel):
         memory_controller_key (str, optional): the key to retrieve the memory_controller for a particular user.
         max_replans (int, optional): Maximum number of replans allowed. Default: 3.
         no_overwrite_of_task (bool, optional): Whether to prevent the orchestrator from overwriting the task. Default: False.
+        early_dispatch (bool, optional): Whether to request the next speaker as soon as the instruction of the progress ledger has streamed in, before the progress summary that follows it. The step shown in the UI is then sent after the request. Default: False.
     """
 
     cooperative_planning: bool = True
@@ -42,3 +43,4 @@ class OrchestratorConfig(BaseModel):
     memory_controller_key: Optional[str] = None
     max_replans: Union[int, None] = 3
     no_overwrite_of_task: bool = False
+    early_dispatch: bool = False
@@ -1,11 +1,29 @@
 from urllib.parse import quote_plus
-from playwright.async_api import async_playwright
+from playwright.async_api import BrowserContext, Page, Route
 from urllib.parse import urlparse
 import asyncio
-import tiktoken
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from typing import Optional, Tuple
 from loguru import logger
 from ..tools import PlaywrightController
+from .playwright.browser import get_browser_pool
+from .playwright.utils.text_workers import get_text_worker_pool, truncate_tokens
+
+EXTRACTION_ERROR = "Error extracting content"
+
+# Sandboxed, throwaway browser settings for pages fetched on behalf of a search
+_LAUNCH_OPTIONS = {
+    "headless": True,
+    "env": {},
+    "args": ["--disable-extensions", "--disable-file-system"],
+    "chromium_sandbox": True,
+}
+_CONTEXT_OPTIONS = {
+    "accept_downloads": False,  # Disable downloads
+    "permissions": [],  # No additional permissions
+}
 
 
 @dataclass
@@ -16,45 +34,295 @@ class BingSearchResults:
     combined_content: str
 
 
-async def extract_page_markdown(url: str) -> tuple[str, str]:
-    """Extract markdown content from a given URL.
+def _extract_links(markdown_text: str) -> list[dict[str, str]]:
+    """Extract links from markdown text.
 
     Args:
-        url (str): The URL to extract content from
+        markdown_text (str): The markdown text to extract links from
 
     Returns:
-        A tuple containing:
-            - str: The URL
-            - str: The markdown content extracted from the page
+        list[dict[str, str]]: List of dictionaries containing display_text and url
     """
-    try:
-        async with async_playwright() as p:
-            launch_args = ["--disable-extensions", "--disable-file-system"]
-            browser = await p.chromium.launch(
-                headless=True, env={}, args=launch_args, chromium_sandbox=True
+
+    def is_valid_url(url: str) -> bool:
+        """Check if a URL is valid."""
+        try:
+            result = urlparse(url)
+            return all([result.scheme in ("http", "https"), result.netloc])
+        except Exception:
+            return False
+
+    links: list[dict[str, str]] = []
+    lines = markdown_text.split("\n")
+    for line in lines:
+        # Match markdown link format: [display_text](url)
+        if (
+            line.count("[") == 1
+            and line.count("]") == 1
+            and line.count("(") == 1
+            and line.count(")") == 1
+        ):
+            display_start = line.find("[") + 1
+            display_end = line.find("]")
+            url_start = line.find("(") + 1
+            url_end = line.find(")")
+
+            if all(
+                i != -1
+                for i in [
+                    display_start,
+                    display_end,
+                    url_start,
+                    url_end,
+                ]
+            ):
+                display_text = line[display_start:display_end]
+                url = line[url_start:url_end]
+
+                # Only add if URL is valid
+                if is_valid_url(url):
+                    links.append({"display_text": display_text, "url": url})
+    return links
+
+
+class SearchResultFetcher:
+    """
+    Fetches Bing results and the pages they link to in one shared browser.
+
+    The headless browser is leased from the process-wide browser pool, so it
+    is launched once and reused by every search. Each search gets its own
+    isolated context and fetches its result pages concurrently on at most
+    `max_concurrent_pages` pages, each URL bounded by its own timeout. Images,
+    fonts and media are never downloaded. Results are cached per query for
+    `cache_ttl` seconds.
+
+    Args:
+        max_concurrent_pages (int, optional): Pages fetched at the same time per search. Default: 4.
+        settle_delay (float, optional): Seconds to let a page render after it loaded. Default: 1.0.
+        cache_ttl (float, optional): Seconds a search result is reused. Default: 300.
+        max_cached_queries (int, optional): Maximum number of cached searches. Default: 64.
+        blocked_resource_types (Tuple[str, ...], optional): Request types that are aborted. Default: ("image", "font", "media").
+    """
+
+    def __init__(
+        self,
+        max_concurrent_pages: int = 4,
+        settle_delay: float = 1.0,
+        cache_ttl: float = 300.0,
+        max_cached_queries: int = 64,
+        blocked_resource_types: Tuple[str, ...] = ("image", "font", "media"),
+    ) -> None:
+        self.max_concurrent_pages = max_concurrent_pages
+        self.settle_delay = settle_delay
+        self.cache_ttl = cache_ttl
+        self.max_cached_queries = max_cached_queries
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self._controller = PlaywrightController()
+        self._cache: OrderedDict[
+            Tuple[str, int, int], Tuple[float, BingSearchResults]
+        ] = OrderedDict()
+
+    async def search(
+        self,
+        query: str,
+        max_pages: int = 3,
+        timeout_seconds: float = 10,
+        max_tokens_per_page: int = 10000,
+    ) -> BingSearchResults:
+        """Get the Bing search results for a given query, cached per query.
+
+        Args:
+            query (str): The search query to use
+            max_pages (int, optional): Maximum number of pages to extract. Default: 3
+            timeout_seconds (float, optional): Maximum time in seconds to wait for the results and for each page. Default: 10
+            max_tokens_per_page (int, optional): Maximum number of tokens to extract from each page. Default: 10000
+
+        Returns:
+            BingSearchResults: Contains search results markdown, links, and extracted content
+        """
+        key = (query, max_pages, max_tokens_per_page)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        results = await self._search(
+            query, max_pages, timeout_seconds, max_tokens_per_page
+        )
+        # Results whose pages all failed to load are retried like failed searches
+        if results.search_results and (results.page_contents or max_pages == 0):
+            self._cache[key] = (time.monotonic() + self.cache_ttl, results)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached_queries:
+                self._cache.popitem(last=False)
+        return results
+
+    async def fetch(self, url: str, timeout_seconds: float = 10) -> tuple[str, str]:
+        """Extract the markdown content of a single URL.
+
+        Args:
+            url (str): The URL to extract content from
+            timeout_seconds (float, optional): Maximum time in seconds for the page. Default: 10
+
+        Returns:
+            A tuple containing:
+                - str: The URL
+                - str: The markdown content extracted from the page
+        """
+        (result,) = await self.fetch_pages([url], timeout_seconds)
+        return result
+
+    async def fetch_pages(
+        self, urls: list[str], timeout_seconds: float = 10
+    ) -> list[tuple[str, str]]:
+        """Extract the markdown content of several URLs concurrently.
+
+        Args:
+            urls (list[str]): The URLs to extract content from
+            timeout_seconds (float, optional): Maximum time in seconds for each page. Default: 10
+
+        Returns:
+            list[tuple[str, str]]: The URLs and their markdown, in order
+        """
+        try:
+            context = await self._acquire_context()
+        except Exception as e:
+            logger.error(f"Error extracting content: {e}")
+            return [(url, EXTRACTION_ERROR) for url in urls]
+        try:
+            return await self._fetch_all(context, urls, timeout_seconds)
+        finally:
+            await get_browser_pool().release(context)
+
+    def clear_cache(self) -> None:
+        """Forget all cached search results."""
+        self._cache.clear()
+
+    async def _search(
+        self,
+        query: str,
+        max_pages: int,
+        timeout_seconds: float,
+        max_tokens_per_page: int,
+    ) -> BingSearchResults:
+        try:
+            context = await self._acquire_context()
+        except Exception as e:
+            logger.error(f"Error getting Bing search results: {e}")
+            return BingSearchResults("", [], {}, "")
+
+        try:
+            search_url = f"https://www.bing.com/search?q={quote_plus(query)}&FORM=QBLH"
+            ((_, search_results),) = await self._fetch_all(
+                context, [search_url], timeout_seconds
             )
-            context = await browser.new_context(
-                accept_downloads=False,  # Disable downloads
-                permissions=[],  # No additional permissions
+            if search_results == EXTRACTION_ERROR:
+                return BingSearchResults("", [], {}, "")
+            links = _extract_links(search_results)
+
+            # Extract content from the first few links in parallel
+            first_few_urls = [link["url"] for link in links[:max_pages]]
+            extracted_contents = await self._fetch_all(
+                context, first_few_urls, timeout_seconds
             )
+        except Exception as e:
+            logger.error(f"Error getting Bing search results: {e}")
+            return BingSearchResults("", [], {}, "")
+        finally:
+            await get_browser_pool().release(context)
+
+        # Map URLs to their content, skipping failed and timed out extractions
+        page_contents: dict[str, str] = {
+            url: content
+            for url, content in extracted_contents
+            if content != EXTRACTION_ERROR
+        }
+
+        # Combine all extracted page contents into a single string
+        combined_content = ""
+        if page_contents:
+            combined_content = "Search Results for " + query + "\n\n"
+            for url, content in page_contents.items():
+                if max_tokens_per_page == -1:
+                    token_limited_content = content
+                else:
+                    token_limited_content = await get_text_worker_pool().run(
+                        truncate_tokens, content, max_tokens_per_page
+                    )
+                combined_content += f"Page: {url}\n{token_limited_content}\n\n"
+        return BingSearchResults(search_results, links, page_contents, combined_content)
+
+    async def _acquire_context(self) -> BrowserContext:
+        context = await get_browser_pool().acquire(_LAUNCH_OPTIONS, _CONTEXT_OPTIONS)
+        await context.route("**/*", self._route)
+        return context
 
-            controller = PlaywrightController()
+    async def _route(self, route: Route) -> None:
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
 
-            page = await context.new_page()
+    async def _fetch_all(
+        self, context: BrowserContext, urls: list[str], timeout_seconds: float
+    ) -> list[tuple[str, str]]:
+        # A bounded set of pages, reused from one URL to the next
+        pages: asyncio.Queue[Page] = asyncio.Queue()
+        open_pages = [page for page in context.pages if not page.is_closed()]
+        for i in range(min(self.max_concurrent_pages, len(urls))):
+            pages.put_nowait(
+                open_pages[i] if i < len(open_pages) else await context.new_page()
+            )
+
+        async def fetch_one(url: str) -> tuple[str, str]:
+            page = await pages.get()
             try:
-                await page.goto(url)
-                await asyncio.sleep(1)
-                markdown = await controller.get_page_markdown(page)
+                markdown = await asyncio.wait_for(
+                    self._extract(page, url), timeout=timeout_seconds
+                )
             except Exception as e:
-                logger.error(f"Error extracting content: {e}")
-                markdown = "Error extracting content"
-
-            await context.close()
-            await browser.close()
+                logger.error(f"Error extracting content from {url}: {e}")
+                markdown = EXTRACTION_ERROR
+                # The page may still be loading, replace it with a fresh one
+                try:
+                    await page.close()
+                    page = await context.new_page()
+                except Exception:
+                    pass
+            pages.put_nowait(page)
             return url, markdown
-    except Exception as e:
-        logger.error(f"Error extracting content: {e}")
-        return url, "Error extracting content"
+
+        return await asyncio.gather(*(fetch_one(url) for url in urls))
+
+    async def _extract(self, page: Page, url: str) -> str:
+        await page.goto(url)
+        await asyncio.sleep(self.settle_delay)
+        return await self._controller.get_page_markdown(page)
+
+
+_search_result_fetcher: Optional[SearchResultFetcher] = None
+
+
+def get_search_result_fetcher() -> SearchResultFetcher:
+    """Return the process-wide `SearchResultFetcher`, creating it on first use."""
+    global _search_result_fetcher
+    if _search_result_fetcher is None:
+        _search_result_fetcher = SearchResultFetcher()
+    return _search_result_fetcher
+
+
+async def extract_page_markdown(url: str) -> tuple[str, str]:
+    """Extract markdown content from a given URL.
+
+    Args:
+        url (str): The URL to extract content from
+
+    Returns:
+        A tuple containing:
+            - str: The URL
+            - str: The markdown content extracted from the page
+    """
+    return await get_search_result_fetcher().fetch(url)
 
 
 async def get_bing_search_results(
@@ -65,134 +333,17 @@ async def get_bing_search_results(
 ) -> BingSearchResults:
     """Get the Bing search results for a given query.
 
-    WARNING: This function spawns multiple browser local playwright instances which may consume a lot of resources and can cause risks.
+    Pages are fetched in a shared headless browser, see `SearchResultFetcher`.
 
     Args:
         query (str): The search query to use
         max_pages (int, optional): Maximum number of pages to extract. Default: 3
-        timeout_seconds (int, optional): Maximum time in seconds to wait for search results. Default: 10
+        timeout_seconds (int, optional): Maximum time in seconds to wait for the search results and for each page. Default: 10
         max_tokens_per_page (int, optional): Maximum number of tokens to extract from each page. Default: 10000
 
     Returns:
         BingSearchResults: Contains search results markdown, links, and extracted content
     """
-    search_results: str = ""
-    links: list[dict[str, str]] = []
-    page_contents: dict[str, str] = {}
-    combined_content: str = ""
-
-    try:
-        result = await asyncio.wait_for(
-            extract_page_markdown(
-                f"https://www.bing.com/search?q={quote_plus(query)}&FORM=QBLH"
-            ),
-            timeout=timeout_seconds,
-        )
-        _, search_results = result
-
-        # Extract links from markdown
-        def extract_links(markdown_text: str) -> list[dict[str, str]]:
-            """Extract links from markdown text.
-
-            Args:
-                markdown_text (str): The markdown text to extract links from
-
-            Returns:
-                list[dict[str, str]]: List of dictionaries containing display_text and url
-            """
-
-            def is_valid_url(url: str) -> bool:
-                """Check if a URL is valid."""
-                try:
-                    result = urlparse(url)
-                    return all([result.scheme in ("http", "https"), result.netloc])
-                except Exception:
-                    return False
-
-            links: list[dict[str, str]] = []
-            lines = markdown_text.split("\n")
-            for line in lines:
-                # Match markdown link format: [display_text](url)
-                if (
-                    line.count("[") == 1
-                    and line.count("]") == 1
-                    and line.count("(") == 1
-                    and line.count(")") == 1
-                ):
-                    display_start = line.find("[") + 1
-                    display_end = line.find("]")
-                    url_start = line.find("(") + 1
-                    url_end = line.find(")")
-
-                    if all(
-                        i != -1
-                        for i in [
-                            display_start,
-                            display_end,
-                            url_start,
-                            url_end,
-                        ]
-                    ):
-                        display_text = line[display_start:display_end]
-                        url = line[url_start:url_end]
-
-                        # Only add if URL is valid
-                        if is_valid_url(url):
-                            links.append({"display_text": display_text, "url": url})
-            return links
-
-        links = extract_links(search_results)
-
-        # Extract content from first 5 links in parallel
-        first_few_urls = [link["url"] for link in links[:max_pages]]
-        tasks = [extract_page_markdown(url) for url in first_few_urls]
-        extracted_contents = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Create a dictionary mapping URLs to their content, handling any failed extractions
-        page_contents: dict[str, str] = {}
-        for i, result in enumerate(extracted_contents):
-            url = first_few_urls[i]
-            if isinstance(result, Exception):
-                continue
-            elif isinstance(result, tuple):
-                _, content = result  # type: ignore
-                if content != "Error extracting content":
-                    page_contents[url] = content
-
-        # Combine all extracted page contents into a single string
-        if page_contents:
-            combined_content = "Search Results for " + query + "\n\n"
-            for url, content in page_contents.items():
-                if max_tokens_per_page == -1:
-                    token_limited_content = content
-                else:
-                    tokenizer = tiktoken.encoding_for_model("gpt-4o")
-                    tokens = tokenizer.encode(content)
-                    limited_content = tokenizer.decode(tokens[:max_tokens_per_page])
-                    token_limited_content = limited_content
-                combined_content += f"Page: {url}\n{token_limited_content}\n\n"
-
-    except asyncio.TimeoutError as e:
-        logger.info(f"Timeout error: {e}")
-        # If we timeout, we'll still return any partial results we managed to get
-        if not combined_content and page_contents:
-            # If we got some pages but hadn't combined them yet
-            combined_content = (
-                "Search Results for " + query + " (Partial results due to timeout)\n\n"
-            )
-            for url, content in page_contents.items():
-                if max_tokens_per_page == -1:
-                    token_limited_content = content
-                else:
-                    tokenizer = tiktoken.encoding_for_model("gpt-4o")
-                    tokens = tokenizer.encode(content)
-                    limited_content = tokenizer.decode(tokens[:max_tokens_per_page])
-                    token_limited_content = limited_content
-                combined_content += f"Page: {url}\n{token_limited_content}\n\n"
-        elif not search_results:
-            # If we got absolutely nothing, return empty results
-            return BingSearchResults("", [], {}, "")
-    except Exception as e:
-        logger.error(f"Error getting Bing search results: {e}")
-        return BingSearchResults("", [], {}, "")
-    return BingSearchResults(search_results, links, page_contents, combined_content)
+    return await get_search_result_fetcher().search(
+        query, max_pages, timeout_seconds, max_tokens_per_page
+    )
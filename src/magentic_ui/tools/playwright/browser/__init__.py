@@ -1,5 +1,6 @@
 from .base_playwright_browser import PlaywrightBrowser, DockerPlaywrightBrowser
 from .local_playwright_browser import LocalPlaywrightBrowser
+from .browser_pool import BrowserPool, BrowserPoolMetrics, get_browser_pool
 from .vnc_docker_playwright_browser import VncDockerPlaywrightBrowser
 from .headless_docker_playwright_browser import HeadlessDockerPlaywrightBrowser
 from .utils import get_browser_resource_config
@@ -11,4 +12,7 @@ __all__ = [
     "VncDockerPlaywrightBrowser",
     "HeadlessDockerPlaywrightBrowser",
     "get_browser_resource_config",
+    "BrowserPool",
+    "BrowserPoolMetrics",
+    "get_browser_pool",
 ]
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from loguru import logger
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+
+@dataclass
+class BrowserPoolMetrics:
+    """
+    Counters and gauges of a `BrowserPool`.
+
+    Attributes:
+        hits (int): Leases served from a warm context.
+        misses (int): Leases whose context had to be created on demand.
+        launches (int): Browsers launched.
+        evictions (int): Idle browsers closed to respect the pool limits.
+        browsers (int): Browsers currently retained by the pool.
+        leased_contexts (int): Contexts currently handed out.
+        warm_contexts (int): Contexts ready to be handed out.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    launches: int = 0
+    evictions: int = 0
+    browsers: int = 0
+    leased_contexts: int = 0
+    warm_contexts: int = 0
+
+
+class _PooledBrowser:
+    def __init__(
+        self, key: str, browser: Browser, context_options: Dict[str, Any]
+    ) -> None:
+        self.key = key
+        self.browser = browser
+        self.context_options = context_options
+        self.leased: Set[BrowserContext] = set()
+        self.warm: List[BrowserContext] = []
+        self.last_used = time.monotonic()
+        self.retained = True
+        self.refill_task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def idle(self) -> bool:
+        return not self.leased
+
+
+class BrowserPool:
+    """
+    Process-wide pool of launched browsers that hands out isolated contexts.
+
+    Browsers are launched by the first lease for a distinct set of launch and
+    context options (or by `prewarm`) and kept running between runs. Each
+    lease gets its own `BrowserContext`, so cookies, storage and pages are
+    never shared between runs. A returned context is closed, which discards
+    all of its state. After each lease the pool prepares `warm_contexts` fresh
+    contexts (each with one blank page) for the browser, so only the first
+    lease waits for a browser launch and a new context.
+
+    At most `max_browsers` browsers are retained. When a new browser is needed
+    the least recently used idle browser is evicted; if every browser is busy
+    the new browser serves its leases and is closed once they are returned.
+    Browsers idle for longer than `idle_timeout` seconds are closed on the
+    next lease.
+
+    The pool belongs to the event loop it is first used on.
+
+    Args:
+        max_browsers (int, optional): Maximum number of retained browsers. Default: 2.
+        warm_contexts (int, optional): Ready contexts kept per browser. Default: 1.
+        idle_timeout (float, optional): Seconds after which an idle browser is closed. Default: 600.
+    """
+
+    def __init__(
+        self,
+        max_browsers: int = 2,
+        warm_contexts: int = 1,
+        idle_timeout: float = 600.0,
+    ) -> None:
+        self.max_browsers = max_browsers
+        self.warm_contexts = warm_contexts
+        self.idle_timeout = idle_timeout
+        self._playwright: Optional[Playwright] = None
+        self._browsers: Dict[str, _PooledBrowser] = {}
+        self._leases: Dict[BrowserContext, _PooledBrowser] = {}
+        self._lock = asyncio.Lock()
+        self._metrics = BrowserPoolMetrics()
+
+    async def acquire(
+        self,
+        launch_options: Dict[str, Any],
+        context_options: Optional[Dict[str, Any]] = None,
+    ) -> BrowserContext:
+        """
+        Lease an isolated browser context, launching a browser if needed
+
+        Args:
+            launch_options (Dict[str, Any]): Keyword arguments for `chromium.launch`
+            context_options (Dict[str, Any], optional): Keyword arguments for `new_context`. Default: None.
+
+        Returns:
+            BrowserContext: A context owned by the caller until `release`
+        """
+        entry = await self._get_browser(launch_options, context_options or {})
+        context: Optional[BrowserContext] = None
+        while entry.warm and context is None:
+            candidate = entry.warm.pop()
+            if candidate.pages and not candidate.pages[0].is_closed():
+                context = candidate
+            else:
+                try:
+                    await candidate.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close stale browser context: {e}")
+        if context is not None:
+            self._metrics.hits += 1
+        else:
+            self._metrics.misses += 1
+            context = await self._new_context(entry)
+
+        entry.leased.add(context)
+        entry.last_used = time.monotonic()
+        self._leases[context] = entry
+        self._schedule_refill(entry)
+        return context
+
+    async def release(self, context: BrowserContext) -> None:
+        """
+        Return a leased context. The context is closed, discarding its state.
+
+        Args:
+            context (BrowserContext): A context returned by `acquire`
+        """
+        entry = self._leases.pop(context, None)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close pooled browser context: {e}")
+        if entry is None:
+            return
+        entry.leased.discard(context)
+        entry.last_used = time.monotonic()
+        if not entry.retained and entry.idle:
+            await self._close_browser(entry)
+
+    async def prewarm(
+        self,
+        launch_options: Dict[str, Any],
+        context_options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Launch a browser and its warm contexts ahead of the first lease
+
+        Args:
+            launch_options (Dict[str, Any]): Keyword arguments for `chromium.launch`
+            context_options (Dict[str, Any], optional): Keyword arguments for `new_context`. Default: None.
+        """
+        entry = await self._get_browser(launch_options, context_options or {})
+        self._schedule_refill(entry)
+        if entry.refill_task is not None:
+            await entry.refill_task
+
+    def metrics(self) -> BrowserPoolMetrics:
+        """Current pool counters and gauges"""
+        retained = [e for e in self._browsers.values() if e.retained]
+        return BrowserPoolMetrics(
+            hits=self._metrics.hits,
+            misses=self._metrics.misses,
+            launches=self._metrics.launches,
+            evictions=self._metrics.evictions,
+            browsers=len(retained),
+            leased_contexts=len(self._leases),
+            warm_contexts=sum(len(e.warm) for e in retained),
+        )
+
+    async def close(self) -> None:
+        """Close every browser, including those with leased contexts"""
+        async with self._lock:
+            entries = set(self._browsers.values()) | set(self._leases.values())
+            for entry in entries:
+                await self._close_browser(entry)
+            self._browsers.clear()
+            self._leases.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def _get_browser(
+        self, launch_options: Dict[str, Any], context_options: Dict[str, Any]
+    ) -> _PooledBrowser:
+        key = json.dumps(
+            {"launch": launch_options, "context": context_options}, sort_keys=True
+        )
+        async with self._lock:
+            await self._close_expired()
+            entry = self._browsers.get(key)
+            if entry is None or not entry.browser.is_connected():
+                entry = await self._launch(key, launch_options, context_options)
+            return entry
+
+    async def _launch(
+        self, key: str, launch_options: Dict[str, Any], context_options: Dict[str, Any]
+    ) -> _PooledBrowser:
+        stale = self._browsers.pop(key, None)
+        if stale is not None:
+            await self._close_browser(stale)
+
+        retained = len(self._browsers) < self.max_browsers
+        if not retained:
+            idle = [e for e in self._browsers.values() if e.idle]
+            if idle:
+                await self._evict(min(idle, key=lambda e: e.last_used))
+                retained = True
+            else:
+                logger.warning(
+                    f"Browser pool is full ({self.max_browsers} busy browsers); "
+                    "launching a browser that is closed after use"
+                )
+
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        browser = await self._playwright.chromium.launch(**launch_options)
+        self._metrics.launches += 1
+        entry = _PooledBrowser(key, browser, context_options)
+        entry.retained = retained
+        if retained:
+            self._browsers[key] = entry
+        return entry
+
+    async def _new_context(self, entry: _PooledBrowser) -> BrowserContext:
+        context = await entry.browser.new_context(**entry.context_options)
+        await context.new_page()
+        return context
+
+    def _schedule_refill(self, entry: _PooledBrowser) -> None:
+        if not entry.retained or (
+            entry.refill_task is not None and not entry.refill_task.done()
+        ):
+            return
+        entry.refill_task = asyncio.create_task(self._refill(entry))
+
+    async def _refill(self, entry: _PooledBrowser) -> None:
+        try:
+            while (
+                entry.retained
+                and entry.browser.is_connected()
+                and len(entry.warm) < self.warm_contexts
+            ):
+                entry.warm.append(await self._new_context(entry))
+        except Exception as e:
+            logger.warning(f"Failed to prepare a warm browser context: {e}")
+
+    async def _close_expired(self) -> None:
+        now = time.monotonic()
+        for entry in list(self._browsers.values()):
+            if entry.idle and now - entry.last_used > self.idle_timeout:
+                await self._evict(entry)
+
+    async def _evict(self, entry: _PooledBrowser) -> None:
+        self._metrics.evictions += 1
+        self._browsers.pop(entry.key, None)
+        await self._close_browser(entry)
+
+    async def _close_browser(self, entry: _PooledBrowser) -> None:
+        entry.retained = False
+        if entry.refill_task is not None:
+            entry.refill_task.cancel()
+        entry.warm.clear()
+        try:
+            await entry.browser.close()
+        except Exception as e:
+            logger.warning(f"Failed to close pooled browser: {e}")
+
+
+_browser_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide `BrowserPool`, creating it on first use."""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool()
+    return _browser_pool
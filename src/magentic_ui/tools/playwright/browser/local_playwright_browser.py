@@ -10,6 +10,7 @@ from pydantic import BaseModel
 from playwright.async_api import async_playwright, Playwright
 
 from .base_playwright_browser import PlaywrightBrowser
+from .browser_pool import get_browser_pool
 
 
 class LocalPlaywrightBrowserConfig(BaseModel):
@@ -22,6 +23,7 @@ class LocalPlaywrightBrowserConfig(BaseModel):
     enable_downloads: bool = False
     persistent_context: bool = False
     browser_data_dir: Optional[str] = None
+    use_pool: bool = False
 
     @property
     def requires_persistent_context(self) -> bool:
@@ -43,6 +45,8 @@ class LocalPlaywrightBrowser(
         persistent_context (bool, optional): Whether to use a persistent browser context. Default: False.
         browser_data_dir (str, optional): Path to the browser user data directory for persistent contexts.
             Required if persistent_context is True. Default: None.
+        use_pool (bool, optional): Lease an isolated context from the process-wide browser pool
+            instead of launching a browser. Ignored for persistent contexts. Default: False.
 
     Properties:
         browser_context (BrowserContext): The active Playwright browser context.
@@ -74,6 +78,7 @@ class LocalPlaywrightBrowser(
         enable_downloads: bool = False,
         persistent_context: bool = False,
         browser_data_dir: Optional[str] = None,
+        use_pool: bool = False,
     ):
         super().__init__()
         self._headless = headless
@@ -81,6 +86,8 @@ class LocalPlaywrightBrowser(
         self._enable_downloads = enable_downloads
         self._persistent_context = persistent_context
         self._browser_data_dir = browser_data_dir
+        self._use_pool = use_pool
+        self._pooled = False
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
@@ -89,11 +96,28 @@ class LocalPlaywrightBrowser(
         """
         Start the browser resource.
         """
-        self._playwright = await async_playwright().start()
-
         launch_options: Dict[str, Any] = {"headless": self._headless}
         if self._browser_channel:
             launch_options["channel"] = self._browser_channel
+        context_options: Dict[str, Any] = {
+            "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0",
+            "accept_downloads": self._enable_downloads,
+        }
+
+        if self._use_pool and not self._persistent_context:
+            self._context = await get_browser_pool().acquire(
+                {
+                    **launch_options,
+                    "args": ["--disable-extensions", "--disable-file-system"],
+                    "chromium_sandbox": True,
+                    "env": {} if self._headless else {"DISPLAY": ":0"},
+                },
+                context_options,
+            )
+            self._pooled = True
+            return
+
+        self._playwright = await async_playwright().start()
 
         if self._persistent_context and self._browser_data_dir:
             # Ensure the browser data directory exists
@@ -117,15 +141,18 @@ class LocalPlaywrightBrowser(
                 env={} if self._headless else {"DISPLAY": ":0"},
             )
 
-            self._context = await self._browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0",
-                accept_downloads=self._enable_downloads,
-            )
+            self._context = await self._browser.new_context(**context_options)
 
     async def _close(self) -> None:
         """
         Close the browser resource.
         """
+        if self._pooled and self._context:
+            # The pool closes the context and keeps the browser running
+            await get_browser_pool().release(self._context)
+            self._context = None
+            self._pooled = False
+            return
         if self._context:
             await self._context.close()
         if self._browser:
@@ -154,6 +181,7 @@ class LocalPlaywrightBrowser(
             enable_downloads=self._enable_downloads,
             persistent_context=self._persistent_context,
             browser_data_dir=self._browser_data_dir,
+            use_pool=self._use_pool,
         )
 
     @classmethod
@@ -166,4 +194,5 @@ class LocalPlaywrightBrowser(
             enable_downloads=config.enable_downloads,
             persistent_context=config.persistent_context,
             browser_data_dir=config.browser_data_dir,
+            use_pool=config.use_pool,
         )
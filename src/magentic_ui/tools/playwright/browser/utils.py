@@ -58,6 +58,7 @@ def get_browser_resource_config(
     inside_docker: bool = True,
     headless: bool = False,
     local: bool = False,
+    use_browser_pool: bool = False,
 ) -> Tuple[ComponentModel, int, int]:
     """
     Create a VNC Docker Playwright Browser Resource configuration. The requested ports for novnc and playwright may be overwritten. The final values for each port number will be in the return value.
@@ -66,6 +67,7 @@ def get_browser_resource_config(
         bind_dir (str): Directory to bind for the browser resource.
         novnc_port (int, optional): Port for the noVNC server. Default: -1 (auto-assign).
         playwright_port (int, optional): Port for the Playwright browser. Default: -1 (auto-assign).
+        use_browser_pool (bool, optional): Whether a local browser leases its context from the browser pool. Default: False.
 
     Returns:
         A tuple containing the following:
@@ -75,7 +77,7 @@ def get_browser_resource_config(
     """
 
     if local:
-        browser = LocalPlaywrightBrowser(headless=headless)
+        browser = LocalPlaywrightBrowser(headless=headless, use_pool=use_browser_pool)
     else:
         browser, novnc_port, playwright_port = _get_docker_browser_resource_config(
             bind_dir=bind_dir,
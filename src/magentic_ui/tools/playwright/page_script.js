@@ -612,6 +612,24 @@ var WebSurfer = WebSurfer || (function () {
         return textInView;
     };
 
+    /**
+     * Collects everything an agent step reads from the page in one call
+     * Interactive rects come first since they assign the __elementId attributes
+     * that the focused element id refers to
+     * @returns {Object} Rects, viewport, focused id, metadata, visible text and title
+     */
+    let getSnapshot = function () {
+        let interactiveRects = getInteractiveRects();
+        return {
+            "interactiveRects": interactiveRects,
+            "visualViewport": getVisualViewport(),
+            "focusedElementId": getFocusedElementId(),
+            "pageMetadata": getPageMetadata(),
+            "visibleText": getVisibleText(),
+            "title": document.title,
+        };
+    };
+
     // Public API
     return {
         getInteractiveRects: getInteractiveRects,
@@ -619,5 +637,6 @@ var WebSurfer = WebSurfer || (function () {
         getFocusedElementId: getFocusedElementId,
         getPageMetadata: getPageMetadata,
         getVisibleText: getVisibleText,
+        getSnapshot: getSnapshot,
     };
 })();
@@ -5,6 +5,7 @@ import random
 import json
 import logging
 import hashlib
+import weakref
 from typing import (
     Any,
     Awaitable,
@@ -21,15 +22,17 @@ import warnings
 from playwright.async_api import Locator
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from playwright.async_api import Download, Page, BrowserContext
+from playwright.async_api import Download, Frame, Page, BrowserContext
 from .utils.animation_utils import AnimationUtilsPlaywright
 from .utils.webpage_text_utils import WebpageTextUtilsPlaywright
 from ..url_status_manager import UrlStatusManager
 
 from .types import (
     InteractiveRegion,
+    PageSnapshot,
     VisualViewport,
     interactiveregion_from_dict,
+    pagesnapshot_from_dict,
     visualviewport_from_dict,
 )
 
@@ -126,6 +129,16 @@ class PlaywrightController:
         self._url_validation_callback = url_validation_callback
         self._page_script: str = ""
         self._markdown_converter: Optional[Any] | None = None
+        # Main-frame navigation counter per page, and the navigation at which
+        # each page last completed on_new_page; see _ensure_page_ready
+        self._navigation_ids: weakref.WeakKeyDictionary[Page, int] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._ready_navigation_ids: weakref.WeakKeyDictionary[Page, int] = (
+            weakref.WeakKeyDictionary()
+        )
+        # Pages whose listeners and init script are registered
+        self._setup_pages: weakref.WeakSet[Page] = weakref.WeakSet()
 
         # Create animation utils instance
         self._animation = AnimationUtilsPlaywright()
@@ -139,6 +152,8 @@ class PlaywrightController:
             encoding="utf-8",
         ) as fh:
             self._page_script = fh.read()
+        # Defines WebSurfer if needed and reads the page state in one evaluate
+        self._snapshot_script = self._page_script + "\nWebSurfer.getSnapshot();"
 
         # Initialize WebpageTextUtils
         self._text_utils = WebpageTextUtilsPlaywright()
@@ -151,6 +166,9 @@ class PlaywrightController:
             page (Page): The Playwright page object.
         """
         assert page is not None
+        if page not in self._navigation_ids:
+            self._track_navigations(page)
+        navigation_id = self._navigation_ids[page]
 
         awaiting_approval = False
         tentative_url = page.url
@@ -187,7 +205,22 @@ class PlaywrightController:
             # Visit the page if permission has been given
             await self.visit_page(page, tentative_url)
 
-        page.on("download", self._download_handler)  # type: ignore
+        if page not in self._setup_pages:
+            # Listeners and init scripts survive navigations; register them
+            # once, and again on the next call if registering failed
+            if self._download_handler is not None:
+                page.on("download", self._download_handler)
+            try:
+                await page.add_init_script(
+                    path=os.path.join(
+                        os.path.abspath(os.path.dirname(__file__)), "page_script.js"
+                    )
+                )
+            except Exception:
+                if self._download_handler is not None:
+                    page.remove_listener("download", self._download_handler)
+                raise
+            self._setup_pages.add(page)
 
         # check if there is a need to resize the viewport
         page_viewport_size = page.viewport_size
@@ -200,21 +233,52 @@ class PlaywrightController:
                 await page.set_viewport_size(
                     {"width": self.viewport_width, "height": self.viewport_height}
                 )
-        await page.add_init_script(
-            path=os.path.join(
-                os.path.abspath(os.path.dirname(__file__)), "page_script.js"
-            )
-        )
+
+        # A navigation that happened while we were setting up leaves the page
+        # not ready, so the next action checks the new URL again
+        self._ready_navigation_ids[page] = navigation_id
+
+    def _track_navigations(self, page: Page) -> None:
+        """
+        Count main-frame navigations of a page so readiness can be invalidated.
+
+        Args:
+            page (Page): The Playwright page object.
+        """
+        self._navigation_ids[page] = 0
+
+        def on_frame_navigated(frame: Frame) -> None:
+            if frame == page.main_frame and page in self._navigation_ids:
+                self._navigation_ids[page] += 1
+
+        page.on("framenavigated", on_frame_navigated)
+
+    def is_page_ready(self, page: Page) -> bool:
+        """
+        Check whether a page was set up by on_new_page since its last navigation.
+
+        Args:
+            page (Page): The Playwright page object.
+
+        Returns:
+            bool: True if no setup is needed before the next action.
+        """
+        ready_id = self._ready_navigation_ids.get(page)
+        return ready_id is not None and ready_id == self._navigation_ids.get(page)
 
     async def _ensure_page_ready(self, page: Page) -> None:
         """
         Ensure the page is properly configured before performing any action.
 
+        The setup in on_new_page only runs again after the page navigated, so
+        consecutive actions on the same document cost no extra round-trips.
+
         Args:
             page (Page): The Playwright page object.
         """
         assert page is not None
-        await self.on_new_page(page)
+        if not self.is_page_ready(page):
+            await self.on_new_page(page)
 
     async def get_current_url_title(self, page: Page) -> Tuple[str, str]:
         """
@@ -355,6 +419,36 @@ class PlaywrightController:
         assert isinstance(result, dict)
         return cast(Dict[str, Any], result)
 
+    async def snapshot(
+        self, page: Page, include_screenshot: bool = True
+    ) -> PageSnapshot:
+        """
+        Retrieve everything an agent step reads from the page at once.
+
+        Interactive regions, viewport, focused element, metadata, visible text
+        and title come from a single evaluate call; the screenshot is taken
+        concurrently. This replaces calling the individual getters one after
+        the other, each of which costs its own browser round-trips.
+
+        Args:
+            page (Page): The Playwright page object.
+            include_screenshot (bool, optional): Whether to also capture a screenshot. Default: True
+
+        Returns:
+            PageSnapshot: The page state. The focused id is "" if nothing is focused.
+        """
+        await self._ensure_page_ready(page)
+        if include_screenshot:
+            result, screenshot = await asyncio.gather(
+                page.evaluate(self._snapshot_script), self.get_screenshot(page)
+            )
+        else:
+            result, screenshot = await page.evaluate(self._snapshot_script), None
+        assert isinstance(result, dict)
+        return pagesnapshot_from_dict(
+            cast(Dict[str, Any], result), url=page.url, screenshot=screenshot
+        )
+
     async def go_back(self, page: Page) -> bool:
         """
         Navigate back to the previous page.
@@ -1400,13 +1494,11 @@ class PlaywrightController:
                 - bytes | None: The screenshot bytes if requested. Otherwise None.
                 - str: The new metadata hash of the page.
         """
-        await self._ensure_page_ready(page)
-        screenshot = None
-        if get_screenshot:
-            screenshot = await self.get_screenshot(page, path=None)
-        page_title = await page.title()
-        viewport = await self.get_visual_viewport(page)
-        viewport_text = await self._text_utils.get_visible_text(page)
+        snapshot = await self.snapshot(page, include_screenshot=get_screenshot)
+        screenshot = snapshot["screenshot"]
+        page_title = snapshot["title"]
+        viewport = snapshot["visual_viewport"]
+        viewport_text = snapshot["visible_text"]
         percent_visible = int(viewport["height"] * 100 / viewport["scrollHeight"])
         percent_scrolled = int(viewport["pageTop"] * 100 / viewport["scrollHeight"])
         position_text = (
@@ -1416,7 +1508,7 @@ class PlaywrightController:
             if percent_scrolled + percent_visible >= 99
             else f"{percent_scrolled}% down from the top of the page"
         )
-        page_metadata = json.dumps(await self.get_page_metadata(page), indent=4)
+        page_metadata = json.dumps(snapshot["page_metadata"], indent=4)
         metadata_hash = hashlib.md5(page_metadata.encode("utf-8")).hexdigest()
 
         page_metadata = f"\nThe following metadata was extracted from the webpage:\n\n{page_metadata.strip()}\n"
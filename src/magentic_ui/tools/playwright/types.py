@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 from typing_extensions import TypedDict
 
 from autogen_core import FunctionCall, Image
@@ -43,6 +43,17 @@ class InteractiveRegion(TypedDict):
     rects: List[DOMRectangle]
 
 
+class PageSnapshot(TypedDict):
+    url: str
+    title: str
+    interactive_rects: Dict[str, InteractiveRegion]
+    visual_viewport: VisualViewport
+    focused_rect_id: str
+    page_metadata: Dict[str, Any]
+    visible_text: str
+    screenshot: Optional[bytes]
+
+
 # Helper functions for dealing with JSON. Not sure there's a better way?
 
 
@@ -105,3 +116,22 @@ def visualviewport_from_dict(viewport: Dict[str, Any]) -> VisualViewport:
         scrollWidth=_get_number(viewport, "scrollWidth"),
         scrollHeight=_get_number(viewport, "scrollHeight"),
     )
+
+
+def pagesnapshot_from_dict(
+    snapshot: Dict[str, Any], url: str, screenshot: Optional[bytes] = None
+) -> PageSnapshot:
+    focused = snapshot["focusedElementId"]
+    return PageSnapshot(
+        url=url,
+        title=_get_str(snapshot, "title"),
+        interactive_rects={
+            k: interactiveregion_from_dict(v)
+            for k, v in snapshot["interactiveRects"].items()
+        },
+        visual_viewport=visualviewport_from_dict(snapshot["visualViewport"]),
+        focused_rect_id="" if focused is None else str(focused),
+        page_metadata=snapshot["pageMetadata"],
+        visible_text=_get_str(snapshot, "visibleText"),
+        screenshot=screenshot,
+    )
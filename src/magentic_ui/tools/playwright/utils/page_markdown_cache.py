@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from .text_workers import TextWorkerPool, decode_tokens, encode_tokens
+
+# Installs a MutationObserver on first use and returns "<document id>:<version>".
+# The version changes whenever the DOM does, except for the __elementId labels
+# (lowercased by the HTML parser) that page_script.js adds, which do not change
+# the page's markdown.
+DOM_FINGERPRINT_SCRIPT = """() => {
+    let state = window.__magenticMarkdownState;
+    if (!state) {
+        state = { version: 0 };
+        const onRecords = (records) => {
+            for (const record of records) {
+                if (record.type !== "attributes" || record.attributeName !== "__elementid") {
+                    state.version++;
+                    return;
+                }
+            }
+        };
+        state.onRecords = onRecords;
+        state.observer = new MutationObserver(onRecords);
+        state.observer.observe(document, {
+            subtree: true, childList: true, attributes: true, characterData: true,
+        });
+        window.__magenticMarkdownState = state;
+    }
+    state.onRecords(state.observer.takeRecords());
+    return performance.timeOrigin + ":" + state.version;
+}"""
+
+# Approximate bytes per cached token id
+_TOKEN_SIZE = array("I").itemsize
+
+
+@dataclass
+class PageMarkdownCacheMetrics:
+    """
+    Counters and gauges of a `PageMarkdownCache`.
+
+    Attributes:
+        hits (int): Lookups served from the cache.
+        misses (int): Lookups that required a conversion.
+        evictions (int): Entries dropped to respect the cache limits.
+        entries (int): Entries currently cached.
+        size (int): Approximate bytes currently cached.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+@dataclass
+class PageMarkdown:
+    """
+    Markdown of a page and, once a token limit was requested, its token ids.
+
+    Attributes:
+        markdown (str): The converted page.
+        tokens (array, optional): Token ids of the markdown. Default: None (not tokenized yet)
+        truncations (Dict[int, str]): Markdown already truncated, by token limit.
+    """
+
+    markdown: str
+    tokens: Optional[array[int]] = None
+    truncations: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        size = len(self.markdown) + sum(len(text) for text in self.truncations.values())
+        if self.tokens is not None:
+            size += len(self.tokens) * _TOKEN_SIZE
+        return size
+
+
+class PageMarkdownCache:
+    """
+    Process-wide LRU cache of converted page markdown.
+
+    Entries are keyed by the page URL plus a DOM fingerprint computed in the
+    page by `DOM_FINGERPRINT_SCRIPT`. The fingerprint identifies the document
+    and counts its mutations, so a cached entry is only returned while the
+    very same document is unchanged, without transferring or hashing its HTML.
+
+    Token ids are computed on the first request with a token limit and kept
+    with the entry, so later truncations of the same page do not encode it
+    again. The least recently used entries are evicted once there are more
+    than `max_entries` or their approximate size exceeds `max_size` bytes.
+
+    Args:
+        max_entries (int, optional): Maximum number of cached pages. Default: 64.
+        max_size (int, optional): Maximum approximate size in bytes. Default: 64 MiB.
+    """
+
+    def __init__(self, max_entries: int = 64, max_size: int = 64 * 1024 * 1024):
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._entries: OrderedDict[Tuple[str, str], PageMarkdown] = OrderedDict()
+        self._sizes: Dict[Tuple[str, str], int] = {}
+        self._size = 0
+        self._metrics = PageMarkdownCacheMetrics()
+
+    def get(self, url: str, fingerprint: str) -> Optional[PageMarkdown]:
+        """Look up the markdown of a page.
+
+        Args:
+            url (str): The page URL
+            fingerprint (str): The page's DOM fingerprint
+
+        Returns:
+            Optional[PageMarkdown]: The cached entry, or None on a miss
+        """
+        key = (url, fingerprint)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._metrics.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._metrics.hits += 1
+        return entry
+
+    def put(self, url: str, fingerprint: str, markdown: str) -> PageMarkdown:
+        """Cache the markdown of a page.
+
+        Args:
+            url (str): The page URL
+            fingerprint (str): The page's DOM fingerprint
+            markdown (str): The converted page
+
+        Returns:
+            PageMarkdown: The new entry, which is not retained if it exceeds `max_size` on its own
+        """
+        key = (url, fingerprint)
+        self._discard(key)
+        entry = PageMarkdown(markdown)
+        self._entries[key] = entry
+        self._account(key, entry)
+        return entry
+
+    async def truncate(
+        self,
+        entry: PageMarkdown,
+        max_tokens: int,
+        pool: TextWorkerPool,
+        tokenizer: Any = None,
+    ) -> str:
+        """Return the markdown of an entry limited to a number of tokens.
+
+        Encoding and decoding run on the worker pool.
+
+        Args:
+            entry (PageMarkdown): A cached entry
+            max_tokens (int): The maximum number of tokens, -1 for no limit
+            pool (TextWorkerPool): The pool that runs the tokenizer
+            tokenizer (Any, optional): A tiktoken encoding. Default: the gpt-4o encoding
+
+        Returns:
+            str: The possibly truncated markdown
+        """
+        if max_tokens == -1:
+            return entry.markdown
+        text = entry.truncations.get(max_tokens)
+        if text is not None:
+            return text
+        grew = entry.tokens is None
+        if entry.tokens is None:
+            entry.tokens = await pool.run(encode_tokens, entry.markdown, tokenizer)
+        text = entry.markdown
+        if len(entry.tokens) > max_tokens:
+            text = await pool.run(decode_tokens, entry.tokens, max_tokens, tokenizer)
+            entry.truncations[max_tokens] = text
+            grew = True
+        if grew:
+            # Account for the larger entry if it is still cached
+            for key, cached in self._entries.items():
+                if cached is entry:
+                    self._account(key, entry)
+                    break
+        return text
+
+    def metrics(self) -> PageMarkdownCacheMetrics:
+        """Return a snapshot of the cache counters.
+
+        Returns:
+            PageMarkdownCacheMetrics: The current metrics
+        """
+        self._metrics.entries = len(self._entries)
+        self._metrics.size = self._size
+        return PageMarkdownCacheMetrics(**vars(self._metrics))
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+        self._sizes.clear()
+        self._size = 0
+
+    def _account(self, key: Tuple[str, str], entry: PageMarkdown) -> None:
+        size = entry.size
+        self._size += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._size > self._max_size
+        ):
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self._metrics.evictions += 1
+
+    def _discard(self, key: Tuple[str, str]) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._size -= self._sizes.pop(key)
+
+
+_page_markdown_cache: Optional[PageMarkdownCache] = None
+
+
+def get_page_markdown_cache() -> PageMarkdownCache:
+    """Return the process-wide page markdown cache, creating it on first use."""
+    global _page_markdown_cache
+    if _page_markdown_cache is None:
+        _page_markdown_cache = PageMarkdownCache()
+    return _page_markdown_cache
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import io
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+import tiktoken
+from markitdown import MarkItDown  # type: ignore
+
+T = TypeVar("T")
+
+_converters = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def get_tokenizer(model: str = "gpt-4o") -> tiktoken.Encoding:
+    """Return the tiktoken encoding of a model, loaded once per process.
+
+    Args:
+        model (str, optional): The model name. Default: "gpt-4o"
+
+    Returns:
+        tiktoken.Encoding: The encoding
+    """
+    return tiktoken.encoding_for_model(model)
+
+
+def _get_converter() -> MarkItDown:
+    # One converter per worker thread, MarkItDown instances are not shared
+    converter = getattr(_converters, "converter", None)
+    if converter is None:
+        converter = MarkItDown()
+        _converters.converter = converter
+    return converter
+
+
+def html_to_markdown(html: str, url: Optional[str] = None) -> str:
+    """Convert an HTML document to markdown with MarkItDown.
+
+    Args:
+        html (str): The HTML document
+        url (str, optional): The document's URL, used by URL-specific converters. Default: None
+
+    Returns:
+        str: The markdown
+    """
+    res = _get_converter().convert_stream(
+        io.BytesIO(html.encode("utf-8")), file_extension=".html", url=url
+    )  # type: ignore
+    return res.text_content  # type: ignore
+
+
+def file_to_markdown(path: str) -> str:
+    """Convert a local file, e.g. a downloaded PDF, to markdown with MarkItDown.
+
+    Args:
+        path (str): Path of the file
+
+    Returns:
+        str: The markdown
+    """
+    return _get_converter().convert(path).text_content  # type: ignore
+
+
+def encode_tokens(text: str, tokenizer: Any = None) -> array[int]:
+    """Encode a text into compact token ids.
+
+    Args:
+        text (str): The text
+        tokenizer (Any, optional): A tiktoken encoding. Default: the gpt-4o encoding
+
+    Returns:
+        array[int]: The token ids
+    """
+    return array("I", (tokenizer or get_tokenizer()).encode(text))
+
+
+def decode_tokens(tokens: array[int], max_tokens: int, tokenizer: Any = None) -> str:
+    """Decode the first `max_tokens` token ids back to text.
+
+    Args:
+        tokens (array[int]): The token ids
+        max_tokens (int): Number of leading tokens to decode
+        tokenizer (Any, optional): A tiktoken encoding. Default: the gpt-4o encoding
+
+    Returns:
+        str: The decoded text
+    """
+    return (tokenizer or get_tokenizer()).decode(tokens[:max_tokens].tolist())
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Limit a text to a number of gpt-4o tokens.
+
+    Args:
+        text (str): The text
+        max_tokens (int): The maximum number of tokens, -1 for no limit
+
+    Returns:
+        str: The possibly truncated text
+    """
+    if max_tokens == -1:
+        return text
+    tokenizer = get_tokenizer()
+    return tokenizer.decode(tokenizer.encode(text)[:max_tokens])
+
+
+class TextWorkerPool:
+    """
+    Bounded thread pool for CPU-bound text processing off the event loop.
+
+    Markdown conversion and tokenization of large pages take hundreds of
+    milliseconds, which stalls every other run served by the same event loop.
+    `run` executes such a function on one of `max_workers` threads. tiktoken
+    releases the GIL while encoding, and a converting thread yields the GIL to
+    the event loop at every switch interval, so the loop stays responsive.
+
+    At most `max_pending` jobs are submitted at once; further callers wait for
+    a slot instead of queueing unbounded work (and the documents it holds).
+
+    Args:
+        max_workers (int, optional): Number of worker threads. Default: 2.
+        max_pending (int, optional): Maximum number of submitted jobs. Default: 8.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8) -> None:
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a function on a worker thread, waiting for a free slot first.
+
+        Args:
+            func (Callable[..., T]): The function to run
+            *args (Any): Its positional arguments
+
+        Returns:
+            T: The function's result
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="text-worker"
+                )
+            if self._loop is not loop:
+                # Semaphores belong to one event loop
+                self._slots = asyncio.Semaphore(self._max_pending)
+                self._loop = loop
+            executor, slots = self._executor, self._slots
+        assert slots is not None
+        async with slots:
+            return await loop.run_in_executor(executor, func, *args)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once their current jobs are done."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+_text_worker_pool: Optional[TextWorkerPool] = None
+
+
+def get_text_worker_pool() -> TextWorkerPool:
+    """Return the process-wide text worker pool, creating it on first use."""
+    global _text_worker_pool
+    if _text_worker_pool is None:
+        _text_worker_pool = TextWorkerPool()
+    return _text_worker_pool
@@ -1,19 +1,38 @@
-import io
-from typing import Any, Optional
+from typing import Optional
 import logging
 import os
 import tempfile
 
-import tiktoken
-from markitdown import MarkItDown  # type: ignore
 from playwright.async_api import Page
 
+from .page_markdown_cache import (
+    DOM_FINGERPRINT_SCRIPT,
+    PageMarkdownCache,
+    get_page_markdown_cache,
+)
+from .text_workers import (
+    TextWorkerPool,
+    file_to_markdown,
+    get_text_worker_pool,
+    html_to_markdown,
+    truncate_tokens,
+)
+
 logger = logging.getLogger(__name__)
 
 
+PDF_EXTRACTION_ERROR = "Error extracting PDF content"
+
+
 class WebpageTextUtilsPlaywright:
-    def __init__(self):
-        self._markdown_converter: Optional[Any] | None = None
+    def __init__(
+        self,
+        markdown_cache: Optional[PageMarkdownCache] = None,
+        worker_pool: Optional[TextWorkerPool] = None,
+    ):
+        self._markdown_cache = markdown_cache or get_page_markdown_cache()
+        # Conversion and tokenization run off the event loop
+        self._worker_pool = worker_pool or get_text_worker_pool()
         self._page_script: str = ""
 
         # Read page_script
@@ -80,40 +99,55 @@ class WebpageTextUtilsPlaywright:
             str: The markdown content of the page or extracted PDF content.
         """
 
-        # Check if the current page is a PDF
-        is_pdf = await self._is_pdf_page(page)
-
-        if is_pdf:
-            # Extract PDF content
-            pdf_content = await self._extract_pdf_content(page)
-
-            # Tokenize the PDF content and limit to max_tokens if needed
-            if max_tokens == -1:
-                return pdf_content
+        # Unchanged pages are served from the cache
+        fingerprint = await self._dom_fingerprint(page)
+        url = page.url
+        entry = None
+        if fingerprint is not None:
+            entry = self._markdown_cache.get(url, fingerprint)
+        if entry is None:
+            markdown = await self._convert_page(page)
+            if fingerprint is None or markdown.startswith(PDF_EXTRACTION_ERROR):
+                if max_tokens == -1:
+                    return markdown
+                return await self._worker_pool.run(
+                    truncate_tokens, markdown, max_tokens
+                )
+            entry = self._markdown_cache.put(url, fingerprint, markdown)
+
+        return await self._markdown_cache.truncate(entry, max_tokens, self._worker_pool)
+
+    async def _convert_page(self, page: Page) -> str:
+        """Convert the page to markdown, extracting the text of PDF documents.
 
-            tokenizer = tiktoken.encoding_for_model("gpt-4o")
-            tokens = tokenizer.encode(pdf_content)
-            limited_content = tokenizer.decode(tokens[:max_tokens])
+        Args:
+            page (Page): The Playwright page object.
 
-            return limited_content
+        Returns:
+            str: The markdown content of the page or extracted PDF content.
+        """
+        # Check if the current page is a PDF
+        if await self._is_pdf_page(page):
+            return await self._extract_pdf_content(page)
 
         # Regular webpage processing
-        if self._markdown_converter is None:
-            self._markdown_converter = MarkItDown()
         html = await page.evaluate("document.documentElement.outerHTML;")
-        res = self._markdown_converter.convert_stream(
-            io.BytesIO(html.encode("utf-8")), file_extension=".html", url=page.url
-        )  # type: ignore
-        text_content = res.text_content  # type: ignore
+        return await self._worker_pool.run(html_to_markdown, html, page.url)
 
-        # Tokenize the text content and limit to max_tokens
-        if max_tokens == -1:
-            return text_content
-        tokenizer = tiktoken.encoding_for_model("gpt-4o")
-        tokens = tokenizer.encode(text_content)
-        limited_text_content = tokenizer.decode(tokens[:max_tokens])
+    async def _dom_fingerprint(self, page: Page) -> Optional[str]:
+        """Identify the page's document and its DOM version, computed in the page.
 
-        return limited_text_content
+        Args:
+            page (Page): The Playwright page object.
+
+        Returns:
+            Optional[str]: The fingerprint, or None if it could not be computed.
+        """
+        try:
+            fingerprint = await page.evaluate(DOM_FINGERPRINT_SCRIPT)
+        except Exception:
+            return None
+        return fingerprint if isinstance(fingerprint, str) else None
 
     async def _is_pdf_page(self, page: Page) -> bool:
         """Check if the current page is a PDF document.
@@ -175,18 +209,16 @@ class WebpageTextUtilsPlaywright:
                 temp_file.write(pdf_data)
 
             # Use MarkItDown to extract content
-            if self._markdown_converter is None:
-                self._markdown_converter = MarkItDown()
-            result = self._markdown_converter.convert(temp_file_path)
+            text_content = await self._worker_pool.run(file_to_markdown, temp_file_path)
 
             # Clean up the temporary file
             os.unlink(temp_file_path)
 
-            return result.text_content
+            return text_content
 
         except Exception as e:
-            logger.error(f"Error extracting PDF content: {str(e)}")
-            return f"Error extracting PDF content: {str(e)}"
+            logger.error(f"{PDF_EXTRACTION_ERROR}: {str(e)}")
+            return f"{PDF_EXTRACTION_ERROR}: {str(e)}"
 
     async def _extract_pdf_browser(self, page: Page) -> str:
         """Extract text content from a PDF page using browser methods.
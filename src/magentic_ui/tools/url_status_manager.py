@@ -1,4 +1,5 @@
-from typing import Dict, List, Literal
+from functools import lru_cache
+from typing import Dict, List, Literal, NamedTuple, Tuple
 import tldextract
 from urllib.parse import urlparse
 
@@ -8,6 +9,75 @@ URL_REJECTED: Literal["rejected"] = "rejected"
 UrlStatus = Literal["allowed", "rejected"]
 
 
+class _ParsedUrl(NamedTuple):
+    scheme: str
+    subdomain: str
+    domain: str
+    suffix: str
+    path: str
+
+
+@lru_cache(maxsize=4096)
+def _parse_url(url: str) -> _ParsedUrl:
+    # If no scheme is provided, assume http
+    if not urlparse(url).scheme:
+        url = "http://" + url
+    parsed = urlparse(url)
+    extracted = tldextract.extract(url)
+    return _ParsedUrl(
+        parsed.scheme,
+        extracted.subdomain,
+        extracted.domain,
+        extracted.suffix,
+        parsed.path,
+    )
+
+
+def _matches(registered: _ParsedUrl, proposed: _ParsedUrl) -> bool:
+    # if both urls have a scheme, check if they are the same (http and https are treated as the same)
+    http_equivalent_schemes = ["http", "https"]
+    if (
+        registered.scheme in http_equivalent_schemes
+        and proposed.scheme in http_equivalent_schemes
+    ):
+        pass
+    elif registered.scheme != proposed.scheme:
+        return False
+
+    # Check each component of the URL
+    # TODO: what to do about params, query, and fragment components?
+    if registered.subdomain and registered.subdomain != proposed.subdomain:
+        return False
+    if registered.domain != proposed.domain:
+        return False
+    if registered.suffix and proposed.suffix != registered.suffix:
+        return False
+    if registered.path and not proposed.path.startswith(registered.path):
+        return False
+    return True
+
+
+class _UrlIndex:
+    """Registered URL patterns grouped by domain, which every match requires to be equal."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, Dict[str, Tuple[_ParsedUrl, str]]] = {}
+
+    def add(self, url: str, value: str) -> None:
+        parsed = _parse_url(url)
+        self._buckets.setdefault(parsed.domain, {})[url] = (parsed, value)
+
+    def matching_values(self, proposed: _ParsedUrl) -> List[str]:
+        bucket = self._buckets.get(proposed.domain)
+        if not bucket:
+            return []
+        return [
+            value
+            for registered, value in bucket.values()
+            if _matches(registered, proposed)
+        ]
+
+
 class UrlStatusManager:
     """
     A class to manage URL access control through allow/reject lists and explicit blocking.
@@ -17,11 +87,19 @@ class UrlStatusManager:
     2. For remaining URLs, if no status list is defined (None), all URLs are allowed
     3. Otherwise, URL must explicitly match an allowed pattern and not match any rejected patterns
 
+    Registered URLs are parsed once and indexed by domain, so a check only
+    compares the URL against the few patterns of its own domain, and the
+    answer for a URL is memoized until the lists change. Update statuses with
+    `set_url_status` so that the index stays in sync.
+
     Note:
         Overlapping URLs with different statuses will result in undefined behavior.
         Example: { "example.com": "allowed", "example.com/foo": "rejected" }
     """
 
+    # Memoized answers kept before the memo is cleared
+    MAX_MEMOIZED_URLS = 4096
+
     url_statuses: Dict[str, UrlStatus] | None
     # TODO: There's a lot of logic around url_statuses being None. Use a separate list to check if a url is explicitly blocked
     url_block_list: List[str] | None
@@ -45,6 +123,15 @@ class UrlStatusManager:
 
         self.url_block_list = url_block_list
 
+        self._status_index = _UrlIndex()
+        for site, status in (self.url_statuses or {}).items():
+            self._status_index.add(site, status)
+        self._block_index = _UrlIndex()
+        for site in url_block_list or []:
+            self._block_index.add(site, site)
+        # url -> (blocked, matches an allowed site, matches a rejected site)
+        self._decisions: Dict[str, Tuple[bool, bool, bool]] = {}
+
     def set_url_status(self, url: str, status: UrlStatus) -> None:
         """
         Adds a website to the manager. No-op if initialization parameter was None
@@ -58,6 +145,8 @@ class UrlStatusManager:
             # Trailing slash messes up the comparison later on
             url = url.rstrip("/")
             self.url_statuses[url] = status
+            self._status_index.add(url, status)
+            self._decisions.clear()
 
     def _is_url_match(self, registered_url: str, proposed_url: str) -> bool:
         """
@@ -70,44 +159,28 @@ class UrlStatusManager:
         Returns:
             bool: True if the proposed URL matches the registered URL pattern, False otherwise.
         """
-        # If no scheme is provided, assume http
-        if not urlparse(registered_url).scheme:
-            registered_url = "http://" + registered_url
-        if not urlparse(proposed_url).scheme:
-            proposed_url = "http://" + proposed_url
-
-        parsed_registered_url = urlparse(registered_url)
-        parsed_proposed_url = urlparse(proposed_url)
-        extracted_registered_url = tldextract.extract(registered_url)
-        extracted_proposed_url = tldextract.extract(proposed_url)
-
-        # if both urls have a scheme, check if they are the same (http and https are treated as the same)
-        http_equivalent_schemes = ["http", "https"]
-        if (
-            parsed_registered_url.scheme in http_equivalent_schemes
-            and parsed_proposed_url.scheme in http_equivalent_schemes
-        ):
-            pass
-        elif parsed_registered_url.scheme != parsed_proposed_url.scheme:
-            return False
+        return _matches(_parse_url(registered_url), _parse_url(proposed_url))
 
-        # Check each component of the URL
-        # TODO: what to do about params, query, and fragment components?
-        if extracted_registered_url.subdomain:
-            if extracted_registered_url.subdomain != extracted_proposed_url.subdomain:
-                return False
-        if extracted_registered_url.domain != extracted_proposed_url.domain:
-            return False
-        if (
-            extracted_registered_url.suffix
-            and extracted_proposed_url.suffix != extracted_registered_url.suffix
-        ):
-            return False
-        if parsed_registered_url.path:
-            if not parsed_proposed_url.path.startswith(parsed_registered_url.path):
-                return False
+    def _decide(self, url: str) -> Tuple[bool, bool, bool]:
+        """
+        Looks up which registered sites match a url.
 
-        return True
+        Args:
+            url (str): The website to check.
+
+        Returns:
+            Tuple[bool, bool, bool]: Whether the url is blocked, matches an allowed site and matches a rejected site.
+        """
+        decision = self._decisions.get(url)
+        if decision is None:
+            proposed = _parse_url(url)
+            blocked = bool(self._block_index.matching_values(proposed))
+            statuses = self._status_index.matching_values(proposed)
+            decision = (blocked, URL_ALLOWED in statuses, URL_REJECTED in statuses)
+            if len(self._decisions) >= self.MAX_MEMOIZED_URLS:
+                self._decisions.clear()
+            self._decisions[url] = decision
+        return decision
 
     def is_url_blocked(self, url: str) -> bool:
         """
@@ -121,9 +194,7 @@ class UrlStatusManager:
         """
         if self.url_block_list is None:
             return False
-        if any(self._is_url_match(site, url) for site in self.url_block_list):
-            return True
-        return False
+        return self._decide(url)[0]
 
     def is_url_rejected(self, url: str) -> bool:
         """
@@ -135,16 +206,12 @@ class UrlStatusManager:
         Returns:
             bool: True if the url was rejected by the user, False otherwise.
         """
-        if self.is_url_blocked(url):
+        blocked, _, rejected = self._decide(url)
+        if blocked:
             return True
         if self.url_statuses is None:
             return False
-        if any(
-            self._is_url_match(site, url) and self.url_statuses[site] == URL_REJECTED
-            for site in self.url_statuses
-        ):
-            return True
-        return False
+        return rejected
 
     def is_url_allowed(self, url: str) -> bool:
         """
@@ -156,16 +223,12 @@ class UrlStatusManager:
         Returns:
             bool: True if the url is allowed, False otherwise.
         """
-        if self.is_url_blocked(url):
+        blocked, allowed, _ = self._decide(url)
+        if blocked:
             return False
         if self.url_statuses is None:
             return True
-        if not any(
-            self._is_url_match(site, url) and self.url_statuses[site] == URL_ALLOWED
-            for site in self.url_statuses
-        ):
-            return False
-        return True
+        return allowed
 
     def get_allowed_sites(self) -> List[str] | None:
         """
@@ -119,6 +119,48 @@ def dict_to_str(data: Union[JsonDict, str]) -> str:
         raise ValueError("Unexpected input type")
 
 
+def message_to_context(
+    m: BaseAgentEvent | BaseChatMessage,
+    agent_name: str,
+) -> List[LLMMessage]:
+    """Convert one message of the thread to the model messages it contributes."""
+    if isinstance(m, ToolCallRequestEvent | ToolCallExecutionEvent):
+        # Ignore tool call messages.
+        return []
+    elif isinstance(m, StopMessage | HandoffMessage):
+        return [UserMessage(content=m.content, source=m.source)]
+    elif m.source == agent_name:
+        assert isinstance(m, TextMessage), f"{type(m)}"
+        return [AssistantMessage(content=m.content, source=m.source)]
+    elif m.source == "user_proxy" or m.source == "user":
+        assert isinstance(m, TextMessage | MultiModalMessage), f"{type(m)}"
+        if isinstance(m.content, str):
+            human_input = HumanInputFormat.from_str(m.content)
+            content = f"{human_input.content}"
+            if human_input.plan is not None:
+                content += f"\n\nI created the following plan: {human_input.plan}"
+            return [UserMessage(content=content, source=m.source)]
+        else:
+            # If content is a list, transform only the string part
+            content_list = list(m.content)  # Create a copy of the list
+            for i, item in enumerate(content_list):
+                if isinstance(item, str):
+                    human_input = HumanInputFormat.from_str(item)
+                    content_list[i] = f"{human_input.content}"
+                    if human_input.plan is not None and isinstance(
+                        content_list[i], str
+                    ):
+                        content_list[i] = (
+                            f"{content_list[i]}\n\nI created the following plan: {human_input.plan}"
+                        )
+            return [UserMessage(content=content_list, source=m.source)]  # type: ignore
+    else:
+        assert isinstance(m, BaseTextChatMessage) or isinstance(
+            m, MultiModalMessage
+        ), f"{type(m)}"
+        return [UserMessage(content=m.content, source=m.source)]
+
+
 def thread_to_context(
     messages: List[BaseAgentEvent | BaseChatMessage],
     agent_name: str,
@@ -127,41 +169,7 @@ def thread_to_context(
     """Convert the message thread to a context for the model."""
     context: List[LLMMessage] = []
     for m in messages:
-        if isinstance(m, ToolCallRequestEvent | ToolCallExecutionEvent):
-            # Ignore tool call messages.
-            continue
-        elif isinstance(m, StopMessage | HandoffMessage):
-            context.append(UserMessage(content=m.content, source=m.source))
-        elif m.source == agent_name:
-            assert isinstance(m, TextMessage), f"{type(m)}"
-            context.append(AssistantMessage(content=m.content, source=m.source))
-        elif m.source == "user_proxy" or m.source == "user":
-            assert isinstance(m, TextMessage | MultiModalMessage), f"{type(m)}"
-            if isinstance(m.content, str):
-                human_input = HumanInputFormat.from_str(m.content)
-                content = f"{human_input.content}"
-                if human_input.plan is not None:
-                    content += f"\n\nI created the following plan: {human_input.plan}"
-                context.append(UserMessage(content=content, source=m.source))
-            else:
-                # If content is a list, transform only the string part
-                content_list = list(m.content)  # Create a copy of the list
-                for i, item in enumerate(content_list):
-                    if isinstance(item, str):
-                        human_input = HumanInputFormat.from_str(item)
-                        content_list[i] = f"{human_input.content}"
-                        if human_input.plan is not None and isinstance(
-                            content_list[i], str
-                        ):
-                            content_list[i] = (
-                                f"{content_list[i]}\n\nI created the following plan: {human_input.plan}"
-                            )
-                context.append(UserMessage(content=content_list, source=m.source))  # type: ignore
-        else:
-            assert isinstance(m, BaseTextChatMessage) or isinstance(
-                m, MultiModalMessage
-            ), f"{type(m)}"
-            context.append(UserMessage(content=m.content, source=m.source))
+        context.extend(message_to_context(m, agent_name))
     if is_multimodal:
         return context
     else:
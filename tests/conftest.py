@@ -0,0 +1,15 @@
+import pytest_asyncio
+
+from magentic_ui.backend.database import DatabaseManager
+
+
+@pytest_asyncio.fixture
+async def db_manager(tmp_path):
+    """A DatabaseManager backed by a fresh SQLite file."""
+    manager = DatabaseManager(
+        engine_uri=f"sqlite:///{tmp_path / 'test.db'}", base_dir=tmp_path
+    )
+    response = manager.initialize_database()
+    assert response.status, response.message
+    yield manager
+    await manager.close()
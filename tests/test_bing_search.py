@@ -0,0 +1,55 @@
+import asyncio
+
+from magentic_ui.tools.bing_search import BingSearchResults, SearchResultFetcher
+
+
+class CountingFetcher(SearchResultFetcher):
+    def __init__(self, **kwargs) -> None:  # type: ignore
+        super().__init__(**kwargs)
+        self.searches = 0
+
+    async def _search(self, query, max_pages, timeout_seconds, max_tokens_per_page):  # type: ignore
+        self.searches += 1
+        if query == "nothing":
+            return BingSearchResults("", [], {}, "")
+        if query == "no pages" and max_pages > 0:
+            return BingSearchResults(f"results for {query}", [], {}, "")
+        return BingSearchResults(
+            f"results for {query}", [], {"https://example.com": query}, ""
+        )
+
+
+def test_search_results_are_cached_per_query():
+    fetcher = CountingFetcher(max_cached_queries=2)
+
+    async def main() -> None:
+        first = await fetcher.search("flights")
+        assert await fetcher.search("flights") is first
+        await fetcher.search("flights", max_pages=5)
+        assert fetcher.searches == 2
+        # Failed searches are retried, the oldest query is evicted
+        await fetcher.search("nothing")
+        await fetcher.search("nothing")
+        await fetcher.search("hotels")
+        await fetcher.search("flights")
+        assert fetcher.searches == 6
+        # So are results without any page content, unless none was requested
+        await fetcher.search("no pages")
+        await fetcher.search("no pages")
+        assert fetcher.searches == 8
+        await fetcher.search("no pages", max_pages=0)
+        await fetcher.search("no pages", max_pages=0)
+        assert fetcher.searches == 9
+
+    asyncio.run(main())
+
+
+def test_cached_search_results_expire():
+    fetcher = CountingFetcher(cache_ttl=0)
+
+    async def main() -> None:
+        await fetcher.search("flights")
+        await fetcher.search("flights")
+
+    asyncio.run(main())
+    assert fetcher.searches == 2
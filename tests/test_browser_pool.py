@@ -0,0 +1,61 @@
+import pytest
+import pytest_asyncio
+
+from magentic_ui.tools.playwright.browser import BrowserPool
+
+HEADLESS = {"headless": True}
+
+
+@pytest_asyncio.fixture
+async def pool():
+    pool = BrowserPool(max_browsers=1, warm_contexts=1)
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+class TestBrowserPool:
+    async def test_warm_context_is_a_hit(self, pool: BrowserPool):
+        await pool.prewarm(HEADLESS)
+        assert pool.metrics().warm_contexts == 1
+
+        context = await pool.acquire(HEADLESS)
+        assert len(context.pages) == 1
+        metrics = pool.metrics()
+        assert (metrics.hits, metrics.misses, metrics.launches) == (1, 0, 1)
+        await pool.release(context)
+        assert pool.metrics().leased_contexts == 0
+
+    async def test_released_context_state_is_discarded(self, pool: BrowserPool):
+        first = await pool.acquire(HEADLESS)
+        await first.add_cookies(
+            [{"name": "run", "value": "1", "url": "https://example.com"}]
+        )
+        await pool.release(first)
+
+        second = await pool.acquire(HEADLESS)
+        assert second is not first
+        assert await second.cookies() == []
+        # The browser itself was reused
+        assert pool.metrics().launches == 1
+        await pool.release(second)
+
+    async def test_idle_browser_evicted_for_new_options(self, pool: BrowserPool):
+        context = await pool.acquire(HEADLESS)
+        await pool.release(context)
+
+        other = await pool.acquire(HEADLESS, {"locale": "de-DE"})
+        metrics = pool.metrics()
+        assert (metrics.evictions, metrics.browsers, metrics.launches) == (1, 1, 2)
+        await pool.release(other)
+
+    async def test_busy_pool_launches_unretained_browser(self, pool: BrowserPool):
+        busy = await pool.acquire(HEADLESS)
+        overflow = await pool.acquire(HEADLESS, {"locale": "de-DE"})
+        assert pool.metrics().browsers == 1
+
+        browser = overflow.browser
+        assert browser is not None
+        await pool.release(overflow)
+        assert not browser.is_connected()
+        await pool.release(busy)
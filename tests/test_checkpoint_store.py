@@ -0,0 +1,91 @@
+import pytest
+
+from magentic_ui.backend.database import CheckpointStore, DatabaseManager
+from magentic_ui.backend.database.checkpoint_store import join_state, split_state
+from magentic_ui.backend.datamodel import CheckpointBlob, Run, Session
+from magentic_ui.backend.utils.utils import compress_state
+
+
+def _team_state(num_messages: int) -> dict:
+    history = [
+        {"source": "user" if i % 2 else "orchestrator", "content": f"message {i}"}
+        for i in range(num_messages)
+    ]
+    return {
+        "type": "TeamState",
+        "version": "1.0.0",
+        "agent_states": {
+            "orchestrator": {
+                "message_history": history,
+                "plan": {"task": "t", "steps": [{"title": "a"}, {"title": "b"}]},
+                "current_step_idx": 1,
+            },
+            "web_surfer": {
+                "type": "ChatAgentContainerState",
+                "agent_state": {"chat_history": history[::2]},
+                "message_buffer": [],
+            },
+        },
+    }
+
+
+async def _create_run(db_manager: DatabaseManager) -> Run:
+    session = (await db_manager.upsert(Session(user_id="u1"), return_json=False)).data
+    return (
+        await db_manager.upsert(
+            Run(session_id=session.id, user_id="u1", task=None), return_json=False
+        )
+    ).data
+
+
+async def _blob_count(db_manager: DatabaseManager, run: Run) -> int:
+    response = await db_manager.get(CheckpointBlob, filters={"run_id": run.id})
+    return len(response.data)
+
+
+def test_split_join_roundtrip():
+    state = _team_state(100)
+    manifest, segments = split_state(state, chunk_size=16, min_thread_length=4)
+    assert join_state(manifest, segments) == state
+
+    # Appending a message only adds the new last chunk and the unchanged rest is shared
+    _, next_segments = split_state(_team_state(101), chunk_size=16, min_thread_length=4)
+    assert len(set(next_segments) - set(segments)) == 2
+
+
+@pytest.mark.asyncio
+async def test_save_is_incremental_and_loads(db_manager: DatabaseManager):
+    run = await _create_run(db_manager)
+    store = CheckpointStore(db_manager, chunk_size=16, compact_every=1000)
+
+    await store.save(run.id, _team_state(70))
+    first = await _blob_count(db_manager, run)
+    stored = await store.save(run.id, _team_state(71))
+    assert await _blob_count(db_manager, run) - first == 2
+
+    fresh_store = CheckpointStore(db_manager, chunk_size=16)
+    assert await fresh_store.load(run.id, stored) == _team_state(71)
+
+
+@pytest.mark.asyncio
+async def test_compaction_removes_unreferenced_segments(db_manager: DatabaseManager):
+    run = await _create_run(db_manager)
+    store = CheckpointStore(db_manager, chunk_size=16, compact_every=1000)
+
+    for n in range(40, 60):
+        stored = await store.save(run.id, _team_state(n))
+    await store.close(run.id)
+
+    manifest_only = CheckpointStore(db_manager, chunk_size=16)
+    _, segments = split_state(_team_state(59), chunk_size=16)
+    assert await _blob_count(db_manager, run) == len(segments)
+    assert await manifest_only.load(run.id, stored) == _team_state(59)
+
+
+@pytest.mark.asyncio
+async def test_load_passes_legacy_state_through(db_manager: DatabaseManager):
+    store = CheckpointStore(db_manager)
+    legacy = compress_state(_team_state(3))
+    assert await store.load(1, legacy) == legacy
+    assert await store.load(1, '{"agent_states": {}}') == '{"agent_states": {}}'
+    assert await store.load(1, None) is None
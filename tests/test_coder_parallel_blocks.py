@@ -0,0 +1,103 @@
+import time
+from pathlib import Path
+
+import pytest
+from autogen_agentchat.messages import TextMessage
+from autogen_core import CancellationToken
+from autogen_core.code_executor import CodeBlock
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from magentic_ui.agents import CoderAgent
+from magentic_ui.agents._coder import _code_block_dependencies
+
+
+def test_dependencies_follow_files_installs_and_barriers():
+    blocks = [
+        CodeBlock(language="sh", code="pip install tabulate\n"),
+        CodeBlock(language="sh", code="wget https://example.com/data/sales.csv\n"),
+        CodeBlock(
+            language="python",
+            code="import pandas as pd\nprint(pd.read_csv('sales.csv').sum())\n",
+        ),
+        CodeBlock(language="python", code="print(sum(range(10)))\n"),
+        CodeBlock(language="sh", code="mv sales.csv archive/\n"),
+        CodeBlock(language="python", code="# independent\nprint('hello')\n"),
+    ]
+    assert _code_block_dependencies(blocks) == [
+        [],
+        [],
+        [0, 1],
+        [0, 1, 2],
+        [0, 1, 2, 3],
+        [],
+    ]
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        (
+            CodeBlock(language="python", code="# filename: helpers.py\nX = 1\n"),
+            CodeBlock(language="python", code="from helpers import X\nprint(X)\n"),
+        ),
+        (
+            CodeBlock(language="sh", code="curl https://example.com/d -o dataset\n"),
+            CodeBlock(language="python", code="print(open('dataset').read())\n"),
+        ),
+        (
+            CodeBlock(language="python", code="open('out.json', 'w').write('{}')\n"),
+            CodeBlock(
+                language="python", code="import glob\nprint(glob.glob('*.json'))\n"
+            ),
+        ),
+    ],
+)
+def test_unmarked_blocks_wait_for_earlier_blocks(first: CodeBlock, second: CodeBlock):
+    assert _code_block_dependencies([first, second]) == [[], [0]]
+
+
+def test_downloads_writing_the_same_file_wait_for_each_other():
+    blocks = [
+        CodeBlock(language="sh", code="curl https://example.com/a -o dataset\n"),
+        CodeBlock(language="sh", code="curl https://example.com/b > dataset\n"),
+        CodeBlock(language="sh", code="wget -O other https://example.com/c\n"),
+        CodeBlock(language="sh", code="wget https://example.com/files/other\n"),
+    ]
+    assert _code_block_dependencies(blocks) == [[], [0], [], [2]]
+
+
+@pytest.mark.asyncio
+async def test_independent_blocks_run_concurrently_in_order(tmp_path: Path):
+    reply = "\n".join(
+        f"```python\n# independent\nimport time\ntime.sleep(1)\nprint('block {n}')\n```"
+        for n in range(3)
+    )
+    coder = CoderAgent(
+        name="coder_agent",
+        model_client=ReplayChatCompletionClient([reply, "Done."]),
+        work_dir=tmp_path,
+        use_local_executor=True,
+        max_parallel_code_blocks=3,
+    )
+    await coder.lazy_init()
+    try:
+        start = time.perf_counter()
+        response = await coder.on_messages(
+            [TextMessage(content="Run three scripts.", source="user")],
+            CancellationToken(),
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        await coder.close()
+
+    executions = [
+        message
+        for message in response.inner_messages or []
+        if isinstance(message, TextMessage)
+        and message.metadata.get("type") == "code_execution"
+    ]
+    assert len(executions) == 3
+    for n, message in enumerate(executions):
+        assert f"block {n}" in message.content
+    assert all(float(m.metadata["execution_seconds"]) >= 1 for m in executions)
+    assert elapsed < 2.5
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from magentic_ui.backend.database import DatabaseManager
+from magentic_ui.backend.database.db_manager import to_async_uri
+from magentic_ui.backend.datamodel import Message, Run, RunStatus, Session
+
+
+def test_to_async_uri():
+    assert to_async_uri("sqlite:///db.sqlite3") == "sqlite+aiosqlite:///db.sqlite3"
+    assert (
+        to_async_uri("postgresql://user:pw@localhost:5432/db")
+        == "postgresql+psycopg://user:pw@localhost:5432/db"
+    )
+    assert to_async_uri("postgresql+psycopg://h/db") == "postgresql+psycopg://h/db"
+
+
+@pytest.mark.asyncio
+async def test_upsert_get_delete(db_manager: DatabaseManager):
+    created = await db_manager.upsert(Session(user_id="u1", name="first"))
+    assert created.status
+    session_id = created.data["id"]
+
+    updated = await db_manager.upsert(
+        Session(id=session_id, user_id="u1", name="renamed")
+    )
+    assert updated.status
+    assert updated.message == "Session Updated Successfully"
+
+    fetched = await db_manager.get(Session, filters={"user_id": "u1"})
+    assert fetched.status
+    assert [s.name for s in fetched.data] == ["renamed"]
+
+    deleted = await db_manager.delete(Session, filters={"id": session_id})
+    assert deleted.status
+    assert (await db_manager.get(Session, filters={"user_id": "u1"})).data == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes(db_manager: DatabaseManager):
+    session = (await db_manager.upsert(Session(user_id="u1"), return_json=False)).data
+    runs = [
+        (
+            await db_manager.upsert(
+                Run(
+                    session_id=session.id,
+                    user_id="u1",
+                    status=RunStatus.ACTIVE,
+                    task=None,
+                ),
+                return_json=False,
+            )
+        ).data
+        for _ in range(4)
+    ]
+
+    async def write_messages(run: Run) -> None:
+        for i in range(10):
+            response = await db_manager.upsert(
+                Message(
+                    session_id=session.id,
+                    run_id=run.id,
+                    user_id="u1",
+                    config={"source": "agent", "content": str(i)},
+                )
+            )
+            assert response.status
+
+    await asyncio.gather(*(write_messages(run) for run in runs))
+
+    for run in runs:
+        messages = await db_manager.get(Message, filters={"run_id": run.id})
+        assert len(messages.data) == 10
+
+
+@pytest.mark.asyncio
+async def test_get_page_and_stream_walk_a_run_in_order(db_manager: DatabaseManager):
+    session = (await db_manager.upsert(Session(user_id="u1"), return_json=False)).data
+    run = (
+        await db_manager.upsert(
+            Run(
+                session_id=session.id,
+                user_id="u1",
+                status=RunStatus.ACTIVE,
+                task=None,
+            ),
+            return_json=False,
+        )
+    ).data
+    # Inserted within the same second, so the pages must break created_at ties
+    await db_manager.insert_many(
+        [
+            Message(
+                session_id=session.id,
+                run_id=run.id,
+                user_id="u1",
+                config={"source": "agent", "content": str(i)},
+            )
+            for i in range(7)
+        ]
+    )
+
+    contents, cursor = [], None
+    while True:
+        page = await db_manager.get_page(
+            Message, filters={"run_id": run.id}, limit=3, cursor=cursor
+        )
+        assert page.status and len(page.data["items"]) <= 3
+        contents += [message.config["content"] for message in page.data["items"]]
+        cursor = page.data["next_cursor"]
+        if cursor is None:
+            break
+    assert contents == [str(i) for i in range(7)]
+
+    streamed = [
+        message["config"]["content"]
+        async for message in db_manager.stream(
+            Message, filters={"run_id": run.id}, batch_size=2, return_json=True
+        )
+    ]
+    assert streamed == contents
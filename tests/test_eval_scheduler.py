@@ -0,0 +1,84 @@
+import json
+import os
+import time
+from typing import Optional
+
+import pytest
+
+from magentic_ui.eval.models import BaseCandidate
+from magentic_ui.eval.scheduler import (
+    CRASHED,
+    FAILED,
+    PENDING,
+    SUCCEEDED,
+    TIMED_OUT,
+    RunManifest,
+    TaskOutcome,
+    TaskScheduler,
+)
+
+
+def _run_task(task_id: str):
+    # Module level so that worker processes can run it
+    if task_id == "fail":
+        return task_id, None, 0.0
+    if task_id == "raise":
+        raise RuntimeError("boom")
+    if task_id == "hang":
+        time.sleep(60)
+    if task_id == "crash":
+        os._exit(3)
+    return task_id, BaseCandidate(answer=task_id), 0.5
+
+
+@pytest.mark.parametrize("parallel", [1, 2])
+def test_scheduler_retries_failures(parallel: int):
+    outcomes: list[TaskOutcome] = []
+    scheduler = TaskScheduler(
+        _run_task, parallel=parallel, max_retries=1, on_outcome=outcomes.append
+    )
+    results = scheduler.run(["a", "fail", "raise", "b"])
+
+    assert list(results) == ["a", "fail", "raise", "b"]
+    assert results["a"].status == SUCCEEDED
+    answer: Optional[BaseCandidate] = results["b"].answer
+    assert answer is not None and answer.answer == "b"
+    assert results["fail"].status == FAILED and results["fail"].attempt == 2
+    assert results["raise"].status == FAILED
+    assert results["raise"].error is not None and "boom" in results["raise"].error
+    # One retried attempt each for the two failing tasks
+    assert len(outcomes) == 6
+    assert sum(not outcome.final for outcome in outcomes) == 2
+
+
+def test_scheduler_replaces_hung_and_crashed_workers():
+    scheduler = TaskScheduler(_run_task, parallel=2, task_timeout=1.0)
+    start = time.monotonic()
+    results = scheduler.run(["hang", "crash", "a", "b", "c"])
+
+    assert time.monotonic() - start < 20
+    assert results["hang"].status == TIMED_OUT
+    assert results["crash"].status == CRASHED
+    assert all(results[task_id].status == SUCCEEDED for task_id in "abc")
+
+
+def test_manifest_resumes_unfinished_tasks(tmp_path):
+    manifest = RunManifest(str(tmp_path), ["a", "b", "c"])
+    manifest.mark_running("a", 1)
+    manifest.record(TaskOutcome("a", SUCCEEDED, 1, duration=2.0))
+    manifest.mark_running("b", 1)
+    manifest.record(TaskOutcome("b", FAILED, 1, error="no answer", final=False))
+    manifest.mark_running("c", 1)
+    # The run stops here, with "c" still running
+
+    resumed = RunManifest(str(tmp_path), ["a", "b", "c"])
+    assert resumed.remaining(["a", "b", "c"]) == ["b", "c"]
+    assert resumed.tasks["a"].duration == 2.0
+    assert resumed.tasks["b"].status == PENDING
+
+    with open(tmp_path / RunManifest.RESULTS_FILE) as f:
+        lines = [json.loads(line) for line in f]
+    assert [(line["task_id"], line["status"]) for line in lines] == [
+        ("a", SUCCEEDED),
+        ("b", FAILED),
+    ]
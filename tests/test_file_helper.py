@@ -0,0 +1,245 @@
+import asyncio
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
+
+from magentic_ui.agents.file_surfer._code_markdown_file_browser import (
+    CodeExecutorMarkdownFileBrowser,
+)
+from magentic_ui.agents.file_surfer import _file_helper
+from magentic_ui.agents.file_surfer._file_helper import FileIndex, _helper_dir
+
+
+async def _wait_for(condition: Callable[[], bool]) -> bool:
+    for _ in range(50):
+        if condition():
+            return True
+        await asyncio.sleep(0.1)
+    return False
+
+
+@pytest.mark.asyncio
+async def test_open_list_and_find_through_the_helper(tmp_path: Path):
+    (tmp_path / "notes.txt").write_text("hello from the notes")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "report.md").write_text("# Report\n\nAll good.")
+    executor = LocalCommandLineCodeExecutor(work_dir=tmp_path)
+    await executor.start()
+    browser = CodeExecutorMarkdownFileBrowser(executor)
+    try:
+        await browser.lazy_init()
+        assert "notes.txt" in browser.page_content
+        assert "docs/" in browser.page_content
+
+        # The first operation started the helper, the next ones use it
+        cwd = os.getcwd()
+        os.chdir(tmp_path)
+        try:
+            socket_path = Path(_helper_dir()) / "helper.sock"
+        finally:
+            os.chdir(cwd)
+        assert await _wait_for(socket_path.exists)
+
+        assert "hello from the notes" in await browser.open_path("notes.txt")
+        assert "All good." in await browser.open_path("docs/report.md")
+        await browser.open_path("missing.txt")
+        assert browser.page_title == "FileNotFoundError"
+
+        found = json.loads(await browser.find_files("report.md"))
+        assert found["perfect_match"] == os.path.join("docs", "report.md")
+    finally:
+        await browser.close()
+        await executor.stop()
+    assert await _wait_for(lambda: not socket_path.exists())
+
+
+def test_file_index_ranks_like_a_full_scan_and_follows_changes(tmp_path: Path):
+    for i in range(30):
+        directory = tmp_path / f"dir{i % 5}"
+        directory.mkdir(exist_ok=True)
+        (directory / f"report_{i}.md").write_text("")
+        (directory / f"notes_{i}.txt").write_text("")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "report.md").write_text("")
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        index = FileIndex(".")
+        found = index.find("report_3.md")
+        scores = [score for _, score in found["matches"]]
+        assert len(found["matches"]) == 20
+        assert scores == sorted(scores, reverse=True)
+        assert found["matches"][0] == (os.path.join("dir3", "report_3.md"), 1.0)
+        assert found["perfect_match"] == os.path.join("dir3", "report_3.md")
+        assert all("node_modules" not in path for path, _ in found["matches"])
+
+        (tmp_path / "dir1" / "summary.md").write_text("")
+        (tmp_path / "dir3" / "report_3.md").unlink()
+        assert index.find("summary.md")["perfect_match"] == os.path.join(
+            "dir1", "summary.md"
+        )
+        assert index.find("report_3.md")["perfect_match"] is None
+    finally:
+        os.chdir(cwd)
+
+
+def _write_pdf(path: Path, pages: List[str]) -> None:
+    count = len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids ["
+        + " ".join(f"{4 + 2 * i} 0 R" for i in range(count))
+        + f"] /Count {count} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    body = "%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n"
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+    body += f"startxref\n{xref}\n%%EOF\n"
+    path.write_bytes(body.encode("latin-1"))
+
+
+def test_conversions_are_cached_by_content(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(_file_helper, "CACHE_DIR", str(tmp_path / "cache"))
+    document = tmp_path / "page.html"
+    document.write_text("<h1>First</h1><p>Version one.</p>")
+    conversions = 0
+    converter = _file_helper._get_converter()
+
+    def counting_converter():
+        nonlocal conversions
+        conversions += 1
+        return converter
+
+    monkeypatch.setattr(_file_helper, "_get_converter", counting_converter)
+    first = _file_helper.open_path(str(document))
+    assert "Version one." in first["content"]
+    assert _file_helper.open_path(str(document)) == first
+    # A copy has the same content and is not converted again
+    copy = tmp_path / "copy.html"
+    copy.write_bytes(document.read_bytes())
+    assert _file_helper.open_path(str(copy)) == first
+    assert conversions == 1
+
+    # The same content is converted again for another extension
+    text = tmp_path / "page.txt"
+    text.write_bytes(document.read_bytes())
+    assert "<h1>First</h1>" in _file_helper.open_path(str(text))["content"]
+    assert conversions == 2
+
+    document.write_text("<h1>First</h1><p>Version two.</p>")
+    assert "Version two." in _file_helper.open_path(str(document))["content"]
+    assert conversions == 3
+
+    # Remembered digests are trimmed like documents
+    monkeypatch.setattr(_file_helper, "CACHE_MAX_KEYS", 2)
+    (tmp_path / "other.html").write_text("<p>Other.</p>")
+    _file_helper.open_path(str(tmp_path / "other.html"))
+    assert len(list((tmp_path / "cache" / "keys").iterdir())) == 2
+
+
+def test_large_pdfs_are_previewed_while_converting(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(_file_helper, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(_file_helper, "_serving", True)
+    monkeypatch.setattr(_file_helper, "LAZY_CONVERSION_BYTES", 0)
+    monkeypatch.setattr(_file_helper, "PREVIEW_PAGES", 1)
+    document = tmp_path / "book.pdf"
+    _write_pdf(document, [f"Chapter {i}" for i in range(1, 4)])
+
+    preview = _file_helper.open_path(str(document))
+    assert preview["partial"]
+    assert "Chapter 1" in preview["content"]
+    assert "Chapter 3" not in preview["content"]
+
+    full = _file_helper.open_path(str(document))
+    assert "partial" not in full
+    assert "Chapter 3" in full["content"]
+
+
+def test_helper_directory_of_another_user_is_not_trusted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    (tmp_path / "notes.txt").write_text("")
+    monkeypatch.chdir(tmp_path)
+    directory = Path(_helper_dir())
+    directory.mkdir(mode=0o775)
+    directory.chmod(0o775)  # Writable by the group
+    try:
+        (directory / "helper.sock").write_text("")
+        _file_helper.main("list", ".")
+        output = capsys.readouterr().out
+        result = json.loads(output.split(_file_helper.RESULT_PREFIX, 1)[1])
+        assert "notes.txt" in result["result"]
+        assert not (directory / "helper.py").exists()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_helper_errors_are_reported_without_starting_another_helper(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(_file_helper, "_serving", False)
+    directory = Path(_helper_dir())
+    helper = threading.Thread(target=_file_helper.serve, args=(10,))
+    helper.start()
+    try:
+        socket_path = directory / "helper.sock"
+        for _ in range(50):
+            if socket_path.exists():
+                break
+            helper.join(0.1)
+        with pytest.raises(RuntimeError, match="FileNotFoundError"):
+            _file_helper.main("list", "missing")
+        assert not (directory / "helper.py").exists()
+
+        # A second helper leaves the one that is serving alone
+        _file_helper.serve(10)
+        assert socket_path.exists()
+    finally:
+        _file_helper.main("stop", None)
+        helper.join()
+        capsys.readouterr()
+    assert not directory.exists()
+
+
+def test_cache_directory_of_another_user_is_not_used(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    cache.chmod(0o777)  # Anyone could plant documents
+    monkeypatch.setattr(_file_helper, "CACHE_DIR", str(cache))
+    document = tmp_path / "page.html"
+    document.write_text("<p>Real content.</p>")
+    assert "Real content." in _file_helper.open_path(str(document))["content"]
+    assert list(cache.iterdir()) == []
+
+    # A directory only the user can write to is made private and used
+    cache.chmod(0o755)
+    _file_helper.open_path(str(document))
+    assert cache.stat().st_mode & 0o777 == 0o700
+    assert sorted(p.name for p in cache.iterdir()) == ["documents", "keys"]
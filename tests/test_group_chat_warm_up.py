@@ -0,0 +1,73 @@
+import asyncio
+from typing import Sequence
+
+import pytest
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseChatMessage, TextMessage
+from autogen_core import CancellationToken
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from magentic_ui.teams import GroupChat
+from magentic_ui.teams.orchestrator.orchestrator_config import OrchestratorConfig
+
+
+class SlowStartAgent(BaseChatAgent):
+    def __init__(self, name: str, started: asyncio.Event, fail: bool = False):
+        super().__init__(name, "Starts a slow resource")
+        self.started = started
+        self.fail = fail
+
+    async def lazy_init(self) -> None:
+        await self.started.wait()
+        if self.fail:
+            raise RuntimeError("executor did not start")
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        return Response(chat_message=TextMessage(content="ok", source=self.name))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_warm_up_runs_in_background_and_reports_readiness():
+    browser, executor = asyncio.Event(), asyncio.Event()
+    team = GroupChat(
+        participants=[
+            SlowStartAgent("web_surfer", browser),
+            SlowStartAgent("coder_agent", executor, fail=True),
+        ],
+        model_client=ReplayChatCompletionClient(["ok"]),
+        orchestrator_config=OrchestratorConfig(),
+    )
+
+    team.start_warm_up()
+    await asyncio.sleep(0)
+    assert {name: r.status for name, r in team.readiness().items()} == {
+        "web_surfer": "pending",
+        "coder_agent": "pending",
+    }
+
+    browser.set()
+    await team.wait_until_ready("web_surfer")
+    assert team.readiness()["web_surfer"].status == "ready"
+    assert team.readiness()["coder_agent"].status == "pending"
+
+    executor.set()
+    with pytest.raises(RuntimeError, match="executor did not start"):
+        await team.lazy_init()
+    readiness = team.readiness()["coder_agent"]
+    assert (readiness.status, readiness.error) == ("failed", "executor did not start")
+    assert readiness.seconds is not None
+
+    # The executor started on first use, the stale warm-up error is not raised
+    team._participants[1].fail = False  # type: ignore
+    await team.lazy_init()
+    assert team.readiness()["coder_agent"].status == "ready"
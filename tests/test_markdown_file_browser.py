@@ -0,0 +1,69 @@
+import random
+import re
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
+
+from magentic_ui.agents.file_surfer._code_markdown_file_browser import (
+    CodeExecutorMarkdownFileBrowser,
+)
+
+WORDS = ["alpha", "beta", "gamma", "delta", "x" * 300, "[link](http://a.b)", "\n\n"]
+
+
+def _reference_pages(content: str, viewport_size: int) -> List[Tuple[int, int]]:
+    pages: List[Tuple[int, int]] = []
+    start_idx = 0
+    while start_idx < len(content):
+        end_idx = min(start_idx + viewport_size, len(content))
+        while end_idx < len(content) and content[end_idx - 1] not in [
+            " ",
+            "\t",
+            "\r",
+            "\n",
+        ]:
+            end_idx += 1
+        pages.append((start_idx, end_idx))
+        start_idx = end_idx
+    return pages
+
+
+def _reference_find(
+    browser: CodeExecutorMarkdownFileBrowser, nquery: str, starting_viewport: int
+) -> Optional[int]:
+    count = len(browser.viewport_pages)
+    for i in list(range(starting_viewport, count)) + list(range(starting_viewport)):
+        start, end = browser.viewport_pages[i]
+        content = browser.page_content[start:end]
+        ncontent = " " + (" ".join(re.split(r"\W+", content))).strip().lower() + " "
+        if re.search(nquery, ncontent):
+            return i
+    return None
+
+
+def test_pages_and_searches_match_the_per_page_scan(tmp_path: Path):
+    rng = random.Random(0)
+    browser = CodeExecutorMarkdownFileBrowser(
+        LocalCommandLineCodeExecutor(work_dir=tmp_path), viewport_size=200
+    )
+    for _ in range(5):
+        content = " ".join(rng.choice(WORDS) for _ in range(2000))
+        browser._set_page_content(content)
+        assert browser.viewport_pages == _reference_pages(content, 200)
+        for query in ["gamma", "alpha beta", "delta * alpha", "link", "missing"]:
+            nquery = re.sub(r"\*", "__STAR__", query)
+            nquery = " " + (" ".join(re.split(r"\W+", nquery))).strip() + " "
+            nquery = nquery.replace(" __STAR__ ", "__STAR__ ")
+            nquery = nquery.replace("__STAR__", ".*").lower()
+            for start in [0, 3, len(browser.viewport_pages) - 1]:
+                assert browser._find_next_viewport(query, start) == _reference_find(
+                    browser, nquery, start
+                )
+
+    browser._set_page_content("one two three " * 500)
+    browser.viewport_current_page = 2
+    assert browser.find_on_page("three") is not None
+    first = browser.viewport_current_page
+    browser.find_next()
+    assert browser.viewport_current_page == first + 1
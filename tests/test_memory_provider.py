@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from magentic_ui.learning.memory_provider import MemoryControllerProvider
+
+
+@pytest.fixture
+def provider(tmp_path: Path):
+    MemoryControllerProvider._instance = None
+    yield MemoryControllerProvider(
+        internal_workspace_root=tmp_path,
+        external_workspace_root=tmp_path,
+        max_resident=2,
+        idle_timeout=3600,
+    )
+    MemoryControllerProvider._instance = None
+
+
+def test_least_recently_used_controller_is_evicted_and_reloaded(provider):
+    client = ReplayChatCompletionClient(["ok"])
+    first = provider.get_memory_controller("alice", client)
+    provider.get_memory_controller("bob", client)
+    assert provider.get_memory_controller("alice", client) is first
+    provider.get_memory_controller("carol", client)
+
+    metrics = provider.metrics()
+    assert (metrics.resident, metrics.hits, metrics.loads) == (2, 1, 3)
+    assert metrics.evictions == 1
+    assert metrics.last_load_seconds > 0
+
+    # bob was evicted and is reloaded from his memory bank on disk
+    provider.get_memory_controller("bob", client)
+    assert provider.metrics().loads == 4
+    assert provider.get_memory_controller("alice", client) is not first
+
+
+def test_idle_controllers_are_evicted(provider):
+    client = ReplayChatCompletionClient(["ok"])
+    first = provider.get_memory_controller("alice", client)
+    provider.idle_timeout = 0
+    assert provider.get_memory_controller("alice", client) is not first
+    assert provider.metrics().evictions == 1
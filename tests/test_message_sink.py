@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from magentic_ui.backend.database import DatabaseManager
+from magentic_ui.backend.datamodel import Message, Run, Session
+from magentic_ui.backend.web.managers import MessageSink
+
+
+async def _create_run(db_manager: DatabaseManager) -> Run:
+    session = (await db_manager.upsert(Session(user_id="u1"), return_json=False)).data
+    return (
+        await db_manager.upsert(
+            Run(session_id=session.id, user_id="u1", task=None), return_json=False
+        )
+    ).data
+
+
+def _message(run: Run, i: int) -> Message:
+    return Message(
+        session_id=run.session_id,
+        run_id=run.id,
+        user_id="u1",
+        config={"source": "agent", "content": str(i)},
+    )
+
+
+async def _stored_contents(db_manager: DatabaseManager, run: Run) -> list[str]:
+    response = await db_manager.get(Message, filters={"run_id": run.id}, order="asc")
+    return [m.config["content"] for m in sorted(response.data, key=lambda m: m.id)]
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_batch_size(db_manager: DatabaseManager):
+    run = await _create_run(db_manager)
+    sink = MessageSink(db_manager, max_batch_size=3, flush_interval=60)
+
+    for i in range(4):
+        await sink.add(run.id, _message(run, i))
+
+    assert await _stored_contents(db_manager, run) == ["0", "1", "2"]
+    assert sink.pending(run.id) == 1
+
+    await sink.close(run.id)
+    assert await _stored_contents(db_manager, run) == ["0", "1", "2", "3"]
+    assert sink.pending(run.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_interval(db_manager: DatabaseManager):
+    run = await _create_run(db_manager)
+    sink = MessageSink(db_manager, max_batch_size=100, flush_interval=0.05)
+
+    await sink.add(run.id, _message(run, 0))
+    assert await _stored_contents(db_manager, run) == []
+
+    await asyncio.sleep(0.2)
+    assert await _stored_contents(db_manager, run) == ["0"]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_messages(db_manager: DatabaseManager):
+    run = await _create_run(db_manager)
+    sink = MessageSink(db_manager, max_batch_size=100, flush_interval=60)
+    await sink.add(run.id, _message(run, 0))
+
+    insert_many = db_manager.insert_many
+
+    async def failing_insert_many(models):
+        response = await insert_many([])
+        response.status = False
+        return response
+
+    db_manager.insert_many = failing_insert_many  # type: ignore[method-assign]
+    assert not await sink.flush(run.id)
+    assert sink.pending(run.id) == 1
+
+    db_manager.insert_many = insert_many  # type: ignore[method-assign]
+    await sink.close_all()
+    assert await _stored_contents(db_manager, run) == ["0"]
+
+
+@pytest.mark.asyncio
+async def test_close_retries_the_final_flush(db_manager: DatabaseManager):
+    run = await _create_run(db_manager)
+    sink = MessageSink(db_manager, flush_interval=60, close_retries=2, retry_delay=0)
+    await sink.add(run.id, _message(run, 0))
+
+    insert_many = db_manager.insert_many
+    attempts = 0
+
+    async def flaky_insert_many(models):
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            response = await insert_many([])
+            response.status = False
+            return response
+        return await insert_many(models)
+
+    db_manager.insert_many = flaky_insert_many  # type: ignore[method-assign]
+    await sink.close(run.id)
+    assert attempts == 3
+    assert await _stored_contents(db_manager, run) == ["0"]
@@ -0,0 +1,77 @@
+import asyncio
+from typing import List
+
+from autogen_agentchat.messages import BaseChatMessage, MultiModalMessage, TextMessage
+from autogen_core import Image as AGImage
+from autogen_core.model_context import TokenLimitedChatCompletionContext
+from autogen_core.models import LLMMessage, SystemMessage, UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from PIL import Image
+
+from magentic_ui.teams.orchestrator._context import IncrementalContext
+from magentic_ui.utils import thread_to_context
+
+
+class CountingClient(ReplayChatCompletionClient):
+    def __init__(self) -> None:
+        super().__init__(["ok"])
+        self.counted_messages = 0
+
+    def count_tokens(self, messages, *, tools=[]):  # type: ignore
+        self.counted_messages += len(messages)
+        return super().count_tokens(messages, tools=tools)
+
+
+def _thread(rounds: int) -> List[BaseChatMessage]:
+    image = AGImage.from_pil(Image.new("RGB", (8, 8)))
+    thread: List[BaseChatMessage] = [
+        TextMessage(content="find a recipe", source="user")
+    ]
+    for i in range(rounds):
+        thread.append(
+            TextMessage(content=f"instruction {i} " * 20, source="Orchestrator")
+        )
+        thread.append(
+            MultiModalMessage(
+                content=[f"observation {i} " * 50, image], source="web_surfer"
+            )
+        )
+    return thread
+
+
+def test_thread_conversion_matches_and_is_reused():
+    client = CountingClient()
+    context = IncrementalContext(client, "Orchestrator", is_multimodal=False)
+    thread = _thread(5)
+
+    first = context.thread_to_context(thread)
+    assert first == thread_to_context(thread, "Orchestrator", is_multimodal=False)
+
+    thread.append(TextMessage(content="one more", source="web_surfer"))
+    second = context.thread_to_context(thread)
+    assert second == thread_to_context(thread, "Orchestrator", is_multimodal=False)
+    # Messages converted before are the very same objects
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_fit_matches_token_limited_context_and_counts_once():
+    client = CountingClient()
+    context = IncrementalContext(client, "Orchestrator", True, token_limit=200)
+    thread = _thread(10)
+    messages: List[LLMMessage] = [SystemMessage(content="system")]
+    messages += context.thread_to_context(thread)
+    messages.append(UserMessage(content="ledger prompt", source="Orchestrator"))
+
+    expected_context = TokenLimitedChatCompletionContext(client, token_limit=200)
+    for message in messages:
+        asyncio.run(expected_context.add_message(message))
+    expected = asyncio.run(expected_context.get_messages())
+
+    client.counted_messages = 0
+    assert context.fit(messages) == expected
+    assert len(expected) < len(messages)
+    # Each message is counted once, a retry with one more message counts one
+    assert client.counted_messages == len(messages)
+    retry = messages + [UserMessage(content="invalid JSON", source="Orchestrator")]
+    context.fit(retry)
+    assert client.counted_messages == len(messages) + 1
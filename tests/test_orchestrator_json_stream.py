@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from magentic_ui.teams.orchestrator._prompts import (
+    validate_ledger_field,
+    validate_ledger_json,
+)
+from magentic_ui.teams.orchestrator._utils import (
+    IncrementalJsonParser,
+    JsonStreamError,
+)
+
+LEDGER = {
+    "is_current_step_complete": {"reason": "not yet, {still} going", "answer": False},
+    "need_to_replan": {"reason": "plan works", "answer": False},
+    "instruction_or_question": {
+        "answer": 'Search for "flights" [cheapest]',
+        "agent_name": "web_surfer",
+    },
+    "progress_summary": "Found two airlines.\nStill comparing prices.",
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_parser_reports_fields_as_they_complete(chunk_size: int):
+    text = "```json\n" + json.dumps(LEDGER, indent=4) + "\n```"
+    parser = IncrementalJsonParser()
+    seen = []
+    for start in range(0, len(text), chunk_size):
+        for key, value in parser.feed(text[start : start + chunk_size]):
+            seen.append(key)
+            assert validate_ledger_field(key, value, ["web_surfer"])
+            if key == "instruction_or_question":
+                # The instruction is known before the summary has streamed in
+                assert "progress_summary" not in parser.fields
+
+    assert seen == list(LEDGER)
+    assert parser.done
+    assert parser.fields == LEDGER
+    assert validate_ledger_json(parser.fields, ["web_surfer"])
+
+
+def test_parser_rejects_malformed_output_early():
+    parser = IncrementalJsonParser()
+    parser.feed('{"need_to_replan": {"reason": "x", "answer": false}, ')
+    with pytest.raises(JsonStreamError):
+        parser.feed('"instruction_or_question": {"answer": maybe, ')
+    assert not parser.done
+
+
+def test_ledger_field_validation():
+    assert not validate_ledger_field(
+        "instruction_or_question",
+        {"answer": "go", "agent_name": "nobody"},
+        ["web_surfer"],
+    )
+    assert not validate_ledger_field("need_to_replan", {"answer": False}, [])
+    assert not validate_ledger_field("progress_summary", ["a"], [])
+    assert validate_ledger_field("extra_field", None, [])
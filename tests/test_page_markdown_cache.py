@@ -0,0 +1,66 @@
+import asyncio
+
+from magentic_ui.tools.playwright.utils.page_markdown_cache import PageMarkdownCache
+from magentic_ui.tools.playwright.utils.text_workers import TextWorkerPool
+
+
+class CharTokenizer:
+    """One token per character, standing in for a tiktoken encoding."""
+
+    def __init__(self) -> None:
+        self.encoded = 0
+
+    def encode(self, text: str) -> list[int]:
+        self.encoded += 1
+        return [ord(c) for c in text]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(chr(t) for t in tokens)
+
+
+def test_lookup_requires_same_url_and_fingerprint():
+    cache = PageMarkdownCache()
+    entry = cache.put("https://a.test", "1:0", "# A")
+    assert cache.get("https://a.test", "1:0") is entry
+    assert cache.get("https://a.test", "1:1") is None
+    assert cache.get("https://b.test", "1:0") is None
+    metrics = cache.metrics()
+    assert (metrics.hits, metrics.misses, metrics.entries) == (1, 2, 1)
+
+
+def test_truncation_tokenizes_once():
+    cache = PageMarkdownCache()
+    pool = TextWorkerPool(max_workers=1)
+    tokenizer = CharTokenizer()
+    entry = cache.put("https://a.test", "1:0", "abcdefgh")
+
+    def truncate(max_tokens: int) -> str:
+        return asyncio.run(cache.truncate(entry, max_tokens, pool, tokenizer))
+
+    assert truncate(3) == "abc"
+    assert truncate(5) == "abcde"
+    assert truncate(100) == "abcdefgh"
+    assert truncate(-1) == "abcdefgh"
+    pool.shutdown()
+    assert tokenizer.encoded == 1
+    # Markdown, both truncations and 8 four-byte token ids
+    assert cache.metrics().size == 8 + 3 + 5 + 32
+
+
+def test_evicts_least_recently_used_by_count_and_size():
+    cache = PageMarkdownCache(max_entries=2, max_size=100)
+    cache.put("https://a.test", "1:0", "a" * 40)
+    cache.put("https://b.test", "1:0", "b" * 40)
+    cache.get("https://a.test", "1:0")
+    cache.put("https://c.test", "1:0", "c" * 10)
+    assert cache.get("https://b.test", "1:0") is None
+    assert cache.get("https://a.test", "1:0") is not None
+
+    cache.put("https://d.test", "1:0", "d" * 90)
+    metrics = cache.metrics()
+    assert metrics.entries == 1 and metrics.size == 90
+    assert metrics.evictions == 3
+    # Entries larger than the whole cache are returned but not retained
+    entry = cache.put("https://e.test", "1:0", "e" * 200)
+    assert entry.markdown == "e" * 200
+    assert cache.metrics().entries == 0
@@ -172,6 +172,22 @@ class TestPlaywrightController:
         # We'll check it's a dict anyway
         assert isinstance(metadata, dict)
 
+    async def test_snapshot(self, page):
+        page_obj, pc = page
+        snapshot = await pc.snapshot(page_obj)
+        # One snapshot matches what the individual getters report
+        assert snapshot["interactive_rects"] == await pc.get_interactive_rects(page_obj)
+        assert snapshot["visual_viewport"] == await pc.get_visual_viewport(page_obj)
+        assert snapshot["page_metadata"] == await pc.get_page_metadata(page_obj)
+        assert snapshot["visible_text"] == await pc.get_visible_text(page_obj)
+        assert (snapshot["url"], snapshot["title"]) == await pc.get_current_url_title(
+            page_obj
+        )
+        assert snapshot["screenshot"] is not None and len(snapshot["screenshot"]) > 0
+
+        without_screenshot = await pc.snapshot(page_obj, include_screenshot=False)
+        assert without_screenshot["screenshot"] is None
+
     async def test_go_back_and_go_forward(self, page):
         """
         This is a contrived example:
@@ -357,6 +373,18 @@ class TestPlaywrightController:
         except ImportError:
             pytest.skip("MarkItDown library not installed; skipping markdown test.")
 
+    async def test_get_page_markdown_sees_dom_changes(self, page):
+        page_obj, pc = page
+        first = await pc.get_page_markdown(page_obj)
+        # Labelling elements does not invalidate the cached markdown
+        await pc.get_interactive_rects(page_obj)
+        assert await pc.get_page_markdown(page_obj) is first
+        await page_obj.evaluate(
+            "document.getElementById('header').textContent = 'Changed header'"
+        )
+        changed = await pc.get_page_markdown(page_obj)
+        assert "Changed header" in changed
+
     async def test_describe_page(self, page):
         page_obj, pc = page
         message, screenshot_bytes, metadata_hash = await pc.describe_page(
@@ -762,3 +790,31 @@ class TestPlaywrightController:
         # Test wheel click
         await pc.click_coords(page_obj, x, y, "wheel")
         # Wheel click doesn't increment our counter, but shouldn't throw an error
+
+    async def test_page_readiness_cached_until_navigation(self, context, page):
+        page_obj, pc = page
+        assert not pc.is_page_ready(page_obj)
+
+        await pc.sleep(page_obj, 0)
+        assert pc.is_page_ready(page_obj)
+
+        # Further actions on the same document do not repeat the setup
+        calls = 0
+        on_new_page = pc.on_new_page
+
+        async def counting_on_new_page(p):
+            nonlocal calls
+            calls += 1
+            await on_new_page(p)
+
+        pc.on_new_page = counting_on_new_page
+        await pc.get_interactive_rects(page_obj)
+        await pc.get_visual_viewport(page_obj)
+        assert calls == 0
+
+        # A navigation invalidates readiness and the setup runs once more
+        await page_obj.goto("about:blank")
+        assert not pc.is_page_ready(page_obj)
+        await pc.get_interactive_rects(page_obj)
+        assert calls == 1
+        assert pc.is_page_ready(page_obj)
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from magentic_ui.backend.database import DatabaseManager
+from magentic_ui.backend.datamodel import Response, Run, RunStatus, Session
+from magentic_ui.backend.web.managers import RunCache
+
+
+async def _create_run(db_manager: DatabaseManager) -> Run:
+    session = (await db_manager.upsert(Session(user_id="u1"), return_json=False)).data
+    return (
+        await db_manager.upsert(
+            Run(session_id=session.id, user_id="u1", task=None), return_json=False
+        )
+    ).data
+
+
+async def _stored_run(db_manager: DatabaseManager, run_id: int) -> Run:
+    return (await db_manager.get(Run, filters={"id": run_id})).data[0]
+
+
+@pytest.mark.asyncio
+async def test_get_reads_database_once(db_manager: DatabaseManager):
+    run = await _create_run(db_manager)
+    cache = RunCache(db_manager)
+    calls = 0
+    get = db_manager.get
+
+    async def counting_get(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return await get(*args, **kwargs)
+
+    db_manager.get = counting_get  # type: ignore[method-assign]
+    first = await cache.get(run.id)
+    assert await cache.get(run.id) is first
+    assert calls == 1
+    assert await cache.get(12345) is None
+
+
+@pytest.mark.asyncio
+async def test_updates_are_coalesced(db_manager: DatabaseManager):
+    run = await _create_run(db_manager)
+    cache = RunCache(db_manager, flush_interval=0.05)
+    writes = 0
+    update_fields = db_manager.update_fields
+
+    async def counting_update_fields(*args, **kwargs):
+        nonlocal writes
+        writes += 1
+        return await update_fields(*args, **kwargs)
+
+    db_manager.update_fields = counting_update_fields  # type: ignore[method-assign]
+    await cache.update(run.id, status=RunStatus.ACTIVE)
+    await cache.update(run.id, state="s1")
+    await cache.update(run.id, state="s2")
+    assert cache.is_dirty(run.id)
+    assert (await _stored_run(db_manager, run.id)).status == RunStatus.CREATED
+
+    await asyncio.sleep(0.2)
+    assert writes == 1
+    stored = await _stored_run(db_manager, run.id)
+    assert (stored.status, stored.state) == (RunStatus.ACTIVE, "s2")
+
+
+@pytest.mark.asyncio
+async def test_flush_and_close_write_back(db_manager: DatabaseManager):
+    run = await _create_run(db_manager)
+    cache = RunCache(db_manager, flush_interval=60)
+
+    await cache.update(
+        run.id, flush=True, status=RunStatus.AWAITING_INPUT, input_request={"a": 1}
+    )
+    assert not cache.is_dirty(run.id)
+    assert (await _stored_run(db_manager, run.id)).input_request == {"a": 1}
+
+    await cache.update(run.id, status=RunStatus.COMPLETE, team_result={"ok": True})
+    await cache.close(run.id)
+    stored = await _stored_run(db_manager, run.id)
+    assert (stored.status, stored.team_result) == (RunStatus.COMPLETE, {"ok": True})
+
+
+@pytest.mark.asyncio
+async def test_close_reports_failed_write_back(db_manager: DatabaseManager):
+    run = await _create_run(db_manager)
+    cache = RunCache(db_manager, flush_interval=60)
+
+    async def failing_update_fields(*args, **kwargs):
+        return Response(message="database is locked", status=False)
+
+    db_manager.update_fields = failing_update_fields  # type: ignore[method-assign]
+    await cache.update(run.id, state="s1")
+    assert not await cache.close(run.id)
+    assert await cache.close(run.id)
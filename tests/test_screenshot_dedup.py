@@ -0,0 +1,36 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from magentic_ui.agents.web_surfer._screenshot_dedup import ScreenshotDeduplicator
+
+
+def _page(text: str, noise: bool = False) -> bytes:
+    image = Image.new("RGB", (1440, 900), (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((100, 100, 700, 140), outline=(0, 0, 0))
+    draw.text((110, 110), text, fill=(0, 0, 0), font_size=24)
+    if noise:
+        for x in range(0, 1440, 97):
+            image.putpixel((x, 500), (200, 200, 200))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_unchanged_screenshots_are_detected():
+    dedup = ScreenshotDeduplicator(tokens_per_image=1000)
+
+    assert not dedup.observe(_page("hello"))
+    # Stray pixels are not a visual change
+    assert dedup.observe(_page("hello", noise=True))
+    # A single changed character is
+    assert not dedup.observe(_page("hellp"))
+    assert dedup.observe(_page("hellp"))
+
+    assert dedup.stats.screenshots == 4
+    assert dedup.stats.images_saved == 2
+    assert dedup.stats.tokens_avoided == 2000
+
+    dedup.reset()
+    assert not dedup.observe(_page("hellp"))
@@ -0,0 +1,77 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+from magentic_ui.agents.web_surfer._set_of_mark import (
+    MARK_COLOR,
+    add_set_of_mark,
+    render_set_of_mark,
+    scale_screenshot,
+)
+
+
+def _region(left: float, top: float, width: float, height: float, tag: str = "a"):
+    rect = {
+        "x": left,
+        "y": top,
+        "width": width,
+        "height": height,
+        "left": left,
+        "top": top,
+        "right": left + width,
+        "bottom": top + height,
+    }
+    return {
+        "tag_name": tag,
+        "role": "link",
+        "aria_name": "",
+        "v_scrollable": False,
+        "rects": [rect],
+    }
+
+
+def _png(width: int = 400, height: int = 300) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (240, 240, 240)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+ROIS = {
+    "10": _region(50, 60, 120, 30),
+    "11": _region(20, -100, 50, 20),  # above the viewport
+    "12": _region(20, 500, 50, 20),  # below the viewport
+    "13": _region(0, 0, 0, 0, tag="option"),
+}
+
+
+def test_add_set_of_mark_partitions_and_maps_ids():
+    _, visible, above, below, mapping = add_set_of_mark(
+        _png(), ROIS, use_sequential_ids=True
+    )
+    assert visible == ["1", "2"]
+    assert above == ["3"]
+    assert below == ["4"]
+    assert mapping == {"1": "10", "2": "13", "3": "11", "4": "12"}
+
+
+def test_marks_are_drawn_and_screenshot_is_untouched():
+    som = render_set_of_mark(_png(), ROIS, scaled_size=(200, 150))
+    marked = np.asarray(som.image)
+    plain = np.asarray(som.screenshot)
+
+    # Two pixel wide outline along the box, nothing inside it
+    assert tuple(marked[75, 50]) == MARK_COLOR
+    assert tuple(marked[75, 51]) == MARK_COLOR
+    assert tuple(marked[75, 100]) == (240, 240, 240)
+    # The label sits above the top right corner of the box
+    assert (marked[40:60, 140:170] == MARK_COLOR).all(axis=-1).any()
+    assert (plain == 240).all()
+
+    assert som.scaled_image is not None and som.scaled_image.size == (200, 150)
+    assert som.scaled_screenshot is not None
+    assert som.scaled_screenshot.size == (200, 150)
+    assert np.array_equal(
+        np.array(scale_screenshot(_png(), (200, 150))),
+        np.array(som.scaled_screenshot),
+    )
@@ -0,0 +1,76 @@
+import asyncio
+from typing import List
+
+import pytest
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from magentic_ui.team_template_cache import TeamTemplateCache
+
+REPLAY_CLIENT = {
+    "provider": "autogen_ext.models.replay.ReplayChatCompletionClient",
+    "config": {"chat_completions": ["first", "second", "third"]},
+}
+
+
+@pytest.mark.asyncio
+async def test_runs_share_model_clients_through_handles():
+    cache = TeamTemplateCache()
+    first_run = cache.model_client(REPLAY_CLIENT)
+    second_run = cache.model_client(dict(REPLAY_CLIENT))
+
+    message = [UserMessage(content="hi", source="user")]
+    assert (await first_run.create(message)).content == "first"
+    # Closing one run's handle leaves the shared client usable by the other
+    await first_run.close()
+    assert (await second_run.create(message)).content == "second"
+
+    # Usage is counted per run
+    assert first_run.total_usage().completion_tokens == 1
+    assert second_run.total_usage().completion_tokens == 1
+    metrics = cache.metrics()
+    assert (metrics.hits, metrics.misses, metrics.model_clients) == (1, 1, 1)
+
+
+def test_configs_are_validated_once_and_copied_per_run():
+    cache = TeamTemplateCache()
+    settings = {"cooperative_planning": False, "allowed_websites": ["example.com"]}
+    first = cache.magentic_ui_config(settings, playwright_port=1000, novnc_port=1001)
+    second = cache.magentic_ui_config(
+        dict(settings), playwright_port=2000, novnc_port=2001
+    )
+
+    assert (first.playwright_port, second.playwright_port) == (1000, 2000)
+    assert first.cooperative_planning is False
+    first.allowed_websites.append("other.com")  # type: ignore
+    assert second.allowed_websites == ["example.com"]
+    assert cache.metrics().templates == 1
+    assert cache.parse_model_configs("a: 1") is cache.parse_model_configs("a: 1")
+
+
+@pytest.mark.asyncio
+async def test_dropped_model_clients_close_with_their_last_handle(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    closed: List[object] = []
+
+    async def close(self: ReplayChatCompletionClient) -> None:
+        closed.append(self)
+
+    monkeypatch.setattr(ReplayChatCompletionClient, "close", close)
+    cache = TeamTemplateCache(max_entries=1)
+    first = cache.model_client(REPLAY_CLIENT)
+    other_config = {**REPLAY_CLIENT, "config": {"chat_completions": ["other"]}}
+    second = cache.model_client(other_config)  # Evicts the first client
+    await asyncio.sleep(0)
+    assert closed == []
+
+    await first.close()
+    await first.close()
+    assert len(closed) == 1
+
+    await second.close()
+    assert len(closed) == 1  # Still cached for the next run
+    await cache.close()
+    assert len(closed) == 2
+    assert cache.metrics().model_clients == 0
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+
+from magentic_ui.tools.playwright.utils.text_workers import (
+    TextWorkerPool,
+    html_to_markdown,
+)
+
+
+def test_pool_bounds_submitted_jobs():
+    pool = TextWorkerPool(max_workers=4, max_pending=2)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def job(i: int) -> int:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return i
+
+    async def main() -> list[int]:
+        return await asyncio.gather(*(pool.run(job, i) for i in range(6)))
+
+    assert asyncio.run(main()) == list(range(6))
+    assert peak == 2
+    pool.shutdown()
+
+
+def test_conversion_runs_off_the_event_loop():
+    pool = TextWorkerPool()
+    html = (
+        "<html><body>" + "<p>Lorem ipsum dolor sit amet.</p>" * 20000 + "</body></html>"
+    )
+
+    async def main() -> tuple[str, int]:
+        ticks = 0
+        done = asyncio.Event()
+
+        async def tick() -> None:
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker = asyncio.create_task(tick())
+        markdown = await pool.run(html_to_markdown, html)
+        done.set()
+        await ticker
+        return markdown, ticks
+
+    markdown, ticks = asyncio.run(main())
+    assert markdown.startswith("Lorem ipsum dolor sit amet.")
+    # The loop kept running while the page was converted
+    assert ticks > 1
+    pool.shutdown()
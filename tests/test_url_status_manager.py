@@ -3,6 +3,7 @@ from typing import Dict
 
 from magentic_ui.tools.url_status_manager import (
     URL_ALLOWED,
+    URL_REJECTED,
     UrlStatusManager,
     UrlStatus,
 )
@@ -46,3 +47,37 @@ async def test_url_status_manager():
     assert not url_status_manager.is_url_allowed("sample.com")
     assert not url_status_manager.is_url_allowed("sample.com/foo")
     assert not url_status_manager.is_url_allowed("sample.com/bar")
+
+
+def test_url_status_manager_index_matches_linear_scan():
+    """The domain index answers like a scan of every registered site."""
+    sites = ["example.com", "www.bing.com", "sample.com/foo", "ftp://files.org"]
+    url_status_manager = UrlStatusManager(
+        url_statuses={site: URL_ALLOWED for site in sites},
+        url_block_list=["sample.com/foo/private"],
+    )
+    urls = [
+        "https://example.com/a",
+        "https://news.example.com",
+        "http://bing.com",
+        "https://www.bing.com/search?q=x",
+        "sample.com/foobar",
+        "sample.com/foo/private/page",
+        "ftp://files.org/x",
+        "https://files.org",
+        "https://other.net",
+    ]
+    for url in urls:
+        expected = not url_status_manager._is_url_match(
+            "sample.com/foo/private", url
+        ) and any(url_status_manager._is_url_match(site, url) for site in sites)
+        assert url_status_manager.is_url_allowed(url) == expected, url
+
+    # New statuses take effect even for URLs that were answered before
+    assert not url_status_manager.is_url_rejected("https://other.net/page")
+    url_status_manager.set_url_status("other.net/", URL_REJECTED)
+    assert url_status_manager.is_url_rejected("https://other.net/page")
+    assert not url_status_manager.is_url_allowed("https://other.net/page")
+    url_status_manager.set_url_status("other.net", URL_ALLOWED)
+    assert url_status_manager.is_url_allowed("https://other.net/page")
+    assert url_status_manager.is_url_rejected("sample.com/foo/private")